@@ -0,0 +1,109 @@
+"""
+Compares the audio codecs the recorder supports by CPU time and output size.
+
+A synthetic speech-like signal (a tone over pink noise, with pauses) is
+encoded with each codec, and the cost is scaled to one hour of recording.
+
+Usage (from the repository root):
+    python -m benchmarks.audio_codecs [--seconds 60] [--sample-rate 22050]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from src.core.recorder.formats import AUDIO_CODECS, OPUS_SAMPLE_RATES
+from src.core.util.ffmpeg import run_ffmpeg
+
+# Settings each codec is benchmarked with, as they would appear in config
+CODEC_SETTINGS: List[Tuple[str, Dict[str, str]]] = [
+    ("mp3", {}),
+    ("mp3", {"bitrate": "32k"}),
+    ("opus", {"bitrate": "16k"}),
+    ("opus", {"bitrate": "24k"}),
+    ("aac", {"bitrate": "32k"}),
+    ("flac", {}),
+]
+
+_BENCH_RE: re.Pattern = re.compile(
+    r"bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s")
+
+
+def _source_args(seconds: int) -> List[str]:
+    """Builds a mono signal that alternates a 2 s tone with 1 s of quiet."""
+    return [
+        "-f", "lavfi", "-i",
+        f"anoisesrc=color=pink:amplitude=0.05:duration={seconds}",
+        "-f", "lavfi", "-i",
+        f"sine=frequency=220:duration={seconds}",
+        "-filter_complex",
+        "[1]volume=enable='lt(mod(t,3),2)':volume=0.5,"
+        "volume=enable='gte(mod(t,3),2)':volume=0[tone];"
+        "[0][tone]amix=inputs=2",
+    ]
+
+
+def _codec_args(codec: str, settings: Dict[str, str]) -> List[str]:
+    """Mirrors the encoder arguments AudioRecorder uses for the settings."""
+    encoder: str = AUDIO_CODECS[codec][1]
+    args: List[str] = ["-c:a", encoder]
+    if encoder == "libopus":
+        args += ["-b:a", settings.get("bitrate", "24k"), "-vbr", "on"]
+    elif encoder != "flac" and settings.get("bitrate"):
+        args += ["-b:a", settings["bitrate"]]
+    return args
+
+
+def bench_codec(codec: str, settings: Dict[str, str], seconds: int,
+                sample_rate: int, workdir: str) -> Optional[Dict[str, float]]:
+    """
+    Encodes the test signal once.
+
+    Returns:
+        CPU seconds and bytes per hour of audio, or None if encoding failed.
+    """
+    extension, encoder, muxer = AUDIO_CODECS[codec]
+    if encoder == "libopus" and sample_rate not in OPUS_SAMPLE_RATES:
+        sample_rate = next(
+            (rate for rate in OPUS_SAMPLE_RATES if rate >= sample_rate), 48000)
+    output: str = os.path.join(workdir, f"bench{extension}")
+    result = run_ffmpeg([
+        "-hide_banner", "-nostdin", "-y", "-benchmark",
+        *_source_args(seconds), "-ac", "1", "-ar",
+        str(sample_rate), *_codec_args(codec, settings), "-f", muxer, output
+    ])
+    match = _BENCH_RE.search(result.stderr)
+    if result.returncode != 0 or not match:
+        print(f"{codec}: failed\n{result.stderr.strip()[-500:]}")
+        return None
+    scale: float = 3600 / seconds
+    return {
+        "cpu_seconds": (float(match.group(1)) + float(match.group(2))) * scale,
+        "bytes": os.path.getsize(output) * scale,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=60,
+                        help="length of the encoded test signal")
+    parser.add_argument("--sample-rate", type=int, default=22050)
+    args = parser.parse_args()
+
+    print(f"{'codec':<10}{'settings':<18}{'CPU s/hour':>12}{'MB/hour':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for codec, settings in CODEC_SETTINGS:
+            stats = bench_codec(codec, settings, args.seconds,
+                                args.sample_rate, workdir)
+            if stats:
+                label: str = ",".join(f"{k}={v}" for k, v in settings.items())
+                print(f"{codec:<10}{label or 'default':<18}"
+                      f"{stats['cpu_seconds']:>12.1f}"
+                      f"{stats['bytes'] / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares a full os.walk of a recording tree with the incremental scanner.
+
+A synthetic device folder is built with one date partition per day, each
+holding screen segments and two audio devices. The walk stats every file,
+as scan_recordings did; the incremental scanner is measured on a cold
+index, on a warm index, and after a file is added to a closed partition.
+
+Usage (from the repository root):
+    python -m benchmarks.scan_index [--files 1000000] [--days 90]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from src.core.manager.scanner import IncrementalScanner, ScanResult
+from src.core.model.service.directory_service import DirectoryService
+
+SOURCES: List[str] = ["screen", "audio/Microphone", "audio/Stereo Mix"]
+
+
+def build_tree(root: str, files: int, days: int) -> None:
+    """Creates empty segment files spread evenly over the partitions."""
+    per_folder: int = max(1, files // (days * len(SOURCES)))
+    today: datetime = datetime.now()
+    for day in range(days):
+        date: datetime = today - timedelta(days=days - 1 - day)
+        for source in SOURCES:
+            folder: str = os.path.join(root, date.strftime("%Y%m%d"), source)
+            os.makedirs(folder)
+            start: datetime = date.replace(hour=0, minute=0, second=0)
+            for i in range(per_folder):
+                name: str = (start + timedelta(seconds=i * 5)).strftime(
+                    "%Y%m%d_%H%M%S")
+                open(os.path.join(folder, f"{name}.mkv"), "wb").close()
+
+
+def full_walk(root: str) -> int:
+    """Walks and stats every file, as the scan did before the index."""
+    count: int = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path: str = os.path.join(directory, name)
+            os.path.getsize(path)
+            os.path.getmtime(path)
+            count += 1
+    return count
+
+
+def timed(label: str, run: Callable[[], int]) -> Tuple[str, float, int]:
+    """Runs a scan and returns its label, duration and file count."""
+    started: float = time.perf_counter()
+    count: int = run()
+    return label, time.perf_counter() - started, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    work_dir: str = tempfile.mkdtemp(prefix="scan_bench_")
+    try:
+        root: str = os.path.join(work_dir, "device").replace("\\", "/")
+        print(f"Building {args.files} files over {args.days} days...")
+        build_tree(root, args.files, args.days)
+        scanner = IncrementalScanner(
+            DirectoryService(os.path.join(work_dir, "index.db")))
+
+        def incremental() -> int:
+            result: ScanResult = scanner.scan(root)
+            scanner.commit(result)
+            return len(result.files)
+
+        yesterday: str = (datetime.now() -
+                          timedelta(days=1)).strftime("%Y%m%d")
+        results: List[Tuple[str, float, int]] = [
+            timed("os.walk + stat", lambda: full_walk(root)),
+            timed("incremental, cold index", incremental),
+            timed("incremental, warm index", incremental),
+        ]
+        open(os.path.join(root, yesterday, "screen", "late.mkv"),
+             "wb").close()
+        results.append(timed("incremental, one dirty folder", incremental))
+
+        print(f"{'scan':<32}{'seconds':>10}{'files':>10}")
+        for label, seconds, count in results:
+            print(f"{label:<32}{seconds:>10.3f}{count:>10}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
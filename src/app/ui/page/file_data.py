@@ -23,8 +23,7 @@ from datetime import datetime
 from src.app.ui.custom_dialog import CustomDialog
 from src.core.manager.local_file import LocalFileManager
 from src.core.model.service.file_service import FileService
-import os
-from src.core.util.logger import logger
+import threading
 
 
 class ExportThread(QThread):
@@ -61,6 +60,58 @@ class ExportThread(QThread):
         self.export_finished.emit(self.path)
 
 
+class RetentionThread(QThread):
+    """Thread for deleting old local files."""
+
+    progress = pyqtSignal(int, int)  # processed, total
+    deletion_finished = pyqtSignal(int, int, bool)  # deleted, failed, cancelled
+
+    def __init__(self, local_manager: LocalFileManager, days: int) -> None:
+        """Initialize the RetentionThread."""
+        super().__init__()
+        self.local_manager: LocalFileManager = local_manager
+        self.days: int = days
+        self.cancel_event: threading.Event = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop deleting after the files in progress."""
+        self.cancel_event.set()
+
+    def run(self) -> None:
+        """Delete old files, reporting progress after each batch."""
+        deleted, failed = self.local_manager.delete_old_files(
+            self.days,
+            on_progress=lambda p: self.progress.emit(p.processed, p.total),
+            cancel_event=self.cancel_event)
+        self.deletion_finished.emit(deleted, failed,
+                                    self.cancel_event.is_set())
+
+
+class VerifyThread(QThread):
+    """Thread for checking that recorded files exist locally."""
+
+    progress = pyqtSignal(int, int)  # checked, total
+    verify_finished = pyqtSignal(int, int, bool)  # checked, changed, cancelled
+
+    def __init__(self, local_manager: LocalFileManager) -> None:
+        """Initialize the VerifyThread."""
+        super().__init__()
+        self.local_manager: LocalFileManager = local_manager
+        self.cancel_event: threading.Event = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop checking after the current batch."""
+        self.cancel_event.set()
+
+    def run(self) -> None:
+        """Check all files, reporting progress after each batch."""
+        checked, changed = self.local_manager.verify_existence(
+            on_progress=lambda p: self.progress.emit(p.checked, p.total),
+            cancel_event=self.cancel_event)
+        self.verify_finished.emit(checked, changed,
+                                  self.cancel_event.is_set())
+
+
 class FileData(QWidget):
     """Widget for displaying and managing file data."""
 
@@ -105,6 +156,14 @@ class FileData(QWidget):
                 "Upload Time",
                 "Last Check",
                 "Exists Locally",
+                "Activity",
+                "Merged Into",
+                "Original Size",
+                "Segment Start",
+                "Segment End",
+                "Duration",
+                "Archive",
+                "Archive Offset",
         ]):
             checkbox = QCheckBox(column_name)
             checkbox.setChecked(True)
@@ -199,7 +258,7 @@ class FileData(QWidget):
         files = self.file_service.get_files_paginated(self.current_page,
                                                       self.page_size, query)
         self.file_table.setRowCount(len(files))
-        self.file_table.setColumnCount(9)
+        self.file_table.setColumnCount(17)
         self.file_table.setHorizontalHeaderLabels([
             "ID",
             "Local Path",
@@ -210,6 +269,14 @@ class FileData(QWidget):
             "Upload Time",
             "Last Check",
             "Exists Locally",
+            "Activity",
+            "Merged Into",
+            "Original Size",
+            "Segment Start",
+            "Segment End",
+            "Duration",
+            "Archive",
+            "Archive Offset",
         ])
         for row, file in enumerate(files):
             for col, key in enumerate(file.to_dict()):
@@ -354,38 +421,29 @@ class FileData(QWidget):
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.setMinimumDuration(0)  # Show immediately
 
-        total_files: int = self.file_service.get_total_count()
-        batch_size: int = 100
-        processed: int = 0
-
-        page: int = 1
-        while True:
-            files = self.file_service.get_files_paginated(page, batch_size)
-            if not files:
-                break
-
-            updates: list[tuple[bool, str]] = []
-            for file in files:
-                if progress.wasCanceled():
-                    break
-                exists: bool = os.path.exists(file.local_path)
-                updates.append((exists, file.local_path))
-                processed += 1
-                progress.setValue(int(processed * 100 / total_files))
-
-            # Batch update existence status
-            if updates:
-                self.file_service.batch_update_existence(updates)
-
-            if progress.wasCanceled():
-                break
-
-            page += 1
-
+        self.verify_thread = VerifyThread(self.local_manager)
+        self.verify_thread.progress.connect(
+            lambda checked, total: progress.setValue(
+                int(checked * 100 / total) if total else 100))
+        self.verify_thread.verify_finished.connect(
+            lambda checked, changed, cancelled: self.
+            show_verify_finished_message(progress, checked, changed,
+                                         cancelled))
+        progress.canceled.connect(self.verify_thread.cancel)
+        self.verify_thread.start()
+
+    def show_verify_finished_message(self, progress: QProgressDialog,
+                                     checked_count: int, changed_count: int,
+                                     cancelled: bool) -> None:
+        """Show the result of checking all files."""
         progress.close()
         self.load_file_data()  # Refresh the view
-        dialog = CustomDialog("Complete",
-                              "All files existence check completed", self)
+
+        result_message: str = (
+            f"Checked {checked_count} files, {changed_count} changed.")
+        if cancelled:
+            result_message += "\nThe check was cancelled."
+        dialog = CustomDialog("Complete", result_message, self)
         dialog.show_information()
 
     def delete_old_files(self) -> None:
@@ -403,33 +461,31 @@ class FileData(QWidget):
             progress.setWindowModality(Qt.WindowModality.WindowModal)
             progress.setMinimumDuration(0)  # Show immediately
 
-            deleted_count: int = 0
-            failed_count: int = 0
-            old_files = self.file_service.get_old_files(3)
-            total_files: int = len(old_files)
-
-            for i, file in enumerate(old_files):
-                if progress.wasCanceled():
-                    break
-                try:
-                    if os.path.exists(file.local_path):
-                        os.remove(file.local_path)
-                        self.file_service.check_file_exists(file.local_path)
-                        deleted_count += 1
-                        logger.info(f"Deleted old file: {file.local_path}")
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Failed to delete {file.local_path}: {e}")
-                progress.setValue(int((i + 1) * 100 / total_files))
-
-            progress.close()
-            self.load_file_data()  # Refresh the view
-
-            result_message: str = (
-                f"Successfully deleted {deleted_count} files.\n"
-                f"Failed to delete {failed_count} files.")
-            dialog = CustomDialog("Files Deleted", result_message, self)
-            dialog.show_information()
+            self.retention_thread = RetentionThread(self.local_manager, 3)
+            self.retention_thread.progress.connect(
+                lambda processed, total: progress.setValue(
+                    int(processed * 100 / total) if total else 100))
+            self.retention_thread.deletion_finished.connect(
+                lambda deleted, failed, cancelled: self.
+                show_deletion_finished_message(progress, deleted, failed,
+                                               cancelled))
+            progress.canceled.connect(self.retention_thread.cancel)
+            self.retention_thread.start()
+
+    def show_deletion_finished_message(self, progress: QProgressDialog,
+                                       deleted_count: int, failed_count: int,
+                                       cancelled: bool) -> None:
+        """Show the result of deleting old files."""
+        progress.close()
+        self.load_file_data()  # Refresh the view
+
+        result_message: str = (
+            f"Successfully deleted {deleted_count} files.\n"
+            f"Failed to delete {failed_count} files.")
+        if cancelled:
+            result_message += "\nThe deletion was cancelled."
+        dialog = CustomDialog("Files Deleted", result_message, self)
+        dialog.show_information()
 
     def clear_old_records(self) -> None:
         """Clear records older than 7 days."""
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+
+class Sparkline(QWidget):
+    """
+    A small line chart of recent values with the current value as text.
+    """
+
+    def __init__(self, color: str = "#4fc3f7", parent: QWidget | None = None) -> None:
+        """
+        Initializes the Sparkline with its line color.
+        """
+        super().__init__(parent)
+        self.color: QColor = QColor(color)
+        self.values: list[float] = []
+        self.text: str = ""
+        self.setMinimumSize(80, 20)
+
+    def set_values(self, values: list[float], text: str = "") -> None:
+        """
+        Replaces the plotted values and the caption, then repaints.
+        """
+        self.values = values
+        self.text = text
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        """
+        Draws the line scaled to the widget height, newest value on the right.
+        """
+        painter: QPainter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        width: int = self.width()
+        height: int = self.height() - 2
+
+        if len(self.values) > 1:
+            peak: float = max(self.values) or 1.0
+            step: float = width / (len(self.values) - 1)
+            line: QPolygonF = QPolygonF([
+                QPointF(i * step, 1 + height - value / peak * height)
+                for i, value in enumerate(self.values)
+            ])
+            painter.setPen(QPen(self.color, 1.5))
+            painter.drawPolyline(line)
+
+        if self.text:
+            painter.setPen(self.palette().text().color())
+            painter.drawText(self.rect().adjusted(0, 0, -2, 0),
+                             Qt.AlignRight | Qt.AlignVCenter, self.text)
+        painter.end()
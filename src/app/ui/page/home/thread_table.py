@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -11,6 +12,7 @@ from PyQt5.QtWidgets import (
     QAbstractItemView,
 )
 
+from src.app.ui.page.home.sparkline import Sparkline
 from src.core.controller.app import AppController
 
 
@@ -18,6 +20,16 @@ class ThreadTable(QWidget):
     """
     A table widget to display information about running threads.
     """
+    COLUMNS: list[str] = [
+        "PID", "Type", "Runtime", "Speed", "FPS", "Bitrate", "Dup/Drop",
+        "Encoded", "CPU", "Memory", "Disk I/O", "Handles", "Priority",
+        "Affinity", "I/O", "Output"
+    ]
+    # Columns drawn as sparklines of the resource history
+    CHART_COLUMNS: dict[str, tuple[str, str]] = {
+        "CPU": ("cpu_percent", "#4fc3f7"),
+        "Memory": ("rss_bytes", "#81c784"),
+    }
 
     def __init__(self, app_controller: AppController) -> None:
         """
@@ -37,10 +49,10 @@ class ThreadTable(QWidget):
 
         # Create table widget
         self.table: QTableWidget = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["PID", "Runtime", "Output"])
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
         self.table.horizontalHeader().setSectionResizeMode(
-            2, QHeaderView.ResizeMode.Stretch
+            len(self.COLUMNS) - 1, QHeaderView.ResizeMode.Stretch
         )
         self.table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -49,7 +61,17 @@ class ThreadTable(QWidget):
         title: QLabel = QLabel("Current Record Processed")
         title.setStyleSheet("font-weight: bold; font-size: 14px;")
 
+        # Shown while any encoder runs slower than real time
+        self.warning_label: QLabel = QLabel()
+        self.warning_label.setStyleSheet("color: #ff6e6e;")
+        self.warning_label.hide()
+
+        # Resource usage of the application's own workers
+        self.worker_label: QLabel = QLabel()
+
         layout.addWidget(title)
+        layout.addWidget(self.worker_label)
+        layout.addWidget(self.warning_label)
         layout.addWidget(self.table)
 
     def setup_timer(self) -> None:
@@ -67,7 +89,96 @@ class ThreadTable(QWidget):
         processes: list[dict] = self.app_controller.recorder_manager.list_processes()
         self.table.setRowCount(len(processes))
 
+        lagging: list[str] = []
         for row, process in enumerate(processes):
-            self.table.setItem(row, 0, QTableWidgetItem(str(process["pid"])))
-            self.table.setItem(row, 1, QTableWidgetItem(str(process["runtime"])))
-            self.table.setItem(row, 2, QTableWidgetItem(process["output"]))
+            progress: dict = process["progress"] or {}
+            usage: dict = process["resources"] or {}
+            values: list[str] = [
+                str(process["pid"]),
+                process["type"],
+                str(process["runtime"]),
+                self._format(progress.get("speed"), "{:.2f}x"),
+                self._format(progress.get("fps"), "{:.1f}"),
+                self._format(progress.get("bitrate_kbps"), "{:.0f} kb/s"),
+                f"{progress.get('dup_frames', 0)}/{progress.get('drop_frames', 0)}",
+                progress.get("out_time", "N/A"),
+                "",
+                "",
+                self._format_io(usage),
+                str(usage.get("handles", "N/A")),
+                process["priority"],
+                process["affinity"],
+                process["io_priority"],
+                process["output"],
+            ]
+            for col, value in enumerate(values):
+                item: QTableWidgetItem = QTableWidgetItem(value)
+                if process["lagging"]:
+                    item.setForeground(QColor("#ff6e6e"))
+                self.table.setItem(row, col, item)
+            self._update_charts(row, process["resource_history"])
+            if process["lagging"]:
+                lagging.append(f"{process['type']} ({process['pid']})")
+
+        workers: list = self.app_controller.recorder_manager.get_worker_resources()
+        if workers:
+            latest = workers[-1]
+            self.worker_label.setText(
+                f"Workers: CPU {latest.cpu_percent:.1f}%, "
+                f"RSS {self._format_bytes(latest.rss_bytes)}, "
+                f"{self._format_io(latest.to_dict())}")
+        else:
+            self.worker_label.setText("")
+
+        if lagging:
+            self.warning_label.setText(
+                "⚠ Encoder slower than real time: " + ", ".join(lagging))
+            self.warning_label.show()
+        else:
+            self.warning_label.hide()
+
+    @staticmethod
+    def _format(value: float | None, fmt: str) -> str:
+        """
+        Formats an optional metric value for display.
+        """
+        return "N/A" if value is None else fmt.format(value)
+
+    def _update_charts(self, row: int, history: list) -> None:
+        """
+        Draws the resource history of a row into its sparkline cells.
+        """
+        for name, (field, color) in self.CHART_COLUMNS.items():
+            col: int = self.COLUMNS.index(name)
+            chart = self.table.cellWidget(row, col)
+            if not isinstance(chart, Sparkline):
+                chart = Sparkline(color)
+                self.table.setCellWidget(row, col, chart)
+            values: list[float] = [getattr(s, field) for s in history]
+            if not values:
+                chart.set_values([], "N/A")
+            elif field == "rss_bytes":
+                chart.set_values(values, self._format_bytes(values[-1]))
+            else:
+                chart.set_values(values, f"{values[-1]:.1f}%")
+
+    @classmethod
+    def _format_io(cls, usage: dict) -> str:
+        """
+        Formats the disk read and write rates of a resource sample.
+        """
+        if not usage:
+            return "N/A"
+        return (f"R {cls._format_bytes(usage['read_rate'])}/s "
+                f"W {cls._format_bytes(usage['write_rate'])}/s")
+
+    @staticmethod
+    def _format_bytes(value: float) -> str:
+        """
+        Formats a byte count with a binary unit.
+        """
+        for unit in ("B", "KB", "MB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}"
+            value /= 1024
+        return f"{value:.1f} GB"
@@ -5,14 +5,22 @@ import threading
 import sys
 from time import sleep
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from src.core.util.colorizer import Colorizer
+from src.core.manager.archiver import DayArchiver
+from src.core.manager.catalog import MediaCatalog
+from src.core.manager.compaction import SegmentCompactor
 from src.core.manager.config import ConfigManager
 from src.core.manager.recorder import RecorderManager
+from src.core.manager.recovery import SegmentRecovery
+from src.core.manager.tiering import TierMigrator
+from src.core.manager.transcoder import TranscodeQueue
 from src.core.manager.local_file import LocalFileManager
 from src.core.manager.uploader import UploaderManager
 from src.core.model.service.file_service import FileService
+from src.core.model.service.media_metadata_service import MediaMetadataService
+from src.core.uploader.live_stream import LiveStreamer, WebDAVChunkedTarget
 from src.core.util.logger import logger
 from src.core.util.monitor_lock_screen import create_screen_lock_monitor_thread
 
@@ -27,6 +35,13 @@ class AppController:
         self.uploader_manager: Optional[UploaderManager] = None
         self.config: Optional[ConfigManager] = None
         self.file_service: Optional[FileService] = None
+        self.live_streamer: Optional[LiveStreamer] = None
+        self.compactor: Optional[SegmentCompactor] = None
+        self.transcoder: Optional[TranscodeQueue] = None
+        self.recovery: Optional[SegmentRecovery] = None
+        self.tier_migrator: Optional[TierMigrator] = None
+        self.archiver: Optional[DayArchiver] = None
+        self.catalog: Optional[MediaCatalog] = None
         self.is_gui_mode: bool = False
         self.is_polling: bool = False
         self.is_recording: bool = False
@@ -58,9 +73,18 @@ class AppController:
                                                        self.file_service)
             self.uploader_manager = UploaderManager(self.config,
                                                     self.file_service)
+            self.setup_recovery()
 
             # Initialize the recorder manager
             self.recorder_manager = RecorderManager(self.config)
+            self.recorder_manager.add_start_listener(
+                self.local_file_manager.follow_segment_list)
+            self.setup_live_upload()
+            self.setup_transcoding()
+            self.setup_compaction()
+            self.setup_tiering()
+            self.setup_archiving()
+            self.setup_catalog()
 
             logger.info(
                 Colorizer.green("✓ Components initialized successfully"))
@@ -69,6 +93,75 @@ class AppController:
                 Colorizer.red(f"✗ Components initialization failed: {e}"))
             sys.exit(1)
 
+    def setup_live_upload(self) -> None:
+        """Stream segments to WebDAV while they are written, if enabled"""
+        live_config: Dict[str, Any] = self.config.get("live_upload", {})
+        if not live_config.get("enabled", False):
+            return
+        self.live_streamer = LiveStreamer(
+            WebDAVChunkedTarget(self.uploader_manager.webdav),
+            self.local_file_manager,
+            poll_interval=live_config.get("poll_interval", 0.5),
+        )
+        for recorder in self.recorder_manager.get_recorders():
+            if recorder.is_streamable():
+                recorder.add_start_listener(self.live_streamer.follow)
+            else:
+                logger.info(
+                    f"Live upload skipped for {recorder.get_recorder_type()}: "
+                    "output container is not streamable")
+
+    def setup_recovery(self) -> None:
+        """Recover segments left behind by a crash, if enabled"""
+        if not self.config.get("recovery", {}).get("enabled", True):
+            return
+        self.recovery = SegmentRecovery(self.config, self.local_file_manager)
+        # Claiming is quick and must finish before recorders write again;
+        # checking and repairing runs in the background
+        self.recovery.start(self.recovery.claim_orphans())
+
+    def setup_compaction(self) -> None:
+        """Merge finished hours of segments in the background, if enabled"""
+        if not self.config.get("compaction", {}).get("enabled", False):
+            return
+        self.compactor = SegmentCompactor(
+            self.config, self.file_service, self.local_file_manager,
+            self.transcoder.is_active if self.transcoder else None)
+        self.compactor.start()
+
+    def setup_transcoding(self) -> None:
+        """Re-encode finished segments while idle or locked, if enabled"""
+        if not self.config.get("transcode", {}).get("enabled", False):
+            return
+        self.transcoder = TranscodeQueue(self.config, self.file_service,
+                                         lambda: self.is_locked)
+        self.transcoder.start()
+
+    def setup_tiering(self) -> None:
+        """Move older recordings to colder storage tiers, if enabled"""
+        if not self.config.get("tiering", {}).get("enabled", False):
+            return
+        self.tier_migrator = TierMigrator(self.config, self.file_service,
+                                          self.uploader_manager.is_uploading)
+        self.tier_migrator.start()
+
+    def setup_archiving(self) -> None:
+        """Pack closed days into one archive each, if enabled"""
+        if not self.config.get("archive", {}).get("enabled", False):
+            return
+        self.archiver = DayArchiver(self.config, self.file_service,
+                                    self.uploader_manager.is_uploading)
+        self.archiver.start()
+
+    def setup_catalog(self) -> None:
+        """Probe recordings into the media metadata catalog, if enabled"""
+        if not self.config.get("catalog", {}).get("enabled", True):
+            return
+        self.catalog = MediaCatalog(
+            self.config, MediaMetadataService(db_path="db/file_tracker.db"))
+        self.local_file_manager.add_register_listener(self.catalog.submit)
+        self.catalog.start()
+
     def setup(self) -> None:
         """Sets up the application by initializing configuration and components."""
         if not self.config:
@@ -113,6 +206,18 @@ class AppController:
         """Clean up resources"""
         self.stop_recording()
         self.stop_polling()
+        if self.compactor:
+            self.compactor.stop()
+        if self.transcoder:
+            self.transcoder.stop()
+        if self.tier_migrator:
+            self.tier_migrator.stop()
+        if self.archiver:
+            self.archiver.stop()
+        if self.catalog:
+            self.catalog.stop()
+        if self.local_file_manager:
+            self.local_file_manager.silence_queue.shutdown()
         logger.debug("AppController: cleanup completed")
 
     def poll_and_sync(self) -> None:
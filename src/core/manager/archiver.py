@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+import zipfile
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.manager.config import ConfigManager
+from src.core.manager.tiering import StorageTier, get_storage_tiers
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.recorder.formats import is_recording_file
+from src.core.util.colorizer import Colorizer
+from src.core.util.day_archive import pack_directory
+from src.core.util.logger import logger
+from src.core.util.priority import lowered_thread_priority
+
+# Date partitions written below the device folder: <device>/<YYYYmmdd>/...
+_PARTITION_RE: re.Pattern = re.compile(r"^\d{8}$")
+
+
+class DayArchiver:
+    """
+    Packs the date partitions of closed days into one uncompressed zip
+    archive each, <device>/<YYYYmmdd>.zip, so scans, backups and retention
+    handle a single file per day instead of thousands. An archive is
+    verified before its directory is removed, and the records of the packed
+    files keep their paths and point at their data by archive offset, so a
+    recording can still be read with random access. Days with files not
+    registered or not uploaded yet are left for a later pass.
+    """
+
+    def __init__(self, config: ConfigManager, file_service: FileService,
+                 is_busy: Callable[[str], bool]) -> None:
+        """
+        Initializes the DayArchiver.
+
+        Args:
+            config: The ConfigManager instance.
+            file_service: The FileService instance.
+            is_busy: Reports whether a local file is being uploaded.
+        """
+        self.file_service: FileService = file_service
+        self.is_busy: Callable[[str], bool] = is_busy
+        self.tiers: List[StorageTier] = get_storage_tiers(config)
+        archive_config: Dict[str, Any] = config.get("archive", {})
+        self.interval: float = archive_config.get("interval", 3600)
+        # Days that must have passed since a partition's date
+        self.min_age_days: int = archive_config.get("min_age_days", 2)
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts packing in the background every interval."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="day-archiver",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops packing after the current day."""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        """Runs a packing pass each interval."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                with lowered_thread_priority("background"):
+                    self.pack_closed_days()
+            except Exception as e:
+                logger.error(Colorizer.red(f"✗ Day archiving error: {e}"))
+
+    def pack_closed_days(self) -> int:
+        """
+        Packs every closed day partition in the storage tiers.
+
+        Returns:
+            The number of days packed.
+        """
+        cutoff: str = (datetime.now() -
+                       timedelta(days=self.min_age_days)).strftime("%Y%m%d")
+        packed: int = 0
+        for directory in self._closed_days(cutoff):
+            if self._stop_event.is_set():
+                break
+            if self.pack_day(directory):
+                packed += 1
+        return packed
+
+    def _closed_days(self, cutoff: str) -> List[str]:
+        """Lists the day partitions up to the cutoff date, oldest first."""
+        days: List[Tuple[str, str]] = []
+        for tier in self.tiers:
+            try:
+                devices = [e for e in os.scandir(tier.path) if e.is_dir()]
+            except OSError:
+                continue
+            for device in devices:
+                try:
+                    entries = list(os.scandir(device.path))
+                except OSError:
+                    continue
+                days.extend(
+                    (entry.name, entry.path.replace("\\", "/"))
+                    for entry in entries if entry.is_dir()
+                    and _PARTITION_RE.match(entry.name)
+                    and entry.name <= cutoff)
+        return [path for _, path in sorted(days)]
+
+    def pack_day(self, directory: str) -> bool:
+        """
+        Packs one day partition and replaces it with its archive.
+
+        Args:
+            directory: The partition, with forward slashes.
+
+        Returns:
+            True if the day was packed.
+        """
+        records: Dict[str, File] = {
+            file.local_path: file
+            for file in self.file_service.get_day_files(directory)
+        }
+        for current, _, names in os.walk(directory):
+            for name in names:
+                path: str = os.path.join(current, name).replace("\\", "/")
+                if not is_recording_file(name):
+                    continue
+                record: Optional[File] = records.get(path)
+                if record is None or record.status == "pending":
+                    logger.debug(f"Not packing {directory}: {path} is not "
+                                 "registered or uploaded yet")
+                    return False
+                if self.is_busy(path):
+                    return False
+
+        archive_path: str = f"{directory}.zip"
+        if os.path.exists(archive_path):
+            logger.warning(f"Not packing {directory}: {archive_path} exists")
+            return False
+        try:
+            offsets: Dict[str, int] = pack_directory(directory, archive_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.error(f"Failed to pack {directory}: {e}")
+            return False
+
+        # Records first: the watcher sees the directory go and must find
+        # the files packed, not missing
+        self.file_service.record_archive(archive_path, [
+            (f"{directory}/{member}", offset)
+            for member, offset in offsets.items()
+            if f"{directory}/{member}" in records
+        ])
+        try:
+            shutil.rmtree(directory)
+        except OSError as e:
+            logger.warning(f"Failed to remove packed directory "
+                           f"{directory}: {e}")
+        logger.info(
+            Colorizer.green(f"✓ Packed {len(offsets)} files into "
+                            f"{archive_path}"))
+        return True
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.manager.config import ConfigManager
+from src.core.model.entity.media_metadata import MediaMetadata
+from src.core.model.service.media_metadata_service import MediaMetadataService
+from src.core.recorder.formats import is_recording_file
+from src.core.util.colorizer import Colorizer
+from src.core.util.logger import logger
+from src.core.util.media_probe import MediaInfo, probe_media
+
+
+class MediaCatalog:
+    """
+    Keeps a catalog of the duration, codecs, resolution, bitrate, start
+    time and readability of every recording. Segments are probed as they
+    are registered, and a periodic pass probes recordings whose size or
+    mtime differs from their catalog entry, such as merged or re-encoded
+    files. Each probe is an ffmpeg process at below normal priority; the
+    worker count bounds how many run at once. Unchanged files are never
+    probed again.
+    """
+
+    def __init__(self, config: ConfigManager,
+                 metadata_service: MediaMetadataService) -> None:
+        """
+        Initializes the MediaCatalog.
+
+        Args:
+            config: The ConfigManager instance.
+            metadata_service: Stores the catalog.
+        """
+        self.metadata_service: MediaMetadataService = metadata_service
+        catalog_config: Dict[str, Any] = config.get("catalog", {})
+        self.interval: float = catalog_config.get("interval", 3600)
+        self.batch_size: int = catalog_config.get("batch_size", 200)
+        self.timeout: float = catalog_config.get("probe_timeout", 120)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=catalog_config.get("workers", 2),
+            thread_name_prefix="probe")
+        self._queued: Dict[str, Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts cataloguing changed recordings now and every interval."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="media-catalog",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops cataloguing; probes already running finish."""
+        self._stop_event.set()
+        with self._lock:
+            for future in self._queued.values():
+                future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def submit(
+        self,
+        paths: List[str],
+        cached: Optional[Dict[str, Tuple[Optional[int],
+                                         Optional[float]]]] = None
+    ) -> List[Future]:
+        """
+        Queues recordings for probing, skipping those already queued.
+
+        Args:
+            paths: Local paths of the recordings.
+            cached: The size and mtime in the catalog of each path, if
+                already read; looked up per file otherwise.
+
+        Returns:
+            The futures of the probes queued.
+        """
+        futures: List[Future] = []
+        with self._lock:
+            for path in paths:
+                if path in self._queued or not is_recording_file(path):
+                    continue
+                try:
+                    future: Future = self._executor.submit(
+                        self._probe, path,
+                        cached.get(path, (None, None))
+                        if cached is not None else None)
+                except RuntimeError:
+                    break  # Stopped
+                self._queued[path] = future
+                futures.append(future)
+        return futures
+
+    def _run(self) -> None:
+        """Runs a catalog pass each interval."""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(Colorizer.red(f"✗ Media catalog error: {e}"))
+            self._stop_event.wait(self.interval)
+
+    def refresh(self) -> int:
+        """
+        Probes every recording whose catalog entry is missing or out of
+        date, and drops the entries of deleted files.
+
+        Returns:
+            The number of recordings probed.
+        """
+        probed: int = 0
+        last_id: int = 0
+        while not self._stop_event.is_set():
+            stale: List[Tuple[int, str, Optional[int], Optional[float]]] = (
+                self.metadata_service.get_stale_files(last_id,
+                                                      self.batch_size))
+            if not stale:
+                break
+            last_id = stale[-1][0]
+            cached: Dict[str, Tuple[Optional[int], Optional[float]]] = {
+                path: (size, mtime)
+                for _, path, size, mtime in stale
+            }
+            # One batch at a time keeps the queue short for new segments
+            done, _ = wait(self.submit(list(cached), cached))
+            probed += sum(1 for future in done
+                          if not future.cancelled() and future.result())
+        removed: int = self.metadata_service.remove_missing()
+        if probed or removed:
+            logger.info(f"Media catalog: probed {probed} recordings, "
+                        f"dropped {removed} deleted")
+        return probed
+
+    def _probe(
+        self, path: str,
+        cached: Optional[Tuple[Optional[int], Optional[float]]] = None
+    ) -> bool:
+        """
+        Probes one recording unless its catalog entry is current.
+
+        Args:
+            path: The local path of the recording.
+            cached: The size and mtime in the catalog, or None to look
+                them up.
+
+        Returns:
+            True if the recording was probed.
+        """
+        try:
+            try:
+                stat: os.stat_result = os.stat(path)
+            except OSError:
+                return False
+            if cached is None:
+                known: Optional[MediaMetadata] = (
+                    self.metadata_service.get_metadata(path))
+                cached = ((known.file_size, known.mtime) if known else
+                          (None, None))
+            if cached == (stat.st_size, stat.st_mtime):
+                return False
+
+            info: Optional[MediaInfo] = probe_media(path,
+                                                    timeout=self.timeout,
+                                                    low_priority=True)
+            entry: MediaMetadata = MediaMetadata(
+                local_path=path,
+                file_size=stat.st_size,
+                mtime=stat.st_mtime,
+                valid=info is not None,
+                probed_at=time.time())
+            if info is not None:
+                entry.duration = info.duration
+                entry.video_codec = info.video_codec
+                entry.audio_codec = info.audio_codec
+                entry.width = info.width
+                entry.height = info.height
+                entry.bitrate = info.bitrate
+                entry.start_time = info.start_time
+            else:
+                logger.warning(Colorizer.yellow(f"Unreadable recording: {path}"))
+            self.metadata_service.save_metadata([entry])
+            return True
+        except Exception as e:
+            logger.error(f"Failed to probe {path}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._queued.pop(path, None)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.manager.config import ConfigManager
+from src.core.manager.local_file import LocalFileManager
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.recorder.formats import is_recording_file, muxer_for_extension
+from src.core.util.colorizer import Colorizer
+from src.core.util.ffmpeg import run_ffmpeg
+from src.core.util.logger import logger
+
+# Segment names written by the recorders: %Y%m%d_%H%M%S.<ext>
+_SEGMENT_RE: re.Pattern = re.compile(r"^(\d{8}_\d{2})\d{4}(\.\w+)$")
+
+
+def segment_hour_end(path: str) -> Optional[datetime]:
+    """
+    Gets the end of the hour a segment was recorded in, from its name.
+
+    Args:
+        path: The segment path.
+
+    Returns:
+        The end of the segment's hour, or None for other files.
+    """
+    match = _SEGMENT_RE.match(os.path.basename(path))
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d_%H") + timedelta(hours=1)
+
+
+class SegmentCompactor:
+    """
+    Concatenates the segments of each finished hour into one file per
+    source with ffmpeg's concat demuxer and stream copy, so short segment
+    durations do not leave thousands of tiny files behind. Segments stay
+    individually uploadable until their hour is merged, and only segments
+    that are still pending are merged. Candidates are read from the
+    database, so a pass does not walk the storage tree. Uploads are not
+    held back for compaction: a merge is discarded if any of its segments
+    was uploaded while it ran, and the hour stays as separate segments.
+    """
+
+    def __init__(self,
+                 config: ConfigManager,
+                 file_service: FileService,
+                 local_file_manager: LocalFileManager,
+                 is_busy: Optional[Callable[[str], bool]] = None) -> None:
+        """
+        Initializes the SegmentCompactor.
+
+        Args:
+            config: The ConfigManager instance.
+            file_service: The FileService instance.
+            local_file_manager: Maps local paths to remote paths.
+            is_busy: Reports whether a segment is being re-encoded; hours
+                with such a segment are left for a later pass.
+        """
+        self.config: ConfigManager = config
+        self.file_service: FileService = file_service
+        self.local_file_manager: LocalFileManager = local_file_manager
+        self.is_busy: Callable[[str], bool] = is_busy or (lambda _: False)
+        compaction_config: Dict[str, Any] = config.get("compaction", {})
+        self.interval: float = compaction_config.get("interval", 600)
+        self.min_segments: int = compaction_config.get("min_segments", 2)
+        self.workers: int = compaction_config.get("workers", 1)
+        # Time after the hour ends before its last segment counts as final
+        self.grace: float = compaction_config.get(
+            "grace", 2 * (config.get_segment_duration() or 60) + 60)
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts compacting in the background every interval."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="segment-compactor",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background compaction after the current pass."""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        """Runs a compaction pass each interval."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.compact_finished_hours()
+            except Exception as e:
+                logger.error(Colorizer.red(f"✗ Compaction error: {e}"))
+
+    def compact_finished_hours(self) -> int:
+        """
+        Merges the segments of every finished hour.
+
+        Returns:
+            The number of hourly files written.
+        """
+        groups: List[Tuple[str, List[File]]] = self._find_finished_groups()
+        if not groups:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="compaction") as executor:
+            results: List[bool] = list(
+                executor.map(lambda g: self._compact(*g), groups))
+        return sum(results)
+
+    def _find_finished_groups(self) -> List[Tuple[str, List[File]]]:
+        """Groups pending segments by directory and hour, keeping finished
+        hours."""
+        base_path: str = self.config.get_storage_config()["local_path"]
+        device_path: str = os.path.join(
+            base_path, self.config.get_device_name()).replace("\\", "/")
+        cutoff: datetime = datetime.now() - timedelta(seconds=self.grace)
+
+        groups: Dict[Tuple[str, str, str], List[File]] = {}
+        for record in self.file_service.get_pending_in_tree(
+                device_path, cutoff.timestamp()):
+            root, name = os.path.split(record.local_path)
+            match = _SEGMENT_RE.match(name)
+            if not match or not is_recording_file(name):
+                continue
+            hour, extension = match.groups()
+            groups.setdefault((root, hour, extension), []).append(record)
+
+        finished: List[Tuple[str, List[File]]] = []
+        for (root, hour, extension), records in groups.items():
+            if segment_hour_end(records[0].local_path) > cutoff:
+                continue
+            if len(records) < self.min_segments:
+                continue
+            if any(self.is_busy(r.local_path) for r in records):
+                continue
+            # Re-encoded and original segments differ in codec parameters
+            # and cannot be stream-copied into one file
+            if len({self._is_reencoded(r) for r in records}) > 1:
+                continue
+            finished.append((f"{root}/{hour}{extension}", records))
+        return finished
+
+    @staticmethod
+    def _is_reencoded(record: File) -> bool:
+        """Whether the idle-time transcoder replaced the segment."""
+        return (record.original_size is not None
+                and record.original_size != record.file_size)
+
+    def _compact(self, target: str, records: List[File]) -> bool:
+        """
+        Concatenates segments into the target and records the merge.
+
+        Args:
+            target: The hourly file to write.
+            records: The segment records, in recording order.
+
+        Returns:
+            True if the segments were merged.
+        """
+        segments: List[str] = [record.local_path for record in records]
+        if os.path.exists(target):
+            logger.debug(f"Hourly file already exists: {target}")
+            return False
+        muxer: Optional[str] = muxer_for_extension(
+            os.path.splitext(target)[1])
+        partial: str = f"{target}.part"
+        list_file: str = self._write_concat_list(segments)
+        try:
+            result = run_ffmpeg(
+                [
+                    "-hide_banner", "-nostdin", "-y", "-f", "concat", "-safe",
+                    "0", "-i", list_file, "-c", "copy", "-map", "0",
+                    *(["-f", muxer] if muxer else []), partial
+                ],
+                timeout=1800,
+                low_priority=True,
+            )
+            if result.returncode != 0:
+                logger.error(f"Failed to merge into {target}: "
+                             f"{result.stderr.strip().splitlines()[-1:]}")
+                self._remove(partial)
+                return False
+            os.replace(partial, target)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"Failed to merge into {target}: {e}")
+            self._remove(partial)
+            return False
+        finally:
+            self._remove(list_file)
+
+        recorded: bool = self.file_service.record_merge(
+            {
+                "local_path": target,
+                "remote_path": self.local_file_manager.get_remote_path(target),
+                "file_size": os.path.getsize(target),
+                "last_modified": os.path.getmtime(target),
+                "status": "pending",
+                # Already re-encoded segments must not be re-encoded again
+                "original_size": (sum(r.original_size for r in records)
+                                  if self._is_reencoded(records[0]) else None),
+            }, segments)
+        if not recorded:
+            # A segment was uploaded meanwhile; keep the segments instead
+            logger.info(f"Segments of {target} changed, merge discarded")
+            self._remove(target)
+            return False
+
+        for segment in segments:
+            self._remove(segment)
+        logger.info(
+            Colorizer.green(
+                f"✓ Merged {len(segments)} segments into {target}"))
+        return True
+
+    @staticmethod
+    def _write_concat_list(segments: List[str]) -> str:
+        """Writes a concat demuxer list file and returns its path."""
+        fd, path = tempfile.mkstemp(suffix=".txt", prefix="concat_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for segment in segments:
+                escaped: str = os.path.abspath(segment).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        return path
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Removes a file, ignoring one that is already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
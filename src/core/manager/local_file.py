@@ -1,14 +1,33 @@
 from __future__ import annotations
 import os
 import re
+import subprocess
 import time
-from typing import Dict, Set, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, List, Set, Optional, Tuple
 import threading
+from concurrent.futures import Future, wait
 
 from src.core.util.logger import logger
 from src.core.manager.config import ConfigManager
 from src.core.model.service.file_service import FileService
+from src.core.model.service.directory_service import DirectoryService
+from src.core.manager.scanner import (IncrementalScanner, ScanResult,
+                                      ScannedFile)
+from src.core.manager.silence_queue import SilenceQueue
+from src.core.manager.retention import RetentionEngine, RetentionProgress
+from src.core.manager.verifier import ExistenceVerifier, VerifyProgress
+from src.core.manager.tiering import (StorageTier, get_storage_tiers,
+                                      tier_root_of)
+from src.core.util.day_archive import open_recording
+from src.core.util.debounce import PathDebouncer
 from src.core.model.entity.file import File
+from src.core.recorder.formats import is_recording_file, recording_date
+from src.core.util.move_engine import MoveEngine
+from src.core.util.staging import MoveResult, StagingArea, get_staging_area
+from src.core.recorder.base_recoder import BaseRecorder
+from src.core.recorder.segment_list import (CompletedSegment,
+                                            SegmentListReader,
+                                            get_segment_list_reader)
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
@@ -32,12 +51,19 @@ class RecordingFileHandler(FileSystemEventHandler):
         Called when a file or directory is created.
 
         This method is triggered when a file is created, and it checks if the
-        created file is a recording file (mp4 or mp3). If so, it moves all other files
-        in the same directory to the target directory.
+        created file is a recording file. If so, it moves all other files
+        in the same directory to the target directory, unless the recorder
+        writing there reports completed segments through its segment list.
         """
-        if not event.is_directory and event.src_path.endswith(
-            (".mp4", ".mp3")):
+        if (not event.is_directory and is_recording_file(event.src_path)
+                and not self.manager.staging.is_recovering(event.src_path)):
+            if not self.manager.staging.has_room(event.src_path):
+                logger.warning(
+                    f"Staging volume of {event.src_path} is below its free "
+                    "space guard, the next recording will use the fallback")
             directory: str = os.path.dirname(event.src_path)
+            if self.manager.segment_lists.is_following(directory):
+                return
             self.manager.move_all_files_in_directory(
                 directory, exclude_file=event.src_path)
 
@@ -74,6 +100,39 @@ class RecordingFileHandler(FileSystemEventHandler):
     #         self.processing_files.discard(filepath)
 
 
+class StorageFileHandler(FileSystemEventHandler):
+    """
+    Passes file system events in local storage to the manager's debouncer,
+    so files moved, copied, restored or deleted there are reflected in the
+    database without waiting for a scan.
+    """
+
+    def __init__(self, manager: LocalFileManager) -> None:
+        """
+        Initializes the handler with a LocalFileManager instance.
+        """
+        self.manager: LocalFileManager = manager
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        """Called when a file or directory is created."""
+        if not event.is_directory:
+            self.manager.storage_events.touch(event.src_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Called when a file is written; postpones it until writes stop."""
+        if not event.is_directory:
+            self.manager.storage_events.touch(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Called when a file or directory is renamed or moved."""
+        self.manager.storage_events.touch(event.src_path)
+        self.manager.storage_events.touch(event.dest_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Called when a file or directory is deleted."""
+        self.manager.storage_events.touch(event.src_path)
+
+
 class LocalFileManager:
     """
     Manages local recording files, including monitoring, moving, and
@@ -89,10 +148,55 @@ class LocalFileManager:
         self.config: ConfigManager = config
         self.file_service: FileService = file_service
         self.db_path: str = "db/file_tracker.db"
-        self._setup_file_watcher()
+        self.staging: StagingArea = get_staging_area(config)
+        self.tiers: List[StorageTier] = get_storage_tiers(config)
+        self.retention: RetentionEngine = RetentionEngine(
+            file_service, [tier.path for tier in self.tiers],
+            workers=config.get("retention", {}).get("workers", 4))
+        self.verifier: ExistenceVerifier = ExistenceVerifier(
+            file_service,
+            workers=config.get("existence_check", {}).get("workers", 8))
+        self.mover: MoveEngine = MoveEngine(
+            config.get_storage_config().get("move_workers", 2))
+        self.segment_lists: SegmentListReader = get_segment_list_reader()
+        scan_config: Dict = config.get("scan", {})
+        self.scanner: IncrementalScanner = IncrementalScanner(
+            DirectoryService(self.db_path),
+            full_scan_interval=(scan_config.get("full_scan_interval", 86400)
+                                if scan_config.get("incremental", True) else
+                                0))
+        watch_config: Dict = config.get("storage_watch", {})
+        self.storage_events: PathDebouncer = PathDebouncer(
+            watch_config.get("debounce", 2.0), self.sync_storage_paths)
+        self._register_listeners: List[Callable[[List[str]], None]] = []
+        self.silence_queue: SilenceQueue = SilenceQueue(config, file_service)
         self._scan_lock: threading.Lock = threading.Lock()
         self._last_scan_time: float = 0
-        self._scan_interval: int = 3  # Throttling interval (seconds)
+        self._scan_interval: float = 3  # Throttling interval (seconds)
+        self._setup_file_watcher()
+        if watch_config.get("enabled", True) and self._watch_storage():
+            # Events keep the database current; scans only check consistency
+            self._scan_interval = watch_config.get(
+                "consistency_scan_interval", 3600)
+
+    def add_register_listener(self,
+                              listener: Callable[[List[str]], None]) -> None:
+        """
+        Registers a callback for files registered or updated in local
+        storage.
+
+        Args:
+            listener: Called with the local paths after they are recorded.
+        """
+        self._register_listeners.append(listener)
+
+    def _notify_registered(self, paths: List[str]) -> None:
+        """Passes newly recorded files to the register listeners."""
+        for listener in self._register_listeners:
+            try:
+                listener(paths)
+            except Exception as e:
+                logger.error(f"Failed to handle registered files: {e}")
 
     def _device_name_to_path(self, name: str) -> str:
         """
@@ -103,21 +207,52 @@ class LocalFileManager:
 
     def _setup_file_watcher(self) -> None:
         """
-        Sets up a file watcher to monitor the temporary directory for
+        Sets up a file watcher to monitor the staging directories for
         new recording files.
         """
         logger.debug("Setting up file monitoring")
-        base_path: str = self.config.get_storage_config()["local_path"]
-        tmp_path: str = ".tmp"
-        logger.debug(f"Creating temporary directory: {tmp_path}")
-        os.makedirs(tmp_path, exist_ok=True)
-
         self.event_handler: RecordingFileHandler = RecordingFileHandler(self)
         self.observer: Observer = Observer()
-        self.observer.schedule(self.event_handler, tmp_path, recursive=True)
+        for tmp_path in self.staging.roots():
+            logger.debug(f"Creating temporary directory: {tmp_path}")
+            try:
+                os.makedirs(tmp_path, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Cannot create staging directory: {e}")
+                continue
+            self.observer.schedule(self.event_handler,
+                                   tmp_path,
+                                   recursive=True)
         logger.debug("Starting file monitoring")
         self.observer.start()
 
+    def _watch_storage(self) -> bool:
+        """
+        Adds the device folder in local storage to the file watcher.
+
+        Returns:
+            True if the folder is being watched.
+        """
+        device_path: str = self._get_device_path()
+        try:
+            os.makedirs(device_path, exist_ok=True)
+            self.observer.schedule(StorageFileHandler(self),
+                                   device_path,
+                                   recursive=True)
+        except OSError as e:
+            logger.warning(f"Cannot watch storage directory: {e}")
+            return False
+        logger.debug(f"Watching storage directory: {device_path}")
+        return True
+
+    def _get_device_path(self) -> str:
+        """
+        Gets the device folder in local storage, with forward slashes.
+        """
+        base_path: str = self.config.get_storage_config()["local_path"]
+        return os.path.join(base_path,
+                            self.config.get_device_name()).replace("\\", "/")
+
     def scan_recordings(self) -> None:
         """
         Scans the recording directory for new or modified files, with
@@ -131,47 +266,106 @@ class LocalFileManager:
             logger.debug(
                 "Scanning recording directory for new or modified files")
 
-            new_files: List[Dict[str, str | int | float]] = []
-            base_path: str = self.config.get_storage_config()["local_path"]
-            device_path: str = os.path.join(
-                base_path, self.config.get_device_name()).replace("\\", "/")
-
-            for root, _, files in os.walk(device_path):
-                for file in files:
-                    local_path: str = os.path.join(root,
-                                                   file).replace("\\", "/")
-                    file_info: Dict[str, str | int
-                                    | float] = self._get_file_info(local_path)
-
-                    if self._should_process_file(file_info):
-                        new_files.append(file_info)
-                        self.file_service.register_file(file_info)
+            result: ScanResult = self.scanner.scan(self._get_device_path())
+            new_files: List[Dict[str, str | int | float]] = (
+                self._register_scanned(result.files))
+            self.scanner.commit(result)
 
             logger.debug(f"Found {len(new_files)} new or modified files")
 
             self._last_scan_time = current_time
             return
 
-    def move_tmp_file(self, filepath: str) -> None:
+    def sync_storage_paths(self, paths: List[str]) -> None:
+        """
+        Brings the records of paths that changed in local storage up to
+        date: files that appeared are registered and paths that vanished,
+        including whole directories, are marked as missing.
+
+        Args:
+            paths: Paths reported by the storage watcher.
+        """
+        present: List[ScannedFile] = []
+        missing: List[str] = []
+        for path in paths:
+            path = path.replace("\\", "/")
+            if self.staging.root_of(path) is not None:
+                continue
+            try:
+                stat: os.stat_result = os.stat(path)
+            except FileNotFoundError:
+                missing.append(path)
+                continue
+            except OSError as e:
+                logger.debug(f"Cannot stat {path}: {e}")
+                continue
+            if os.path.isfile(path) and is_recording_file(path):
+                present.append(
+                    ScannedFile(path, stat.st_size, stat.st_mtime))
+
+        if present:
+            registered = self._register_scanned(present)
+            logger.debug(f"Registered {len(registered)} files from events")
+        if missing:
+            self.file_service.mark_missing(missing)
+            logger.debug(f"Marked {len(missing)} paths as missing")
+
+    def _register_scanned(
+            self,
+            files: List[ScannedFile]) -> List[Dict[str, str | int | float]]:
+        """
+        Registers the found recordings that are new or not settled yet, in
+        one lookup and one batched write. Other files, such as day archives
+        and notes, are ignored.
+
+        Returns:
+            The file information that was registered.
+        """
+        files = [scanned for scanned in files
+                 if is_recording_file(scanned.path)]
+        new_files: List[Dict[str, str | int | float]] = []
+        records: Dict[str, File] = self.file_service.get_files(
+            [scanned.path for scanned in files])
+        for scanned in files:
+            local_path: str = scanned.path
+            file_info: Dict[str, str | int | float] = {
+                "local_path": local_path,
+                "remote_path": self.get_remote_path(local_path),
+                "file_size": scanned.size,
+                "last_modified": scanned.mtime,
+            }
+
+            record: Optional[File] = records.get(local_path)
+            if self._should_process_record(local_path, record):
+                self._preserve_record_fields(file_info, record)
+                new_files.append(file_info)
+        self.file_service.register_files(new_files)
+        if new_files:
+            self.silence_queue.submit([
+                str(file_info["local_path"]) for file_info in new_files
+                if file_info.get("activity_ratio") is None
+            ])
+            self._notify_registered(
+                [str(file_info["local_path"]) for file_info in new_files])
+        return new_files
+
+    def move_tmp_file(self, filepath: str) -> Optional[Future]:
         """
-        Moves a completed recording file to its final destination.
+        Queues a completed recording file for moving to its final
+        destination.
 
-        This method constructs the destination path by replacing the ".tmp"
-        directory in the filepath with the configured local storage path.
+        The destination mirrors the file's place in the staging directory
+        under the configured local storage path.
+
+        Returns:
+            The queued move, or None if the file does not exist.
         """
         try:
             if os.path.exists(filepath):
-                # Construct target path
-                target_path: str = filepath.replace(
-                    ".tmp",
-                    self.config.get_storage_config()["local_path"])
-
-                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                os.rename(filepath, target_path)
-                logger.info(
-                    f"Moved completed file: {filepath} -> {target_path}")
+                return self._move_to_storage(filepath)
         except Exception as e:
             logger.error(f"Failed to move file: {e}")
+        return None
 
     def move_all_files_in_directory(self,
                                     directory: str,
@@ -184,96 +378,257 @@ class LocalFileManager:
         try:
             for filename in os.listdir(directory):
                 file_path: str = os.path.join(directory, filename)
-                if os.path.isfile(file_path) and file_path != exclude_file:
-                    # Construct target path
-                    target_path: str = file_path.replace(
-                        ".tmp",
-                        self.config.get_storage_config()["local_path"])
-
-                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                    os.rename(file_path, target_path)
-                    logger.info(
-                        f"Moved completed file: {file_path} -> {target_path}")
+                if (os.path.isfile(file_path) and file_path != exclude_file
+                        and is_recording_file(filename)):
+                    self._move_to_storage(file_path)
         except Exception as e:
             logger.error(f"Failed to move files in directory: {e}")
 
+    def follow_segment_list(self, recorder: BaseRecorder,
+                            process: subprocess.Popen) -> None:
+        """
+        Starts reading the segment list of a recording process. Suitable as
+        a BaseRecorder start listener.
+
+        Args:
+            recorder: The recorder that started.
+            process: Its FFmpeg process.
+        """
+        if not recorder.segment_list_path:
+            return
+        started_at: float = recorder.started_at or time.time()
+        self.segment_lists.follow(
+            recorder.segment_list_path, process,
+            lambda segment: self.complete_segment(segment, started_at))
+
+    def complete_segment(self, segment: CompletedSegment,
+                         started_at: float) -> None:
+        """
+        Moves a segment ffmpeg has closed to local storage and registers it
+        with its exact timing.
+
+        Args:
+            segment: The segment, as listed by the segment muxer.
+            started_at: Epoch seconds at which the recording process started.
+        """
+        target_path: str = self.get_target_path(segment.path).replace(
+            "\\", "/")
+        if os.path.exists(segment.path):
+            self._move_to_storage(
+                segment.path, lambda _: self._register_segment(
+                    segment, started_at, target_path))
+        elif os.path.exists(target_path):
+            self._register_segment(segment, started_at, target_path)
+        else:
+            logger.warning(f"Listed segment is missing: {segment.path}")
+
+    def _register_segment(self, segment: CompletedSegment, started_at: float,
+                          target_path: str) -> None:
+        """
+        Registers a segment that reached local storage with its timing.
+        """
+        file_info: Dict[str, str | int | float
+                        | bool] = self._get_file_info(target_path)
+        record: Optional[File] = self.file_service.get_file(target_path)
+        if not self._should_process_record(target_path, record):
+            return
+        self._preserve_record_fields(file_info, record)
+        file_info.update({
+            "status": "pending",
+            "segment_start": started_at + segment.start,
+            "segment_end": started_at + segment.end,
+            "duration": segment.duration,
+        })
+        self.file_service.register_file(file_info)
+        if file_info.get("activity_ratio") is None:
+            self.silence_queue.submit([target_path])
+        self._notify_registered([target_path])
+
+    def _move_to_storage(
+        self,
+        file_path: str,
+        on_done: Optional[Callable[[MoveResult], None]] = None
+    ) -> Future:
+        """
+        Queues a staged file for moving to local storage, by rename when
+        both are on one volume and by copy otherwise.
+        """
+        target_path: str = self.get_target_path(file_path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        return self.mover.submit(file_path, target_path, on_done)
+
+    def get_target_path(self, tmp_path: str,
+                        root: Optional[str] = None) -> str:
+        """
+        Maps a file in a staging directory to its final location under the
+        configured local storage path. Staging folders are not dated, so the
+        date folder is taken from the recording's own timestamp and inserted
+        after the device folder. A root may be given for files laid out like
+        the staging directories elsewhere.
+        """
+        local_path: str = self.config.get_storage_config()["local_path"]
+        root = root or self.staging.root_of(tmp_path)
+        if root is None:
+            return tmp_path.replace(".tmp", local_path)
+        parts: List[str] = os.path.relpath(tmp_path, root).split(os.sep)
+        if len(parts) > 2 and not re.fullmatch(r"\d{8}", parts[1]):
+            parts.insert(1, recording_date(tmp_path))
+        return os.path.join(local_path, *parts)
+
+    def open_recording(self, local_path: str) -> BinaryIO:
+        """
+        Opens a recording in local storage for reading, reading from its
+        day archive if it was packed.
+
+        Args:
+            local_path: The recording's local path, with forward slashes.
+
+        Returns:
+            A binary file object supporting random access.
+        """
+        record: Optional[File] = self.file_service.get_file(local_path)
+        if record is None or not record.archive_path:
+            return open(local_path, "rb")
+        return open_recording(local_path, record.archive_path,
+                              record.archive_offset, record.file_size)
+
+    def get_remote_path(self, local_path: str) -> str:
+        """
+        Maps a file in local storage, in any storage tier, to its WebDAV
+        path.
+        """
+        root: str = (tier_root_of(self.tiers, local_path.replace("\\", "/"))
+                     or self.config.get_storage_config()["local_path"])
+        rel_path: str = os.path.relpath(local_path, root).replace("\\", "/")
+        web_dav_path: str = self.config.get_webdav_config()["remote_path"]
+        return f"{web_dav_path.rstrip('/')}/{rel_path}"
+
+    def register_streamed_file(self, tmp_path: str, file_size: int) -> None:
+        """
+        Records a segment that was fully uploaded by the live streamer while
+        it was being written, so the periodic sync does not upload it again.
+        """
+        target_path: str = self.get_target_path(tmp_path).replace("\\", "/")
+        # The file's own mtime, as scans record it; moving keeps it
+        last_modified: float = time.time()
+        for path in (target_path, tmp_path):
+            try:
+                last_modified = os.path.getmtime(path)
+                break
+            except OSError:
+                continue
+        self.file_service.register_file({
+            "local_path": target_path,
+            "remote_path": self.get_remote_path(target_path),
+            "file_size": file_size,
+            "last_modified": last_modified,
+            "status": "uploaded",
+        })
+
     def _get_file_info(self, local_path: str) -> Dict[str, str | int | float]:
         """
         Extracts file information for a given local file path.
         """
         logger.debug(f"Getting file information for {local_path}")
-        rel_path: str = os.path.relpath(
-            local_path,
-            self.config.get_storage_config()["local_path"]).replace("\\", "/")
-        web_dav_path: str = self.config.get_webdav_config()["remote_path"]
-        remote_path: str = f"{web_dav_path.rstrip('/')}/{rel_path}"
 
         return {
             "local_path": local_path,
-            "remote_path": remote_path,
+            "remote_path": self.get_remote_path(local_path),
             "file_size": os.path.getsize(local_path),
             "last_modified": os.path.getmtime(local_path),
         }
 
-    def _should_process_file(self, file_info: Dict[str,
-                                                   str | int | float]) -> bool:
+    def _should_process_record(self, local_path: str,
+                               record: Optional[File]) -> bool:
         """
-        Determines whether a file should be processed based on its
-        database record.
+        Determines whether a file should be processed given its database
+        record, or None if it has none.
         """
-        logger.debug(
-            f"Determining if file {file_info['local_path']} should be processed"
-        )
-        record: Optional[File] = self.file_service.get_file(
-            str(file_info["local_path"]))
+        logger.debug(f"Determining if file {local_path} should be processed")
 
         # If file exists but was marked as non-existent, update its status
         if record and not record.exists_locally:
-            self.file_service.check_file_exists(str(file_info["local_path"]))
+            self.file_service.update_file_existence(local_path, True)
 
         if not record:
             return True
 
-        should_process: bool = record.status != "uploaded"
+        # Silent segments that were skipped or deleted, and segments merged
+        # into an hourly file, stay settled
+        should_process: bool = record.status not in ("uploaded", "skipped",
+                                                     "deleted", "merged")
         return should_process
 
-    def delete_old_files(self, days: int) -> Tuple[int, int]:
+    def _preserve_record_fields(self, file_info: Dict[str, str | int | float
+                                                      | bool],
+                                record: Optional[File]) -> None:
+        """
+        Copies fields computed after registration from the existing record,
+        so registering the file again does not reset them.
+        """
+        if not record:
+            return
+        for field in ("activity_ratio", "original_size", "segment_start",
+                      "segment_end", "duration"):
+            if getattr(record, field) is not None:
+                file_info[field] = getattr(record, field)
+
+    def delete_old_files(
+        self,
+        days: int,
+        on_progress: Optional[Callable[[RetentionProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[int, int]:
         """
         Deletes local files older than a specified number of days.
 
         Args:
             days: Number of days to keep files
+            on_progress: Called after each batch with the counts so far
+            cancel_event: Stops the deletion when set
 
         Returns:
             Tuple of (deleted_count, failed_count)
         """
-        deleted_count: int = 0
-        failed_count: int = 0
+        progress: RetentionProgress = self.retention.run(
+            days, on_progress, cancel_event)
+        return progress.deleted, progress.failed
+
+    def verify_existence(
+        self,
+        on_progress: Optional[Callable[[VerifyProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[int, int]:
+        """
+        Checks whether every recorded file still exists locally.
 
-        old_files: List[File] = self.file_service.get_old_files(days)
-        for file in old_files:
-            try:
-                if os.path.exists(file.local_path):
-                    os.remove(file.local_path)
-                    self.file_service.check_file_exists(file.local_path)
-                    deleted_count += 1
-                    logger.info(f"Deleted old file: {file.local_path}")
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Failed to delete {file.local_path}: {e}")
+        Args:
+            on_progress: Called after each batch with the counts so far
+            cancel_event: Stops the check when set
 
-        return deleted_count, failed_count
+        Returns:
+            Tuple of (checked_count, changed_count)
+        """
+        progress: VerifyProgress = self.verifier.run(on_progress,
+                                                     cancel_event)
+        return progress.checked, progress.changed
 
     def move_all_tmp_files(self) -> None:
         """
-        Moves all files from the temporary directory and its subdirectories to their final locations.
+        Moves all files from the staging directories and their subdirectories to their final locations,
+        waiting until every move finished.
         """
-        tmp_path: str = ".tmp"
-        for root, _, files in os.walk(tmp_path):
-            for file in files:
-                if file.endswith((".mp4", ".mp3")):
+        moves: List[Future] = []
+        for tmp_path in self.staging.roots():
+            for root, _, files in os.walk(tmp_path):
+                for file in files:
                     temp_file: str = os.path.join(root, file)
-                    self.move_tmp_file(temp_file)
+                    if (is_recording_file(file)
+                            and not self.staging.is_recovering(temp_file)):
+                        move: Optional[Future] = self.move_tmp_file(temp_file)
+                        if move is not None:
+                            moves.append(move)
+        wait(moves)
 
     def __del__(self) -> None:
         """
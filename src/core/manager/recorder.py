@@ -1,18 +1,20 @@
 from __future__ import annotations
 import os
 import subprocess
+import threading
 
-import imageio_ffmpeg
-from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from src.core.util.logger import logger
 
 from src.core.recorder.audio_recorder import AudioRecorder
 from src.core.recorder.screen_recorder import ScreenRecorder
+from src.core.recorder.base_recoder import BaseRecorder
+from src.core.recorder.progress import ProgressSample
+from src.core.recorder.devices import AudioDeviceRegistry
 from src.core.manager.config import ConfigManager
-
-import win32process
+from src.core.util.ffmpeg_capabilities import get_capabilities
+from src.core.util.resource_sampler import ResourceSample, ResourceSampler
 
 
 class RecorderManager:
@@ -27,59 +29,95 @@ class RecorderManager:
         """
         self.config_manager: ConfigManager = config_manager
         self.processes: List[subprocess.Popen] = []
+        resource_config: Dict[str, Any] = config_manager.get("resources", {})
+        self.resource_sampler: ResourceSampler = ResourceSampler(
+            interval=resource_config.get("interval", 1.0),
+            history_size=resource_config.get("history_size", 120),
+            export_path=resource_config.get("export_path"),
+        )
+        # The application process hosts the upload and file workers
+        self.resource_sampler.watch("workers", os.getpid(), "workers")
+        self.resource_sampler.start()
         self.screen_recorder: ScreenRecorder = ScreenRecorder(
             self.config_manager)
+        self._start_listeners: List[Callable[[BaseRecorder, subprocess.Popen],
+                                             None]] = [self._watch_recorder]
+        self.screen_recorder.add_start_listener(self._watch_recorder)
         self.audio_recorders: List[AudioRecorder] = []
         self.show_ffmpeg_log: bool = config_manager.get_log_config().get(
             "ffmpeg", False)
-
-    def get_audio_devices(self) -> List[str]:
-        """Get available audio devices"""
-        ffmpeg_exe: str = imageio_ffmpeg.get_ffmpeg_exe()
+        self.device_registry: AudioDeviceRegistry = AudioDeviceRegistry(
+            ttl=config_manager.get_audio_config().get("device_cache_ttl", 300))
+        self.device_registry.start_monitoring()
+        # Audio recorders are kept per device so their templates are reused
+        self._audio_recorder_cache: Dict[str, AudioRecorder] = {}
+        self._audio_recorder_lock: threading.Lock = threading.Lock()
+        threading.Thread(target=self._prepare_templates, daemon=True).start()
+
+    def _prepare_templates(self) -> None:
+        """Probe ffmpeg and precompile command templates ahead of recording"""
         try:
-            # Add Windows specific process creation configuration
-            startupinfo: subprocess.STARTUPINFO = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-
-            result: subprocess.CompletedProcess = subprocess.run(
-                [
-                    ffmpeg_exe, "-list_devices", "true", "-f", "dshow", "-i",
-                    "dummy"
-                ],
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                startupinfo=startupinfo,
-                creationflags=win32process.CREATE_NO_WINDOW,
-            )
-            devices: List[str] = []
-            in_section: bool = False
-            for line in result.stderr.splitlines():
-                if "DirectShow audio devices" in line:
-                    in_section = True
-                    continue
-                if in_section and '"' in line:
-                    device: str = line[line.find('"') + 1:line.rfind('"')]
-                    if not device.startswith(("@device_cm_", "dummy:")):
-                        devices.append(device)
-            return devices
+            get_capabilities()
+            self.screen_recorder.prepare("FullScreen")
+            for device in self.get_audio_devices():
+                self._get_audio_recorder(device).prepare(device)
         except Exception as e:
-            logger.error(f"Failed to get audio devices: {e}")
-            return []
+            logger.warning(f"Failed to prepare recorder templates: {e}")
+
+    def _get_audio_recorder(self, device: str) -> AudioRecorder:
+        """Get the cached audio recorder for a device"""
+        with self._audio_recorder_lock:
+            if device not in self._audio_recorder_cache:
+                recorder: AudioRecorder = AudioRecorder(self.config_manager)
+                for listener in self._start_listeners:
+                    recorder.add_start_listener(listener)
+                self._audio_recorder_cache[device] = recorder
+            return self._audio_recorder_cache[device]
+
+    def add_start_listener(
+            self, listener: Callable[[BaseRecorder, subprocess.Popen],
+                                     None]) -> None:
+        """
+        Registers a callback for every recorder process started, including
+        those of audio recorders created later for new devices.
+
+        Args:
+            listener: Called with the recorder and its new process.
+        """
+        with self._audio_recorder_lock:
+            self._start_listeners.append(listener)
+            recorders: List[BaseRecorder] = [
+                self.screen_recorder,
+                *self._audio_recorder_cache.values()
+            ]
+        for recorder in recorders:
+            recorder.add_start_listener(listener)
+
+    def _watch_recorder(self, recorder: BaseRecorder,
+                        process: subprocess.Popen) -> None:
+        """Sample the resource usage of a newly started recorder process"""
+        self.resource_sampler.watch(str(process.pid), process.pid,
+                                    recorder.get_recorder_type())
+
+    def get_worker_resources(self) -> List[ResourceSample]:
+        """Get the resource history of the application process"""
+        return self.resource_sampler.history("workers")
+
+    def get_audio_devices(self) -> List[str]:
+        """Get available audio devices from the cached registry"""
+        return self.device_registry.get_devices()
 
     def start_recording(self) -> None:
         """Start all recording sessions"""
-        now: str = datetime.now().strftime("%Y%m%d")
+        # Date folders are created by the mover for each segment's own date
         base_folder: str = os.path.join(
             self.config_manager.get_storage_config()["local_path"],
             self.config_manager.get_device_name(),
-            now,
         )
 
         audio_devices: List[str] = self.get_audio_devices()
         self.audio_recorders = [
-            AudioRecorder(self.config_manager) for _ in audio_devices
+            self._get_audio_recorder(device) for device in audio_devices
         ]
 
         with ThreadPoolExecutor(max_workers=len(audio_devices) +
@@ -88,18 +126,13 @@ class RecorderManager:
 
             # Screen recording
             video_folder: str = os.path.join(base_folder, "screen")
-            os.makedirs(video_folder, exist_ok=True)
             futures.append(
                 executor.submit(self.screen_recorder.start_recording,
                                 "FullScreen", video_folder))
 
             # Audio recordings
             audio_folder: str = os.path.join(base_folder, "audio")
-            os.makedirs(audio_folder, exist_ok=True)
             for device, recorder in zip(audio_devices, self.audio_recorders):
-                device_folder: str = os.path.join(
-                    audio_folder, recorder._device_name_to_path(device))
-                os.makedirs(device_folder, exist_ok=True)
                 futures.append(
                     executor.submit(recorder.start_recording, device,
                                     audio_folder))
@@ -111,52 +144,51 @@ class RecorderManager:
     def stop_recording(self) -> None:
         """Stop all active recordings"""
         logger.debug("try to stop %d processes", len(self.processes))
-        for process in self.processes:
-            if process.poll() is None:
-                logger.debug("try to stop process: %s", process.pid)
-                process.terminate()
-                process.wait()
-                logger.debug("stopped process: %s", process.pid)
+        recorders: List[BaseRecorder] = [
+            r for r in self.get_recorders() if r.process in self.processes
+        ]
+        timeout: float = self.config_manager.get("stop_timeout", 5)
+        if recorders:
+            # Stop in parallel so each process gets the full timeout
+            with ThreadPoolExecutor(max_workers=len(recorders)) as executor:
+                list(
+                    executor.map(lambda r: r.stop_recording(timeout),
+                                 recorders))
         self.processes.clear()
         logger.debug("All recording processes stopped")
-        self._cleanup_temp_files()
 
     def restart_recording(self) -> None:
         """Restart all recordings"""
         self.stop_recording()
         self.start_recording()
 
+    def get_recorders(self) -> List[BaseRecorder]:
+        """Get all recorders, active or not"""
+        return [self.screen_recorder, *self.audio_recorders]
+
     def list_processes(self) -> List[Dict[str, Any]]:
-        """List active recording processes"""
-        return [{
-            "pid": p.pid,
-            "runtime": self.screen_recorder._get_process_runtime(p),
-            "output": self.screen_recorder._parse_output_path(p.args),
-        } for p in self.processes if p and p.poll() is None]
-
-    def _cleanup_temp_files(self) -> None:
-        """
-        Clean up temporary files in the .tmp directory.
-        Moves completed recordings to their final destination.
-        """
-        base_path: str = self.config_manager.get_storage_config()["local_path"]
-        device_path: str = os.path.join(base_path,
-                                        self.config_manager.get_device_name())
-        tmp_path: str = os.path.join(device_path, ".tmp")
-
-        if os.path.exists(tmp_path):
-            for file in os.listdir(tmp_path):
-                if file.endswith((".mp4", ".mp3")):
-                    temp_file: str = os.path.join(tmp_path, file)
-                    self._move_completed_recording(temp_file, device_path)
-
-    def _move_completed_recording(self, temp_file: str,
-                                  device_path: str) -> Optional[str]:
-        """Move completed recording to the device folder"""
-        if not os.path.exists(temp_file):
-            return None
-
-        new_file: str = os.path.join(device_path, os.path.basename(temp_file))
-        os.rename(temp_file, new_file)
-        logger.info(f"Moved {temp_file} to {new_file}")
-        return new_file
+        """List active recording processes with their encoder metrics"""
+        processes: List[Dict[str, Any]] = []
+        for recorder in self.get_recorders():
+            p: Optional[subprocess.Popen] = recorder.process
+            if not p or p not in self.processes or p.poll() is not None:
+                continue
+            latest: Optional[ProgressSample] = recorder.progress.latest()
+            usage: Optional[ResourceSample] = self.resource_sampler.latest(
+                str(p.pid))
+            processes.append({
+                "pid": p.pid,
+                "type": recorder.get_recorder_type(),
+                "runtime": recorder._get_process_runtime(p),
+                "output": recorder._parse_output_path(p.args),
+                "progress": latest.to_dict() if latest else None,
+                "history": recorder.progress.samples(),
+                "lagging": recorder.progress.is_lagging,
+                "priority": recorder.applied_settings.get("priority", "N/A"),
+                "affinity": recorder.applied_settings.get("affinity", "N/A"),
+                "io_priority": recorder.applied_settings.get(
+                    "io_priority", "N/A"),
+                "resources": usage.to_dict() if usage else None,
+                "resource_history": self.resource_sampler.history(str(p.pid)),
+            })
+        return processes
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.core.manager.config import ConfigManager
+from src.core.manager.local_file import LocalFileManager
+from src.core.recorder.formats import is_recording_file, muxer_for_extension
+from src.core.util.colorizer import Colorizer
+from src.core.util.ffmpeg import run_ffmpeg
+from src.core.util.logger import logger
+from src.core.util.media_probe import MediaInfo, probe_media
+from src.core.util.staging import RECOVERY_DIR, move_file
+
+
+class SegmentRecovery:
+    """
+    Recovers segments left in the staging directories by a crash or forced
+    shutdown. At startup, before any recorder runs, every staged recording
+    is claimed into the recovery folder of its staging directory, which is
+    a quick rename on the same volume. The claimed files are then checked in the background. Readable
+    files are remuxed with stream copy, which rewrites a truncated tail and
+    a missing index, and are moved to storage and registered. Files ffmpeg
+    cannot read at all, such as a classic MP4 without its moov atom, are
+    quarantined.
+    """
+
+    def __init__(self, config: ConfigManager,
+                 local_file_manager: LocalFileManager) -> None:
+        """
+        Initializes the SegmentRecovery.
+
+        Args:
+            config: The ConfigManager instance.
+            local_file_manager: Moves and registers recovered files.
+        """
+        self.local_file_manager: LocalFileManager = local_file_manager
+        recovery_config: Dict[str, Any] = config.get("recovery", {})
+        self.workers: int = recovery_config.get("workers", 2)
+        self.quarantine_path: str = recovery_config.get(
+            "quarantine_path", ".quarantine")
+        self._thread: Optional[threading.Thread] = None
+
+    def claim_orphans(self) -> List[str]:
+        """
+        Takes every recording left in the staging directories, and any
+        left in their recovery folders by an interrupted recovery. Must run
+        before the recorders start.
+
+        Returns:
+            The claimed files, inside the recovery folders.
+        """
+        claimed: List[str] = []
+        for root in self.local_file_manager.staging.roots():
+            work_dir: str = os.path.join(root, RECOVERY_DIR)
+            for directory, subdirectories, names in os.walk(root):
+                if directory == root and RECOVERY_DIR in subdirectories:
+                    subdirectories.remove(RECOVERY_DIR)
+                for name in names:
+                    path: str = os.path.join(directory, name)
+                    if is_recording_file(name):
+                        self._claim(path, root, work_dir)
+                    elif name.startswith(".segments_") or name.endswith(
+                            ".part"):
+                        # Segment lists and copies of a process that is gone
+                        self._remove(path)
+
+            for directory, _, names in os.walk(work_dir):
+                claimed.extend(
+                    os.path.join(directory, name) for name in names
+                    if is_recording_file(name))
+        if claimed:
+            logger.info(f"Found {len(claimed)} orphaned segments to recover")
+        return claimed
+
+    def start(self, paths: List[str]) -> None:
+        """
+        Recovers claimed files in the background.
+
+        Args:
+            paths: Files returned by claim_orphans.
+        """
+        if not paths:
+            return
+        self._thread = threading.Thread(target=self._run,
+                                        args=(paths, ),
+                                        name="segment-recovery",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, paths: List[str]) -> None:
+        """Recovers the files on a worker pool."""
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="recovery") as executor:
+            results: List[bool] = list(executor.map(self._recover, paths))
+        logger.info(
+            Colorizer.green(f"✓ Recovered {sum(results)} of {len(paths)} "
+                            "orphaned segments"))
+
+    def _claim(self, path: str, root: str, work_dir: str) -> None:
+        """Moves a staged file into its staging directory's recovery folder."""
+        target: str = os.path.join(work_dir, os.path.relpath(path, root))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            move_file(path, target)
+        except OSError as e:
+            logger.error(f"Failed to claim orphaned segment {path}: {e}")
+
+    def _recover(self, path: str) -> bool:
+        """
+        Repairs one file and hands it to the mover.
+
+        Returns:
+            True if the file was recovered, False if it was quarantined.
+        """
+        try:
+            if os.path.getsize(path) == 0 or probe_media(path) is None:
+                self._quarantine(path, "unreadable")
+                return False
+            if not self._remux(path):
+                self._quarantine(path, "remux failed")
+                return False
+            target: str = self.local_file_manager.get_target_path(
+                path, root=self._work_dir(path)).replace("\\", "/")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            self.local_file_manager.mover.submit(
+                path, target,
+                lambda _: self.local_file_manager.sync_storage_paths([target]))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to recover {path}: {e}")
+            return False
+
+    def _remux(self, path: str) -> bool:
+        """Rewrites a file with stream copy and swaps it in if it is valid."""
+        partial: str = f"{path}.part"
+        muxer: Optional[str] = muxer_for_extension(os.path.splitext(path)[1])
+        try:
+            result = run_ffmpeg(
+                [
+                    "-hide_banner", "-nostdin", "-y", "-err_detect",
+                    "ignore_err", "-fflags", "+discardcorrupt", "-i", path,
+                    "-map", "0", "-c", "copy",
+                    *(["-f", muxer] if muxer else []), partial
+                ],
+                timeout=600,
+                low_priority=True,
+            )
+        except subprocess.TimeoutExpired:
+            self._remove(partial)
+            return False
+        if result.returncode != 0 or not os.path.exists(partial):
+            self._remove(partial)
+            logger.warning(f"Remuxing {path} failed: "
+                           f"{result.stderr.strip().splitlines()[-1:]}")
+            return False
+        info: Optional[MediaInfo] = probe_media(partial)
+        if info is None or not info.duration:
+            self._remove(partial)
+            return False
+        os.replace(partial, path)
+        logger.info(f"Repaired orphaned segment {path} ({info.duration:.1f}s)")
+        return True
+
+    def _quarantine(self, path: str, reason: str) -> None:
+        """Moves an unrecoverable file aside, keeping its relative path."""
+        target: str = os.path.join(self.quarantine_path,
+                                   os.path.relpath(path, self._work_dir(path)))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            move_file(path, target)
+            logger.warning(
+                Colorizer.yellow(f"Quarantined {path} ({reason}): {target}"))
+        except OSError as e:
+            logger.error(f"Failed to quarantine {path}: {e}")
+
+    def _work_dir(self, path: str) -> str:
+        """Gets the recovery folder a claimed file lies in."""
+        root: Optional[str] = self.local_file_manager.staging.root_of(path)
+        return os.path.join(root or os.path.dirname(path), RECOVERY_DIR)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Removes a file, ignoring one that is already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.util.logger import logger
+
+
+@dataclass
+class RetentionProgress:
+    """Counts of a retention run so far"""
+    total: int
+    processed: int = 0
+    deleted: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
+
+class RetentionEngine:
+    """
+    Deletes local files past their retention on a worker pool. Existence
+    changes are written once per batch, and the day directories left empty
+    are removed in one pass at the end. Files packed into a day archive
+    are dropped from the records, and the archive is deleted once none of
+    its files remain. Progress is reported after every batch, and a run
+    stops between files once cancelled.
+    """
+
+    def __init__(self,
+                 file_service: FileService,
+                 roots: List[str],
+                 workers: int = 4,
+                 batch_size: int = 500) -> None:
+        """
+        Initializes the RetentionEngine.
+
+        Args:
+            file_service: The FileService instance.
+            roots: Storage roots; a root and its device folders are kept
+                even when empty.
+            workers: Number of deletions that may run at once.
+            batch_size: Files per batch and per database transaction.
+        """
+        self.file_service: FileService = file_service
+        self.roots: List[str] = [
+            os.path.abspath(root) for root in roots
+        ]
+        self.workers: int = workers
+        self.batch_size: int = batch_size
+
+    def run(self,
+            days: int,
+            on_progress: Optional[Callable[[RetentionProgress], None]] = None,
+            cancel_event: Optional[threading.Event] = None
+            ) -> RetentionProgress:
+        """
+        Deletes the local files older than a number of days.
+
+        Args:
+            days: Number of days to keep files.
+            on_progress: Called after each batch with the counts so far.
+            cancel_event: Stops the run when set.
+
+        Returns:
+            The final counts.
+        """
+        cancel_event = cancel_event or threading.Event()
+        old_files: List[File] = self.file_service.get_old_files(days)
+        progress: RetentionProgress = RetentionProgress(total=len(old_files))
+        archived: Dict[str, Optional[str]] = {
+            f.local_path: f.archive_path
+            for f in old_files
+        }
+        directories: Set[str] = set()
+        archives: Set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="retention") as executor:
+            for start in range(0, len(old_files), self.batch_size):
+                if cancel_event.is_set():
+                    break
+                batch: List[File] = old_files[start:start + self.batch_size]
+                results: List[Tuple[str, Optional[bool]]] = list(
+                    executor.map(
+                        lambda f: (f.local_path, self._delete(f, cancel_event)),
+                        batch))
+                gone: List[Tuple[bool, str]] = []
+                for path, deleted in results:
+                    if deleted is None:
+                        continue  # Skipped after cancellation
+                    progress.processed += 1
+                    if deleted:
+                        progress.deleted += 1
+                        if archived[path]:
+                            archives.add(archived[path])
+                        else:
+                            directories.add(os.path.dirname(path))
+                    elif os.path.exists(path):
+                        progress.failed += 1
+                        continue
+                    gone.append((False, path))
+                self.file_service.batch_update_existence(gone)
+                if on_progress:
+                    on_progress(progress)
+
+        progress.cancelled = cancel_event.is_set()
+        self._remove_empty_archives(archives)
+        self._remove_empty_directories(directories)
+        logger.info(f"Retention removed {progress.deleted} files, "
+                    f"{progress.failed} failed"
+                    f"{' (cancelled)' if progress.cancelled else ''}")
+        return progress
+
+    @staticmethod
+    def _delete(file: File, cancel_event: threading.Event) -> Optional[bool]:
+        """Deletes a file; None if cancelled, False if it was not deleted."""
+        if cancel_event.is_set():
+            return None
+        if file.archive_path:
+            return True  # Removed with its archive once that is empty
+        path: str = file.local_path
+        try:
+            os.remove(path)
+            logger.debug(f"Deleted old file: {path}")
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.error(f"Failed to delete {path}: {e}")
+            return False
+
+    def _remove_empty_archives(self, archives: Set[str]) -> None:
+        """Deletes the day archives none of whose files are kept."""
+        for archive in archives:
+            if self.file_service.count_archive_members(archive):
+                continue
+            try:
+                os.remove(archive)
+                logger.info(f"Deleted expired day archive: {archive}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to delete {archive}: {e}")
+
+    def _remove_empty_directories(self, directories: Set[str]) -> None:
+        """Removes emptied directories and their empty parents below the
+        device folders, deepest first."""
+        candidates: Set[str] = set()
+        for directory in directories:
+            directory = os.path.abspath(directory)
+            while self._removable(directory):
+                candidates.add(directory)
+                directory = os.path.dirname(directory)
+        for directory in sorted(candidates, key=len, reverse=True):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass  # Not empty
+
+    def _removable(self, directory: str) -> bool:
+        """Whether a directory lies at least two levels below a root."""
+        for root in self.roots:
+            if directory.startswith(root + os.sep):
+                return os.path.relpath(directory, root).count(os.sep) >= 1
+        return False
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from src.core.model.entity.directory import Directory
+from src.core.model.service.directory_service import DirectoryService
+from src.core.recorder.formats import is_recording_file
+from src.core.util.logger import logger
+
+# Date partitions written below the device folder: <device>/<YYYYmmdd>/...
+_PARTITION_RE: re.Pattern = re.compile(r"^\d{8}$")
+
+
+@dataclass
+class ScannedFile:
+    """A file found by a scan, with the stat values of its directory entry"""
+    path: str
+    size: int
+    mtime: float
+
+
+@dataclass
+class ScanResult:
+    """The files found by a scan and the directory index to store after it"""
+    files: List[ScannedFile] = field(default_factory=list)
+    listed: List[Directory] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    skipped: int = 0  # Directories trusted from the index without listing
+
+
+class IncrementalScanner:
+    """
+    Scans a device folder using a persisted index of directory mtimes and
+    recording counts. Today's partition and folders outside date partitions
+    are listed on every scan. A closed date partition is only listed where a
+    directory's mtime differs from the index, which happens when a file is
+    added, removed or replaced in it, or where the number of file records
+    in it, which the database keeps in the index as records change,
+    differs from the recordings counted by its last listing. That catches
+    files deleted, lost or left unregistered behind the scanner's back on
+    shares that do not update directory mtimes. Unchanged folders are
+    stat'ed but not listed. A full scan runs every full_scan_interval as a
+    safety net.
+    """
+
+    def __init__(self,
+                 directory_service: DirectoryService,
+                 full_scan_interval: float = 86400) -> None:
+        """
+        Initializes the IncrementalScanner.
+
+        Args:
+            directory_service: Stores the directory index.
+            full_scan_interval: Seconds between scans that list everything;
+                0 lists everything on every scan.
+        """
+        self.directory_service: DirectoryService = directory_service
+        self.full_scan_interval: float = full_scan_interval
+        self._last_full_scan: float = time.time()
+
+    def scan(self, root: str) -> ScanResult:
+        """
+        Finds the files of a device folder that may need registering.
+
+        Args:
+            root: The device folder, with forward slashes.
+
+        Returns:
+            The files in every listed directory, and the index update to
+            pass to commit once they are processed.
+        """
+        now: float = time.time()
+        full: bool = now - self._last_full_scan >= self.full_scan_interval
+        index: Dict[str, Directory] = {
+            d.path: d
+            for d in self.directory_service.get_directories(root)
+        }
+        children: Dict[str, List[str]] = {}
+        for path in index:
+            if path != root:
+                children.setdefault(os.path.dirname(path), []).append(path)
+
+        result: ScanResult = ScanResult()
+        visited: Set[str] = set()
+        today: str = datetime.now().strftime("%Y%m%d")
+        self._scan_directory(root, False, full, today, index, children,
+                             visited, result, now)
+        result.removed = [path for path in index if path not in visited]
+        if full:
+            self._last_full_scan = now
+        logger.debug(f"Scanned {root}: {len(result.listed)} directories "
+                     f"listed, {result.skipped} unchanged, "
+                     f"{len(result.files)} files")
+        return result
+
+    def commit(self, result: ScanResult) -> None:
+        """
+        Stores the directory index of a scan whose files were processed.
+
+        Args:
+            result: The result returned by scan.
+        """
+        self.directory_service.update_directories(result.listed,
+                                                  result.removed)
+
+    def _scan_directory(self, path: str, closed: bool, full: bool,
+                        today: str, index: Dict[str, Directory],
+                        children: Dict[str, List[str]], visited: Set[str],
+                        result: ScanResult, now: float) -> None:
+        """Lists a directory unless it is closed and unchanged, then recurses."""
+        try:
+            mtime_ns: int = os.stat(path).st_mtime_ns
+        except OSError:
+            return  # Removed; dropped from the index
+        visited.add(path)
+
+        known: Optional[Directory] = index.get(path)
+        if (closed and not full and known and known.mtime_ns == mtime_ns
+                and known.file_count == known.tracked_count):
+            # No entry was added or removed, so the subdirectories are the
+            # indexed ones
+            result.skipped += 1
+            for child in children.get(path, []):
+                self._scan_directory(child, True, full, today, index,
+                                     children, visited, result, now)
+            return
+
+        file_count: int = 0
+        subdirectories: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    entry_path: str = f"{path}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry_path)
+                    elif entry.is_file():
+                        # Served from the directory listing on Windows
+                        stat: os.stat_result = entry.stat()
+                        result.files.append(
+                            ScannedFile(entry_path, stat.st_size,
+                                        stat.st_mtime))
+                        if is_recording_file(entry.name):
+                            file_count += 1
+        except OSError as e:
+            logger.warning(f"Cannot list {path}: {e}")
+            return
+        # The mtime read before listing, so a change during it is seen next time
+        result.listed.append(Directory(path, mtime_ns, file_count, now))
+
+        for subdirectory in subdirectories:
+            name: str = os.path.basename(subdirectory)
+            child_closed: bool = closed or (_PARTITION_RE.match(name)
+                                            is not None and name < today)
+            self._scan_directory(subdirectory, child_closed, full, today,
+                                 index, children, visited, result, now)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from src.core.manager.config import ConfigManager
+from src.core.model.service.file_service import FileService
+from src.core.recorder.formats import is_audio_file
+from src.core.recorder.silence import (SILENCE_POLICIES, SilenceAnalysis,
+                                       analyze_silence)
+from src.core.util.logger import logger
+
+
+class SilenceQueue:
+    """
+    Measures the activity of registered audio segments on a background
+    pool, so the ffmpeg runs of silence detection do not hold up scans or
+    segment moves. The activity ratio is stored when an analysis finishes,
+    and an entirely silent segment still pending upload is then skipped or
+    deleted according to the configured policy. The uploader holds audio
+    back until its analysis is stored.
+    """
+
+    def __init__(self, config: ConfigManager,
+                 file_service: FileService) -> None:
+        """
+        Initializes the SilenceQueue.
+
+        Args:
+            config: The ConfigManager instance.
+            file_service: The FileService instance.
+        """
+        self.file_service: FileService = file_service
+        silence_config: Dict[str, Any] = config.get_audio_config().get(
+            "silence_detection", {})
+        self.enabled: bool = silence_config.get("enabled", False)
+        self.noise_db: float = silence_config.get("noise_db", -50)
+        self.min_duration: float = silence_config.get("min_duration", 0.5)
+        self.max_activity: float = silence_config.get("max_activity", 0.0)
+        self.policy: str = silence_config.get("policy", "keep")
+        if self.policy not in SILENCE_POLICIES:
+            logger.warning(f"Unknown silence policy {self.policy}, "
+                           "keeping files")
+            self.policy = "keep"
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=silence_config.get("workers", 1),
+            thread_name_prefix="silence")
+        self._queued: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+
+    def submit(self, paths: List[str]) -> None:
+        """
+        Queues audio segments for analysis, skipping those already queued.
+
+        Args:
+            paths: Local paths of registered segments.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for path in paths:
+                if path in self._queued or not is_audio_file(path):
+                    continue
+                try:
+                    self._executor.submit(self._analyze, path)
+                except RuntimeError:
+                    return  # Shut down
+                self._queued.add(path)
+
+    def shutdown(self) -> None:
+        """Stops analysing; queued segments are analysed on a later scan."""
+        self._executor.shutdown(wait=False)
+
+    def _analyze(self, local_path: str) -> None:
+        """Analyses one segment and applies the silence policy."""
+        try:
+            analysis: Optional[SilenceAnalysis] = analyze_silence(
+                local_path,
+                noise_db=self.noise_db,
+                min_duration=self.min_duration)
+            if analysis is None:
+                return
+            activity_ratio: float = round(analysis.activity_ratio, 4)
+            status: Optional[str] = None
+            if activity_ratio <= self.max_activity:
+                if self.policy == "skip":
+                    status = "skipped"
+                elif self.policy == "delete":
+                    status = "deleted"
+            if not self.file_service.record_silence(local_path,
+                                                    activity_ratio, status):
+                return  # Uploaded or settled meanwhile
+            if status == "skipped":
+                logger.info(
+                    f"Silent segment will not be uploaded: {local_path}")
+            elif status == "deleted":
+                self._delete(local_path)
+        except Exception as e:
+            logger.error(f"Failed to analyse silence in {local_path}: {e}")
+        finally:
+            with self._lock:
+                self._queued.discard(local_path)
+
+    def _delete(self, local_path: str) -> None:
+        """Deletes a silent segment and records it as gone."""
+        try:
+            os.remove(local_path)
+            logger.info(f"Deleted silent segment: {local_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to delete silent segment: {e}")
+            return
+        self.file_service.update_file_existence(local_path, False)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.manager.config import ConfigManager
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.util.colorizer import Colorizer
+from src.core.util.logger import logger
+from src.core.util.priority import lowered_thread_priority
+from src.core.util.staging import MoveResult, move_file
+
+
+@dataclass
+class StorageTier:
+    """A local storage location and the age from which files belong there"""
+    path: str
+    min_age_hours: float  # 0 for the hot tier
+
+
+def get_storage_tiers(config: ConfigManager) -> List[StorageTier]:
+    """
+    Gets the local storage tiers, hottest first.
+
+    Args:
+        config: The ConfigManager instance.
+
+    Returns:
+        The hot tier under storage.local_path, then the cold tiers listed
+        in storage.cold_tiers by increasing age.
+    """
+    storage_config: Dict[str, Any] = config.get_storage_config()
+    tiers: List[StorageTier] = [
+        StorageTier(storage_config["local_path"].replace("\\", "/"), 0)
+    ]
+    for tier in sorted(storage_config.get("cold_tiers", []),
+                       key=lambda t: t.get("min_age_hours", 24)):
+        tiers.append(
+            StorageTier(tier["path"].replace("\\", "/"),
+                        tier.get("min_age_hours", 24)))
+    return tiers
+
+
+def tier_root_of(tiers: List[StorageTier], path: str) -> Optional[str]:
+    """
+    Finds the tier a path lies in.
+
+    Args:
+        tiers: The storage tiers.
+        path: A local path, with forward slashes.
+
+    Returns:
+        The tier's root path, or None if the path is outside all tiers.
+    """
+    for tier in tiers:
+        root: str = tier.path.rstrip("/")
+        if path.startswith(root + "/"):
+            return root
+    return None
+
+
+class TierMigrator:
+    """
+    Moves finished recordings from the hot tier to colder tiers once they
+    reach a tier's age, and moves the oldest hot files early while the hot
+    tier exceeds its size budget. Files are moved one after another, in
+    path order, at background I/O priority and a capped rate. New locations
+    are written to the database in small chunks as files move, so uploads,
+    retention and the File Data page follow the files, and a crash leaves
+    at most one chunk of moved files with stale records.
+    """
+
+    def __init__(self, config: ConfigManager, file_service: FileService,
+                 is_busy: Callable[[str], bool]) -> None:
+        """
+        Initializes the TierMigrator.
+
+        Args:
+            config: The ConfigManager instance.
+            file_service: The FileService instance.
+            is_busy: Reports whether a local file is being uploaded.
+        """
+        self.file_service: FileService = file_service
+        self.is_busy: Callable[[str], bool] = is_busy
+        self.tiers: List[StorageTier] = get_storage_tiers(config)
+        tiering_config: Dict[str, Any] = config.get("tiering", {})
+        self.interval: float = tiering_config.get("interval", 1800)
+        self.batch_size: int = tiering_config.get("batch_size", 200)
+        # Moved files, or seconds, after which new locations are recorded
+        self.commit_size: int = tiering_config.get("commit_size", 20)
+        self.commit_interval: float = tiering_config.get(
+            "commit_interval", 2.0)
+        # Average copy rate cap; renames on one volume are not paced
+        self.max_bytes_per_second: float = tiering_config.get(
+            "max_mb_per_s", 50) * 1024 * 1024
+        self.hot_max_bytes: Optional[float] = (
+            tiering_config["hot_max_gb"] * 1024**3
+            if tiering_config.get("hot_max_gb") else None)
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts migrating in the background every interval."""
+        if len(self.tiers) < 2:
+            logger.warning("Storage tiering enabled without cold tiers")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="tier-migrator",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops migrating after the current file."""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        """Runs a migration pass each interval."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                with lowered_thread_priority("background"):
+                    self.migrate()
+            except Exception as e:
+                logger.error(Colorizer.red(f"✗ Tier migration error: {e}"))
+
+    def migrate(self) -> int:
+        """
+        Moves every file that belongs in a colder tier.
+
+        Returns:
+            The number of files moved.
+        """
+        moved: int = 0
+        # Coldest first, so a file due for the last tier moves only once
+        for index in range(len(self.tiers) - 1, 0, -1):
+            cutoff: float = time.time() - self.tiers[index].min_age_hours * 3600
+            for source in self.tiers[:index]:
+                moved += self._migrate_tree(source.path, self.tiers[index],
+                                            cutoff)
+        if self.hot_max_bytes is not None:
+            moved += self._enforce_hot_budget()
+        return moved
+
+    def _enforce_hot_budget(self) -> int:
+        """Moves the oldest hot files to the next tier until under budget."""
+        hot: StorageTier = self.tiers[0]
+        excess: float = (self.file_service.get_tree_size(hot.path) -
+                         self.hot_max_bytes)
+        if excess <= 0:
+            return 0
+        logger.info(f"Hot tier is {excess / 1024**2:.0f} MB over budget")
+        moved: int = 0
+        while excess > 0 and not self._stop_event.is_set():
+            files: List[File] = self.file_service.get_files_in_tree(
+                hot.path, time.time(), self.batch_size)
+            if not files:
+                break
+            batch: List[File] = []
+            for file in files:
+                batch.append(file)
+                excess -= file.file_size
+                if excess <= 0:
+                    break
+            count: int = self._move_batch(batch, hot.path, self.tiers[1])
+            if not count:
+                break
+            moved += count
+        return moved
+
+    def _migrate_tree(self, source_root: str, target: StorageTier,
+                      cutoff: float) -> int:
+        """Moves files older than the cutoff from one tier to another."""
+        moved: int = 0
+        while not self._stop_event.is_set():
+            files: List[File] = self.file_service.get_files_in_tree(
+                source_root, cutoff, self.batch_size)
+            if not files:
+                break
+            count: int = self._move_batch(files, source_root, target)
+            moved += count
+            if count < len(files):
+                break  # The rest are busy or failing; retry next pass
+        return moved
+
+    def _move_batch(self, files: List[File], source_root: str,
+                    target: StorageTier) -> int:
+        """Moves a batch sequentially, recording the moves in chunks."""
+        relocations: List[Tuple[str, str]] = []
+        moved: int = 0
+        started: float = time.monotonic()
+        last_commit: float = started
+        copied: int = 0
+        for file in sorted(files, key=lambda f: f.local_path):
+            if self._stop_event.is_set():
+                break
+            if self.is_busy(file.local_path):
+                continue
+            new_path: str = (target.path.rstrip("/") + "/" +
+                             file.local_path[len(source_root.rstrip("/")) +
+                                             1:])
+            try:
+                os.makedirs(os.path.dirname(new_path), exist_ok=True)
+                result: MoveResult = move_file(file.local_path, new_path)
+            except FileNotFoundError:
+                self.file_service.update_file_existence(file.local_path, False)
+                continue
+            except OSError as e:
+                logger.warning(f"Cannot migrate {file.local_path}: {e}")
+                continue
+            relocations.append((file.local_path, new_path))
+            if (len(relocations) >= self.commit_size or
+                    time.monotonic() - last_commit >= self.commit_interval):
+                self.file_service.relocate_files(relocations)
+                moved += len(relocations)
+                relocations = []
+                last_commit = time.monotonic()
+            if result.method == "copy":
+                copied += result.size
+                self._pace(copied, started)
+
+        if relocations:
+            self.file_service.relocate_files(relocations)
+            moved += len(relocations)
+        if moved:
+            logger.info(
+                Colorizer.green(f"✓ Migrated {moved} files to "
+                                f"{target.path}"))
+        return moved
+
+    def _pace(self, copied: int, started: float) -> None:
+        """Sleeps so the average copy rate stays under the cap."""
+        if not self.max_bytes_per_second:
+            return
+        ahead: float = (copied / self.max_bytes_per_second -
+                        (time.monotonic() - started))
+        if ahead > 0:
+            self._stop_event.wait(ahead)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.core.manager.config import ConfigManager
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.recorder.formats import is_video_file, muxer_for_extension
+from src.core.util.colorizer import Colorizer
+from src.core.util.ffmpeg import run_ffmpeg
+from src.core.util.ffmpeg_capabilities import get_capabilities
+from src.core.util.idle import get_idle_seconds
+from src.core.util.logger import logger
+from src.core.util.media_probe import probe_duration
+
+# Slow, dense settings per encoder; capture uses the fastest preset instead
+DENSE_ENCODER_ARGS: Dict[str, List[str]] = {
+    "libx265": ["-preset", "medium", "-crf", "30"],
+    "libx264": ["-preset", "slow", "-crf", "28"],
+}
+
+
+class TranscodeQueue:
+    """
+    Re-encodes finished screen segments with a slower, denser encoder
+    setting while the machine is idle or locked. Each result is checked
+    against the original duration, swapped in place of the original only if
+    it is smaller, and its sizes before and after are stored.
+    """
+
+    def __init__(self, config: ConfigManager, file_service: FileService,
+                 is_locked: Callable[[], bool]) -> None:
+        """
+        Initializes the TranscodeQueue.
+
+        Args:
+            config: The ConfigManager instance.
+            file_service: The FileService instance.
+            is_locked: Reports whether the screen is locked.
+        """
+        self.config: ConfigManager = config
+        self.file_service: FileService = file_service
+        self.is_locked: Callable[[], bool] = is_locked
+        transcode_config: Dict[str, Any] = config.get("transcode", {})
+        self.encoder: str = transcode_config.get("encoder", "libx265")
+        self.encoder_args: List[str] = transcode_config.get(
+            "args", DENSE_ENCODER_ARGS.get(self.encoder, []))
+        self.workers: int = transcode_config.get("workers", 1)
+        self.idle_seconds: float = transcode_config.get("idle_seconds", 300)
+        self.poll_interval: float = transcode_config.get("poll_interval", 30)
+        # Allowed duration difference, in seconds, between input and output
+        self.duration_tolerance: float = transcode_config.get(
+            "duration_tolerance", 0.5)
+        self._failed: Set[str] = set()
+        self._active: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts watching for idle time in the background."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="transcode-queue",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops queueing new jobs; running jobs finish."""
+        self._stop_event.set()
+
+    def is_idle(self) -> bool:
+        """Whether the machine is locked or has had no input for a while."""
+        return self.is_locked() or get_idle_seconds() >= self.idle_seconds
+
+    def is_active(self, local_path: str) -> bool:
+        """
+        Whether a file is being re-encoded right now.
+
+        Args:
+            local_path: The local path of the file.
+
+        Returns:
+            True while a job for the file runs or waits in the pool.
+        """
+        with self._lock:
+            return local_path in self._active
+
+    def is_candidate(self, file: File) -> bool:
+        """
+        Whether a file still waits to be re-encoded.
+
+        Args:
+            file: The file record.
+
+        Returns:
+            True for a pending screen segment that was not re-encoded yet.
+        """
+        return (file.status == "pending" and file.original_size is None
+                and is_video_file(file.local_path)
+                and file.local_path not in self._failed)
+
+    def _check_encoder(self) -> None:
+        """Falls back to libx264 if the bundled ffmpeg lacks the encoder."""
+        capabilities = get_capabilities()
+        if capabilities.encoders and not capabilities.has_encoder(
+                self.encoder):
+            logger.warning(
+                f"Encoder {self.encoder} is not available, using libx264")
+            self.encoder = "libx264"
+            self.encoder_args = DENSE_ENCODER_ARGS["libx264"]
+
+    def _run(self) -> None:
+        """Feeds the worker pool while the machine stays idle."""
+        self._check_encoder()
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="transcode") as executor:
+            while not self._stop_event.wait(self.poll_interval):
+                if not self.is_idle():
+                    continue
+                futures: List[Future] = []
+                for file in self.file_service.get_pending_files():
+                    if not self.is_idle() or self._stop_event.is_set():
+                        break
+                    with self._lock:
+                        if (not self.is_candidate(file)
+                                or file.local_path in self._active):
+                            continue
+                        self._active.add(file.local_path)
+                    futures.append(executor.submit(self._transcode, file))
+                    # Keep at most one job per worker in flight
+                    if len(futures) >= self.workers:
+                        futures.pop(0).result()
+                for future in futures:
+                    future.result()
+
+    def _transcode(self, file: File) -> None:
+        """Re-encodes one file and swaps it in if it is valid and smaller."""
+        path: str = file.local_path
+        try:
+            if self._transcode_file(file):
+                return
+            self._failed.add(path)
+        except Exception as e:
+            logger.error(f"Transcoding {path} failed: {e}")
+            self._failed.add(path)
+        finally:
+            with self._lock:
+                self._active.discard(path)
+
+    def _transcode_file(self, file: File) -> bool:
+        """Returns True once the file was replaced or found not worth it."""
+        path: str = file.local_path
+        if not os.path.exists(path):
+            return True
+        original_duration: Optional[float] = probe_duration(path)
+        if original_duration is None:
+            logger.warning(f"Cannot read duration of {path}, not transcoding")
+            return False
+
+        partial: str = f"{path}.part"
+        muxer: Optional[str] = muxer_for_extension(os.path.splitext(path)[1])
+        started: float = time.monotonic()
+        try:
+            result = run_ffmpeg(
+                [
+                    "-hide_banner", "-nostdin", "-y", "-i", path, "-map", "0",
+                    "-c", "copy", "-c:v", self.encoder, *self.encoder_args,
+                    *(["-f", muxer] if muxer else []), partial
+                ],
+                timeout=max(600, original_duration * 20),
+                low_priority=True,
+            )
+        except subprocess.TimeoutExpired:
+            self._remove(partial)
+            logger.warning(f"Transcoding {path} timed out")
+            return False
+        if result.returncode != 0:
+            self._remove(partial)
+            logger.warning(f"Transcoding {path} failed: "
+                           f"{result.stderr.strip().splitlines()[-1:]}")
+            return False
+
+        new_duration: Optional[float] = probe_duration(partial)
+        if (new_duration is None or abs(new_duration - original_duration)
+                > self.duration_tolerance):
+            self._remove(partial)
+            logger.warning(f"Transcoded {path} lasts {new_duration}s instead "
+                           f"of {original_duration}s, keeping the original")
+            return False
+
+        original: os.stat_result = os.stat(path)
+        original_size: int = original.st_size
+        new_size: int = os.path.getsize(partial)
+        if new_size >= original_size:
+            self._remove(partial)
+            # Record it as done so it is not tried again
+            self.file_service.record_transcode(path, original_size,
+                                               original_size)
+            return True
+
+        # The compactor may have merged the segment meanwhile; swapping in
+        # then would bring back a deleted file
+        current: Optional[File] = self.file_service.get_file(path)
+        if (current is None or current.status != "pending"
+                or current.merged_into):
+            self._remove(partial)
+            logger.debug(f"{path} was merged or uploaded meanwhile, "
+                         "discarding its re-encoded version")
+            return True
+
+        try:
+            os.replace(partial, path)
+            # Keep the recording time, which retention, tiering and the
+            # upload hold-back count from
+            os.utime(path, ns=(original.st_atime_ns, original.st_mtime_ns))
+        except OSError as e:
+            # Typically the file is being uploaded; try again later
+            self._remove(partial)
+            logger.debug(f"Cannot replace {path} yet: {e}")
+            return True
+        self.file_service.record_transcode(path, new_size, original_size)
+        logger.info(
+            Colorizer.green(
+                f"✓ Transcoded {path}: {original_size} -> {new_size} bytes "
+                f"({new_size / original_size:.0%}) in "
+                f"{time.monotonic() - started:.1f}s"))
+        return True
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Removes a file, ignoring one that is already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
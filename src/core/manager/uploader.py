@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Union
+import time
+from typing import Any, List, Dict, Union
 
 from src.core.model.entity.file import File
 from src.core.util.logger import logger
@@ -9,6 +10,8 @@ from src.core.model.service.file_service import FileService
 from src.core.util.colorizer import Colorizer
 from src.core.uploader.webdav_client import WebDAVClient
 from src.core.manager.config import ConfigManager
+from src.core.recorder.formats import is_audio_file, is_video_file
+from src.core.util.priority import lowered_thread_priority
 
 
 class UploaderManager:
@@ -26,8 +29,26 @@ class UploaderManager:
         self.config: ConfigManager = config
         self.file_service: FileService = file_service
         self.webdav: WebDAVClient = WebDAVClient(config)
+        transcode_config: Dict[str, Any] = config.get("transcode", {})
+        # How long an upload may wait for the idle-time re-encode
+        self.max_transcode_wait: float = (transcode_config.get(
+            "max_upload_delay", 900) if transcode_config.get(
+                "enabled", False) else 0)
+        silence_config: Dict[str, Any] = config.get_audio_config().get(
+            "silence_detection", {})
+        # How long an upload may wait for silence detection
+        self.max_silence_wait: float = (silence_config.get(
+            "max_upload_delay", 900) if silence_config.get(
+                "enabled", False) else 0)
 
     def sync_pending_files(self) -> None:
+        """Sync pending files to WebDAV server at reduced thread priority"""
+        with lowered_thread_priority(
+                self.config.get("workers", {}).get("priority",
+                                                   "below_normal")):
+            self._sync_pending_files()
+
+    def _sync_pending_files(self) -> None:
         """Sync pending files to WebDAV server"""
         pending_files: List[File] = self.file_service.get_pending_files()
         if not pending_files:
@@ -39,6 +60,14 @@ class UploaderManager:
                 if not os.path.exists(file.local_path):
                     logger.debug(f"File no longer exists: {file.local_path}")
                     continue
+                if self._awaits_transcode(file):
+                    logger.debug(
+                        f"Waiting for re-encoded version: {file.local_path}")
+                    continue
+                if self._awaits_silence_analysis(file):
+                    logger.debug(
+                        f"Waiting for silence detection: {file.local_path}")
+                    continue
 
                 logger.debug(
                     f"Attempting to upload file: {file.local_path} to {file.remote_path}"
@@ -49,12 +78,41 @@ class UploaderManager:
                     Colorizer.red(
                         f"✗ Upload failed for {file.local_path}: {e}"))
 
+    def _awaits_transcode(self, file: File) -> bool:
+        """Whether to hold a screen segment back for its smaller version"""
+        if not self.max_transcode_wait or file.original_size is not None:
+            return False
+        if not is_video_file(file.local_path):
+            return False
+        try:
+            age: float = time.time() - float(file.last_modified)
+        except (TypeError, ValueError):
+            return False
+        return age < self.max_transcode_wait
+
+    def _awaits_silence_analysis(self, file: File) -> bool:
+        """Whether to hold an audio segment back until it is analysed"""
+        if not self.max_silence_wait or file.activity_ratio is not None:
+            return False
+        if not is_audio_file(file.local_path):
+            return False
+        try:
+            age: float = time.time() - float(file.last_modified)
+        except (TypeError, ValueError):
+            return False
+        return age < self.max_silence_wait
+
     def upload_file(self, remote_path: str, local_path: str) -> None:
         """Upload a single file to the WebDAV server"""
         if self.webdav.upload_file(remote_path, local_path):
             self.file_service.update_file_status(local_path, "uploaded")
             logger.info(Colorizer.green(f"✓ Uploaded {local_path}"))
 
+    def is_uploading(self, local_path: str) -> bool:
+        """Whether a local file is being uploaded right now"""
+        upload: Dict[str, Any] = self.webdav.current_uploads.get(local_path, {})
+        return upload.get("status") in ("starting", "uploading", "streaming")
+
     def get_upload_status(self) -> List[Dict[str, Union[str, float]]]:
         """Get current upload status without checking existence"""
         return self.webdav.get_upload_status()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.core.model.entity.file import File
+from src.core.model.service.file_service import FileService
+from src.core.util.existence import check_paths
+from src.core.util.logger import logger
+
+
+@dataclass
+class VerifyProgress:
+    """Counts of an existence check so far"""
+    total: int
+    checked: int = 0
+    changed: int = 0
+    cancelled: bool = False
+
+
+class ExistenceVerifier:
+    """
+    Brings the exists_locally flags of all records up to date. Records are
+    read in pages by id, grouped by parent directory, and each directory
+    is listed once with scandir on a worker pool, so a share holding many
+    files per folder costs a few hundred listings instead of a stat per
+    file. Only records whose flag changed are written, once per page.
+    Files packed into a day archive are checked by their archive.
+    """
+
+    def __init__(self,
+                 file_service: FileService,
+                 workers: int = 8,
+                 batch_size: int = 5000) -> None:
+        """
+        Initializes the ExistenceVerifier.
+
+        Args:
+            file_service: The FileService instance.
+            workers: Number of directories listed at once.
+            batch_size: Records per page and per database transaction.
+        """
+        self.file_service: FileService = file_service
+        self.workers: int = workers
+        self.batch_size: int = batch_size
+
+    def run(self,
+            on_progress: Optional[Callable[[VerifyProgress], None]] = None,
+            cancel_event: Optional[threading.Event] = None
+            ) -> VerifyProgress:
+        """
+        Checks every record against local storage.
+
+        Args:
+            on_progress: Called after each page with the counts so far.
+            cancel_event: Stops the check between pages when set.
+
+        Returns:
+            The final counts.
+        """
+        cancel_event = cancel_event or threading.Event()
+        progress: VerifyProgress = VerifyProgress(
+            total=self.file_service.get_total_count())
+        listings: Dict[str, Optional[Set[str]]] = {}
+        last_id: int = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="verify") as executor:
+            while not cancel_event.is_set():
+                files: List[File] = self.file_service.get_files_after(
+                    last_id, self.batch_size)
+                if not files:
+                    break
+                last_id = files[-1].id
+                exists: Dict[str, bool] = check_paths(
+                    {file.archive_path or file.local_path
+                     for file in files}, listings, executor)
+
+                changes: List[Tuple[bool, str]] = []
+                for file in files:
+                    found: Optional[bool] = exists.get(file.archive_path
+                                                       or file.local_path)
+                    if found is not None and found != file.exists_locally:
+                        changes.append((found, file.local_path))
+                self.file_service.batch_update_existence(changes)
+                progress.checked += len(files)
+                progress.changed += len(changes)
+                if on_progress:
+                    on_progress(progress)
+
+        progress.cancelled = cancel_event.is_set()
+        logger.info(f"Checked {progress.checked} files in {len(listings)} "
+                    f"directories, {progress.changed} changed"
+                    f"{' (cancelled)' if progress.cancelled else ''}")
+        return progress
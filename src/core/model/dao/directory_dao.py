@@ -0,0 +1,105 @@
+import sqlite3
+from typing import List
+
+from src.core.model.entity.directory import Directory
+
+# The directory of a file record's local_path: rtrim with every character
+# but "/" strips the file name, substr drops the slash
+_DIRECTORY_OF: str = ("substr({path}, 1, length(rtrim({path}, "
+                      "replace({path}, '/', ''))) - 1)")
+_TRACKED: str = "{row}.exists_locally = 1 AND {row}.archive_path IS NULL"
+
+
+class DirectoryDAO:
+    """Data Access Object for the directory index of the recording scan"""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Initializes the DirectoryDAO with a database path.
+
+        Args:
+            db_path: The path to the SQLite database.
+        """
+        self.db_path: str = db_path
+        self._create_table()
+
+    def _create_table(self) -> None:
+        """Create the directories table if it doesn't exist"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS directories (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER,
+                    file_count INTEGER,
+                    last_scan REAL,
+                    tracked_count INTEGER DEFAULT 0
+                )
+            """
+            )
+            columns: List[str] = [
+                row[1]
+                for row in conn.execute("PRAGMA table_info(directories)")
+            ]
+            if "tracked_count" not in columns:
+                # Existing rows mismatch once and are listed again
+                conn.execute("""ALTER TABLE directories
+                    ADD COLUMN tracked_count INTEGER DEFAULT 0""")
+            self._create_triggers(conn)
+
+    @staticmethod
+    def _create_triggers(conn: sqlite3.Connection) -> None:
+        """
+        Keep tracked_count, the number of existing, unpacked file records in
+        each indexed directory, up to date on every write to the files table
+        """
+        if not conn.execute("""SELECT 1 FROM sqlite_master
+                WHERE type = 'table' AND name = 'files'""").fetchone():
+            return
+        decrement: str = f"""UPDATE directories
+            SET tracked_count = tracked_count - 1
+            WHERE {_TRACKED.format(row="OLD")}
+            AND path = {_DIRECTORY_OF.format(path="OLD.local_path")};"""
+        increment: str = f"""UPDATE directories
+            SET tracked_count = tracked_count + 1
+            WHERE {_TRACKED.format(row="NEW")}
+            AND path = {_DIRECTORY_OF.format(path="NEW.local_path")};"""
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS directories_file_insert
+            AFTER INSERT ON files BEGIN {increment} END""")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS directories_file_delete
+            AFTER DELETE ON files BEGIN {decrement} END""")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS directories_file_update
+            AFTER UPDATE OF local_path, exists_locally, archive_path ON files
+            BEGIN {decrement} {increment} END""")
+
+    def fetch_under(self, root: str) -> List[Directory]:
+        """Fetch the root directory and every directory below it"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """SELECT * FROM directories
+                WHERE path = ? OR substr(path, 1, ?) = ?""",
+                (root, len(root) + 1, f"{root}/"),
+            )
+            return [Directory.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def replace_many(self, directories: List[Directory],
+                     removed_paths: List[str]) -> None:
+        """Store scanned directories, counting their file records by a range
+        of the local_path index, and drop vanished ones in one transaction"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                f"""INSERT OR REPLACE INTO directories
+                (path, mtime_ns, file_count, last_scan, tracked_count)
+                VALUES (?, ?, ?, ?, (
+                    SELECT COUNT(*) FROM files
+                    WHERE local_path > ? AND local_path < ?
+                    AND instr(substr(local_path, ?), '/') = 0
+                    AND {_TRACKED.format(row="files")}))""",
+                # "0" follows "/", so the range holds the paths below d.path
+                [(d.path, d.mtime_ns, d.file_count, d.last_scan,
+                  f"{d.path}/", f"{d.path}0", len(d.path) + 2)
+                 for d in directories],
+            )
+            conn.executemany("DELETE FROM directories WHERE path = ?",
+                             [(path,) for path in removed_paths])
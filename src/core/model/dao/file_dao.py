@@ -1,6 +1,7 @@
 import sqlite3
+import time
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from src.core.model.entity.file import File
 
@@ -36,18 +37,63 @@ class FileDAO:
                 )
             """
             )
+            self._migrate(conn)
 
-    def insert_or_update(self, file: File) -> None:
-        """Insert or update a file record"""
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Add columns introduced after the table was first created"""
+        columns: List[str] = [
+            row[1] for row in conn.execute("PRAGMA table_info(files)")
+        ]
+        if "activity_ratio" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN activity_ratio REAL")
+        if "merged_into" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN merged_into TEXT")
+        if "original_size" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN original_size INTEGER")
+        for column in ("segment_start", "segment_end", "duration"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE files ADD COLUMN {column} REAL")
+        if "archive_path" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN archive_path TEXT")
+            conn.execute("ALTER TABLE files ADD COLUMN archive_offset INTEGER")
+        conn.execute("""CREATE INDEX IF NOT EXISTS idx_files_archive_path
+            ON files (archive_path) WHERE archive_path IS NOT NULL""")
+
+    def upsert_many(self, files: List[File]) -> None:
+        """
+        Insert or update file records in one transaction. Existing rows
+        keep their id, upload time, merge target and archive location, a
+        settled status is not reset to pending, and fields computed later
+        are only overwritten by known values.
+        """
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT OR REPLACE INTO files 
-                (local_path, remote_path, file_size, last_modified, 
-                status, last_check, exists_locally)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO files
+                (local_path, remote_path, file_size, last_modified,
+                status, last_check, exists_locally, activity_ratio,
+                original_size, segment_start, segment_end, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(local_path) DO UPDATE SET
+                    remote_path = excluded.remote_path,
+                    file_size = excluded.file_size,
+                    last_modified = excluded.last_modified,
+                    status = CASE
+                        WHEN excluded.status = 'pending' AND status IN
+                            ('uploaded', 'skipped', 'deleted', 'merged')
+                        THEN status ELSE excluded.status END,
+                    last_check = excluded.last_check,
+                    exists_locally = excluded.exists_locally,
+                    activity_ratio = COALESCE(excluded.activity_ratio,
+                                              activity_ratio),
+                    original_size = COALESCE(excluded.original_size,
+                                             original_size),
+                    segment_start = COALESCE(excluded.segment_start,
+                                             segment_start),
+                    segment_end = COALESCE(excluded.segment_end, segment_end),
+                    duration = COALESCE(excluded.duration, duration)
             """,
-                (
+                [(
                     file.local_path,
                     file.remote_path,
                     file.file_size,
@@ -55,8 +101,84 @@ class FileDAO:
                     file.status,
                     datetime.now(),
                     file.exists_locally,
+                    file.activity_ratio,
+                    file.original_size,
+                    file.segment_start,
+                    file.segment_end,
+                    file.duration,
+                ) for file in files],
+            )
+
+    def merge_files(self, parent: File, child_paths: List[str]) -> bool:
+        """
+        Record a merged file in one transaction: the children are marked
+        merged into the parent and the parent row is inserted. Nothing is
+        written unless every child is still pending.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.executemany(
+                """UPDATE files 
+                SET status = 'merged', merged_into = ?, exists_locally = 0 
+                WHERE local_path = ? AND status = 'pending'""",
+                [(parent.local_path, path) for path in child_paths],
+            )
+            if cursor.rowcount != len(child_paths):
+                conn.rollback()
+                return False
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO files 
+                (local_path, remote_path, file_size, last_modified, 
+                status, last_check, exists_locally, original_size,
+                segment_start, segment_end, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    parent.local_path,
+                    parent.remote_path,
+                    parent.file_size,
+                    parent.last_modified,
+                    parent.status,
+                    datetime.now(),
+                    parent.exists_locally,
+                    parent.original_size,
+                    parent.segment_start,
+                    parent.segment_end,
+                    parent.duration,
                 ),
             )
+            return True
+
+    def update_transcoded(self, local_path: str, file_size: int,
+                          original_size: int) -> None:
+        """Record the new size of a re-encoded file and its size before"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """UPDATE files 
+                SET file_size = ?, original_size = ? 
+                WHERE local_path = ?""",
+                (file_size, original_size, local_path),
+            )
+
+    def update_silence(self, local_path: str, activity_ratio: float,
+                       status: Optional[str]) -> bool:
+        """
+        Store the activity ratio of an audio segment and, if given, a new
+        status for it while it is still pending
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE files SET activity_ratio = ? WHERE local_path = ?",
+                (activity_ratio, local_path),
+            )
+            if status is None:
+                return True
+            cursor = conn.execute(
+                """UPDATE files SET status = ?
+                WHERE local_path = ? AND status = 'pending'""",
+                (status, local_path),
+            )
+            return cursor.rowcount > 0
 
     def fetch_by_path(self, local_path: str) -> Optional[File]:
         """Fetch a file record by local path"""
@@ -68,6 +190,24 @@ class FileDAO:
                 return File.from_dict(dict(row))  # Convert Row to dict
             return None
 
+    def fetch_by_paths(self, local_paths: List[str]) -> Dict[str, File]:
+        """Fetch the records of many local paths with one join"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                "CREATE TEMP TABLE lookup_paths (local_path TEXT PRIMARY KEY)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO lookup_paths (local_path) VALUES (?)",
+                [(path,) for path in local_paths],
+            )
+            cursor = conn.execute(
+                """SELECT files.* FROM files
+                JOIN lookup_paths USING (local_path)""")
+            return {
+                row["local_path"]: File.from_dict(dict(row))
+                for row in cursor.fetchall()
+            }
+
     def fetch_pending_files(self) -> List[File]:
         """Fetch all pending files that exist locally"""
         with sqlite3.connect(self.db_path) as conn:
@@ -108,6 +248,16 @@ class FileDAO:
             rows = cursor.fetchall()
             return [File.from_dict(dict(row)) for row in rows]  # Convert Row to dict
 
+    def fetch_after_id(self, last_id: int, limit: int) -> List[File]:
+        """Fetch the next files by id, for paging without OFFSET"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT * FROM files WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit),
+            )
+            return [File.from_dict(dict(row)) for row in cursor.fetchall()]
+
     def count_total(self) -> int:
         """Count total number of files"""
         with sqlite3.connect(self.db_path) as conn:
@@ -132,8 +282,118 @@ class FileDAO:
                 """UPDATE files 
                 SET exists_locally = ?, last_check = ? 
                 WHERE local_path = ?""",
-                updates,
+                [(exists, last_check, path)
+                 for exists, path, last_check in updates],
+            )
+
+    def fetch_in_tree(self, root: str, modified_before: float,
+                      limit: int) -> List[File]:
+        """Fetch the oldest existing files below a directory"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """SELECT * FROM files
+                WHERE substr(local_path, 1, ?) = ?
+                AND exists_locally = 1
+                AND archive_path IS NULL
+                AND status NOT IN ('merged', 'deleted')
+                AND last_modified < ?
+                ORDER BY last_modified LIMIT ?""",
+                (len(root) + 1, f"{root}/", modified_before, limit),
             )
+            return [File.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def fetch_pending_in_tree(self, root: str,
+                              modified_before: float) -> List[File]:
+        """Fetch the pending, unpacked files below a directory, by path"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """SELECT * FROM files
+                WHERE substr(local_path, 1, ?) = ?
+                AND status = 'pending'
+                AND exists_locally = 1
+                AND archive_path IS NULL
+                AND last_modified < ?
+                ORDER BY local_path""",
+                (len(root) + 1, f"{root}/", modified_before),
+            )
+            return [File.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def sum_size_in_tree(self, root: str) -> int:
+        """Sum the sizes of existing files below a directory"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """SELECT COALESCE(SUM(file_size), 0) FROM files
+                WHERE substr(local_path, 1, ?) = ? AND exists_locally = 1""",
+                (len(root) + 1, f"{root}/"),
+            )
+            total: int = cursor.fetchone()[0]
+            return total
+
+    def relocate_many(self, relocations: List[Tuple[str, str]]) -> None:
+        """Point records at the new locations of moved files in one transaction"""
+        now: datetime = datetime.now()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """UPDATE OR REPLACE files
+                SET local_path = ?, exists_locally = 1, last_check = ?
+                WHERE local_path = ?""",
+                [(new, now, old) for old, new in relocations],
+            )
+
+    def mark_missing(self, paths: List[str]) -> None:
+        """
+        Mark files, every file below directories, and the members of day
+        archives as not existing. Packed files are not affected by their
+        original paths disappearing.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """UPDATE files
+                SET exists_locally = 0, last_check = ?
+                WHERE exists_locally = 1
+                AND (archive_path = ? OR archive_path IS NULL
+                     AND (local_path = ? OR substr(local_path, 1, ?) = ?))""",
+                [(datetime.now(), path, path, len(path) + 1, f"{path}/")
+                 for path in paths],
+            )
+
+    def fetch_day_files(self, directory: str) -> List[File]:
+        """Fetch the records of the files below a day directory not packed"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """SELECT * FROM files
+                WHERE substr(local_path, 1, ?) = ?
+                AND archive_path IS NULL""",
+                (len(directory) + 1, f"{directory}/"),
+            )
+            return [File.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def set_archived(self, archive_path: str,
+                     members: List[Tuple[str, int]]) -> None:
+        """Point records into a day archive in one transaction"""
+        now: datetime = datetime.now()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """UPDATE files
+                SET archive_path = ?, archive_offset = ?, last_check = ?
+                WHERE local_path = ?""",
+                [(archive_path, offset, now, path)
+                 for path, offset in members],
+            )
+
+    def count_archive_members(self, archive_path: str) -> int:
+        """Count the members of a day archive still existing"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """SELECT COUNT(*) FROM files
+                WHERE archive_path = ? AND exists_locally = 1""",
+                (archive_path,),
+            )
+            count: int = cursor.fetchone()[0]
+            return count
 
     def delete_old_records(self, days: int) -> int:
         """Delete records older than specified days"""
@@ -148,13 +408,18 @@ class FileDAO:
 
     def fetch_old_files(self, days: int) -> List[File]:
         """Fetch files older than specified days"""
+        # Scanned files store an epoch mtime, older rows a timestamp string
+        cutoff: float = time.time() - days * 86400
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """SELECT * FROM files 
-                WHERE last_modified < datetime('now', '-' || ? || ' days')
+                WHERE CASE WHEN typeof(last_modified) IN ('integer', 'real')
+                    THEN last_modified < ?
+                    ELSE last_modified < datetime('now', '-' || ? || ' days')
+                END
                 AND exists_locally = 1""",
-                (days,),
+                (cutoff, days),
             )
             rows = cursor.fetchall()
             return [File.from_dict(dict(row)) for row in rows]  # Convert Row to dict
@@ -0,0 +1,127 @@
+import sqlite3
+from typing import List, Optional, Tuple
+
+from src.core.model.entity.media_metadata import MediaMetadata
+
+# Columns in insert order
+_COLUMNS: Tuple[str, ...] = ("local_path", "file_size", "mtime", "valid",
+                             "duration", "video_codec", "audio_codec", "width",
+                             "height", "bitrate", "start_time", "probed_at")
+
+
+class MediaMetadataDAO:
+    """Data Access Object for the media metadata catalog"""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Initializes the MediaMetadataDAO with a database path.
+
+        Args:
+            db_path: The path to the SQLite database.
+        """
+        self.db_path: str = db_path
+        self._create_table()
+
+    def _create_table(self) -> None:
+        """Create the media_metadata table if it doesn't exist"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS media_metadata (
+                    local_path TEXT PRIMARY KEY,
+                    file_size INTEGER,
+                    mtime REAL,
+                    valid BOOLEAN,
+                    duration REAL,
+                    video_codec TEXT,
+                    audio_codec TEXT,
+                    width INTEGER,
+                    height INTEGER,
+                    bitrate INTEGER,
+                    start_time REAL,
+                    probed_at REAL
+                )
+            """
+            )
+
+    def fetch_by_path(self, local_path: str) -> Optional[MediaMetadata]:
+        """Fetch the metadata of a file"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT * FROM media_metadata WHERE local_path = ?",
+                (local_path,))
+            row = cursor.fetchone()
+            if row:
+                return MediaMetadata.from_dict(dict(row))
+            return None
+
+    def upsert_many(self, entries: List[MediaMetadata]) -> None:
+        """Store probe results in one transaction"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                f"""INSERT OR REPLACE INTO media_metadata
+                ({', '.join(_COLUMNS)})
+                VALUES ({', '.join('?' for _ in _COLUMNS)})""",
+                [tuple(entry.to_dict()[column] for column in _COLUMNS)
+                 for entry in entries],
+            )
+
+    def fetch_stale(
+        self, last_id: int, limit: int
+    ) -> List[Tuple[int, str, Optional[int], Optional[float]]]:
+        """
+        Fetch the next existing, unpacked files by id whose recorded size or
+        mtime differs from their metadata, or that have none, with the size
+        and mtime of the metadata. Legacy rows with a timestamp string for
+        last_modified are compared by size only.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """SELECT files.id, files.local_path, m.file_size, m.mtime
+                FROM files
+                LEFT JOIN media_metadata AS m USING (local_path)
+                WHERE files.id > ?
+                AND files.exists_locally = 1
+                AND files.archive_path IS NULL
+                AND (m.local_path IS NULL
+                     OR m.file_size != files.file_size
+                     OR (typeof(files.last_modified) IN ('integer', 'real')
+                         AND m.mtime != files.last_modified))
+                ORDER BY files.id LIMIT ?""",
+                (last_id, limit),
+            )
+            return [(row[0], row[1], row[2], row[3])
+                    for row in cursor.fetchall()]
+
+    def sum_duration(self, since: float, until: float,
+                     video: bool) -> float:
+        """Sum the durations of valid recordings modified in a time range"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                f"""SELECT COALESCE(SUM(duration), 0) FROM media_metadata
+                WHERE valid = 1 AND mtime >= ? AND mtime < ?
+                AND video_codec IS {'NOT NULL' if video else 'NULL'}""",
+                (since, until),
+            )
+            total: float = cursor.fetchone()[0]
+            return total
+
+    def fetch_invalid(self) -> List[MediaMetadata]:
+        """Fetch the recordings ffmpeg could not read"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                """SELECT * FROM media_metadata WHERE valid = 0
+                ORDER BY mtime""")
+            return [MediaMetadata.from_dict(dict(row))
+                    for row in cursor.fetchall()]
+
+    def delete_missing(self) -> int:
+        """Drop the metadata of files no longer recorded as existing"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """DELETE FROM media_metadata WHERE local_path NOT IN (
+                    SELECT local_path FROM files WHERE exists_locally = 1)""")
+            rowcount: int = cursor.rowcount
+            return rowcount
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass
+class Directory:
+    """Directory entity recording the state of a folder at its last scan"""
+    path: str
+    mtime_ns: int  # Directory mtime, which changes when entries are added or removed
+    file_count: int  # Recordings found by the last listing
+    last_scan: float  # Epoch seconds
+    # Existing, unpacked file records in the folder, kept current by the
+    # database
+    tracked_count: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str | int | float]) -> Directory:
+        """
+        Create a Directory instance from a dictionary.
+
+        Args:
+            data: A dictionary containing directory data.
+
+        Returns:
+            A Directory instance.
+        """
+        return cls(
+            path=str(data["path"]),
+            mtime_ns=int(data["mtime_ns"]),
+            file_count=int(data["file_count"]),
+            last_scan=float(data["last_scan"]),
+            tracked_count=int(data.get("tracked_count") or 0),
+        )
+
+    def to_dict(self) -> Dict[str, str | int | float]:
+        """
+        Convert the Directory instance to a dictionary.
+
+        Returns:
+            A dictionary representation of the Directory instance.
+        """
+        return {
+            "path": self.path,
+            "mtime_ns": self.mtime_ns,
+            "file_count": self.file_count,
+            "last_scan": self.last_scan,
+            "tracked_count": self.tracked_count,
+        }
@@ -16,6 +16,14 @@ class File:
     upload_time: Optional[datetime]
     last_check: datetime
     exists_locally: bool = True
+    activity_ratio: Optional[float] = None  # Non-silent share of audio
+    merged_into: Optional[str] = None  # Hourly file this segment was merged into
+    original_size: Optional[int] = None  # Size before idle-time re-encoding
+    segment_start: Optional[float] = None  # Epoch seconds of the first frame
+    segment_end: Optional[float] = None  # Epoch seconds after the last frame
+    duration: Optional[float] = None  # Seconds, as reported by the muxer
+    archive_path: Optional[str] = None  # Day archive the file was packed into
+    archive_offset: Optional[int] = None  # Offset of its data in the archive
 
     @classmethod
     def from_dict(cls, data: Dict[str, str | int | datetime | bool]) -> File:
@@ -38,6 +46,14 @@ class File:
             upload_time=data.get("upload_time"),  # type: ignore
             last_check=data.get("last_check", datetime.now()),  # type: ignore
             exists_locally=bool(data.get("exists_locally", True)),
+            activity_ratio=data.get("activity_ratio"),  # type: ignore
+            merged_into=data.get("merged_into"),  # type: ignore
+            original_size=data.get("original_size"),  # type: ignore
+            segment_start=data.get("segment_start"),  # type: ignore
+            segment_end=data.get("segment_end"),  # type: ignore
+            duration=data.get("duration"),  # type: ignore
+            archive_path=data.get("archive_path"),  # type: ignore
+            archive_offset=data.get("archive_offset"),  # type: ignore
         )
 
     def to_dict(self) -> Dict[str, Optional[int] | str | int | datetime | bool]:
@@ -57,4 +73,12 @@ class File:
             "upload_time": self.upload_time,
             "last_check": self.last_check,
             "exists_locally": self.exists_locally,
+            "activity_ratio": self.activity_ratio,
+            "merged_into": self.merged_into,
+            "original_size": self.original_size,
+            "segment_start": self.segment_start,
+            "segment_end": self.segment_end,
+            "duration": self.duration,
+            "archive_path": self.archive_path,
+            "archive_offset": self.archive_offset,
         }
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class MediaMetadata:
+    """Media metadata entity caching what ffmpeg read from a recording"""
+    local_path: str
+    file_size: int  # Size when probed; a different size means re-probe
+    mtime: float  # Modification time when probed, epoch seconds
+    valid: bool  # False when ffmpeg could not demux the file
+    duration: Optional[float] = None  # Seconds
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bitrate: Optional[int] = None  # Overall bitrate, in kb/s
+    start_time: Optional[float] = None  # Container start, in seconds
+    probed_at: Optional[float] = None  # Epoch seconds
+
+    @classmethod
+    def from_dict(
+            cls, data: Dict[str, Optional[str | int | float]]) -> MediaMetadata:
+        """
+        Create a MediaMetadata instance from a dictionary.
+
+        Args:
+            data: A dictionary containing media metadata.
+
+        Returns:
+            A MediaMetadata instance.
+        """
+        return cls(
+            local_path=str(data["local_path"]),
+            file_size=int(data["file_size"]),  # type: ignore
+            mtime=float(data["mtime"]),  # type: ignore
+            valid=bool(data["valid"]),
+            duration=data.get("duration"),  # type: ignore
+            video_codec=data.get("video_codec"),  # type: ignore
+            audio_codec=data.get("audio_codec"),  # type: ignore
+            width=data.get("width"),  # type: ignore
+            height=data.get("height"),  # type: ignore
+            bitrate=data.get("bitrate"),  # type: ignore
+            start_time=data.get("start_time"),  # type: ignore
+            probed_at=data.get("probed_at"),  # type: ignore
+        )
+
+    def to_dict(self) -> Dict[str, Optional[str | int | float]]:
+        """
+        Convert the MediaMetadata instance to a dictionary.
+
+        Returns:
+            A dictionary representation of the MediaMetadata instance.
+        """
+        return {
+            "local_path": self.local_path,
+            "file_size": self.file_size,
+            "mtime": self.mtime,
+            "valid": self.valid,
+            "duration": self.duration,
+            "video_codec": self.video_codec,
+            "audio_codec": self.audio_codec,
+            "width": self.width,
+            "height": self.height,
+            "bitrate": self.bitrate,
+            "start_time": self.start_time,
+            "probed_at": self.probed_at,
+        }
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import List
+
+from src.core.model.dao.directory_dao import DirectoryDAO
+from src.core.model.entity.directory import Directory
+
+
+class DirectoryService:
+    """Service layer for the directory index of the recording scan"""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Initializes the DirectoryService with a database path.
+
+        Args:
+            db_path: The path to the SQLite database.
+        """
+        self.directory_dao: DirectoryDAO = DirectoryDAO(db_path)
+
+    def get_directories(self, root: str) -> List[Directory]:
+        """
+        Get the indexed state of a directory tree.
+
+        Args:
+            root: The top directory, with forward slashes.
+
+        Returns:
+            The root and every indexed directory below it.
+        """
+        return self.directory_dao.fetch_under(root)
+
+    def update_directories(self, directories: List[Directory],
+                           removed_paths: List[str]) -> None:
+        """
+        Record the result of a scan.
+
+        Args:
+            directories: Directories that were listed.
+            removed_paths: Indexed directories that no longer exist.
+        """
+        self.directory_dao.replace_many(directories, removed_paths)
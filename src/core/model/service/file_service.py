@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Tuple
 import os
 from src.core.model.dao.file_dao import FileDAO
 from src.core.model.entity.file import File
+from src.core.util.existence import check_paths
 
 
 class FileService:
@@ -26,8 +27,64 @@ class FileService:
         Args:
             file_info: A dictionary containing file information.
         """
-        file: File = File.from_dict(file_info)
-        self.file_dao.insert_or_update(file)
+        self.file_dao.upsert_many([File.from_dict(file_info)])
+
+    def register_files(self, files_info: List[Dict[str, str | int | datetime
+                                                   | bool]]) -> None:
+        """
+        Register or update many files in one transaction.
+
+        Args:
+            files_info: Dictionaries containing file information.
+        """
+        if files_info:
+            self.file_dao.upsert_many(
+                [File.from_dict(file_info) for file_info in files_info])
+
+    def record_merge(self, parent_info: Dict[str, str | int | datetime | bool],
+                     child_paths: List[str]) -> bool:
+        """
+        Atomically register a merged file and mark its segments as merged.
+
+        Args:
+            parent_info: A dictionary containing the merged file's information.
+            child_paths: The local paths of the merged segments.
+
+        Returns:
+            True if recorded, False if a segment was no longer pending.
+        """
+        return self.file_dao.merge_files(File.from_dict(parent_info), child_paths)
+
+    def record_transcode(self, local_path: str, file_size: int,
+                         original_size: int) -> None:
+        """
+        Record that a file was re-encoded in place. Its modification time
+        is kept, so its age is still counted from when it was recorded.
+
+        Args:
+            local_path: The local path of the file.
+            file_size: The size after re-encoding.
+            original_size: The size before re-encoding.
+        """
+        self.file_dao.update_transcoded(local_path, file_size, original_size)
+
+    def record_silence(self, local_path: str, activity_ratio: float,
+                       status: Optional[str] = None) -> bool:
+        """
+        Record the result of silence detection for an audio segment.
+
+        Args:
+            local_path: The local path of the segment.
+            activity_ratio: The non-silent share of the segment.
+            status: A status to set if the segment is still pending, such as
+                "skipped" for a silent one.
+
+        Returns:
+            True unless a status was given and the segment was no longer
+            pending.
+        """
+        return self.file_dao.update_silence(local_path, activity_ratio,
+                                            status)
 
     def get_file(self, local_path: str) -> Optional[File]:
         """
@@ -41,6 +98,20 @@ class FileService:
         """
         return self.file_dao.fetch_by_path(local_path)
 
+    def get_files(self, local_paths: List[str]) -> Dict[str, File]:
+        """
+        Get the records of many files at once.
+
+        Args:
+            local_paths: The local paths of the files.
+
+        Returns:
+            The File objects found, by local path.
+        """
+        if not local_paths:
+            return {}
+        return self.file_dao.fetch_by_paths(local_paths)
+
     def get_pending_files(self) -> List[File]:
         """
         Get all pending files from the database.
@@ -79,6 +150,19 @@ class FileService:
         """
         return self.file_dao.fetch_paginated(page, page_size, query)
 
+    def get_files_after(self, last_id: int, limit: int) -> List[File]:
+        """
+        Get the next files in id order, starting after a given id.
+
+        Args:
+            last_id: The id of the last file of the previous page, or 0.
+            limit: The number of files.
+
+        Returns:
+            A list of File objects, by increasing id.
+        """
+        return self.file_dao.fetch_after_id(last_id, limit)
+
     def get_total_count(self) -> int:
         """
         Get the total number of files in the database.
@@ -91,6 +175,7 @@ class FileService:
     def check_file_exists(self, local_path: str) -> bool:
         """
         Check if a file exists locally (without updating the database).
+        A file packed into a day archive exists while its archive does.
 
         Args:
             local_path: The local path of the file.
@@ -98,7 +183,11 @@ class FileService:
         Returns:
             True if the file exists, False otherwise.
         """
-        return os.path.exists(local_path)
+        if os.path.exists(local_path):
+            return True
+        file: Optional[File] = self.file_dao.fetch_by_path(local_path)
+        return bool(file and file.archive_path
+                    and os.path.exists(file.archive_path))
 
     def update_file_existence(self, local_path: str, exists: bool) -> None:
         """
@@ -110,6 +199,101 @@ class FileService:
         """
         self.file_dao.update_existence(local_path, exists)
 
+    def get_files_in_tree(self, root: str, modified_before: float,
+                          limit: int) -> List[File]:
+        """
+        Get the oldest existing files below a directory.
+
+        Args:
+            root: The directory, with forward slashes.
+            modified_before: Only files last modified before this epoch time.
+            limit: Maximum number of files.
+
+        Returns:
+            File objects, oldest first.
+        """
+        return self.file_dao.fetch_in_tree(root, modified_before, limit)
+
+    def get_pending_in_tree(self, root: str,
+                            modified_before: float) -> List[File]:
+        """
+        Get the pending files below a directory.
+
+        Args:
+            root: The directory, with forward slashes.
+            modified_before: Only files last modified before this epoch time.
+
+        Returns:
+            File objects, in path order.
+        """
+        return self.file_dao.fetch_pending_in_tree(root, modified_before)
+
+    def get_tree_size(self, root: str) -> int:
+        """
+        Get the total size of the existing files below a directory.
+
+        Args:
+            root: The directory, with forward slashes.
+
+        Returns:
+            The size in bytes.
+        """
+        return self.file_dao.sum_size_in_tree(root)
+
+    def relocate_files(self, relocations: List[Tuple[str, str]]) -> None:
+        """
+        Record that files were moved to another local location.
+
+        Args:
+            relocations: (old local path, new local path) pairs.
+        """
+        self.file_dao.relocate_many(relocations)
+
+    def mark_missing(self, paths: List[str]) -> None:
+        """
+        Mark deleted files, every file below deleted directories, or every
+        file in deleted day archives, as no longer existing locally.
+
+        Args:
+            paths: Local paths of deleted files, directories or archives.
+        """
+        self.file_dao.mark_missing(paths)
+
+    def get_day_files(self, directory: str) -> List[File]:
+        """
+        Get the records of the files below a day directory not packed yet.
+
+        Args:
+            directory: The directory, with forward slashes.
+
+        Returns:
+            A list of File objects.
+        """
+        return self.file_dao.fetch_day_files(directory)
+
+    def record_archive(self, archive_path: str,
+                       members: List[Tuple[str, int]]) -> None:
+        """
+        Record that files were packed into a day archive.
+
+        Args:
+            archive_path: The archive, with forward slashes.
+            members: (local path, offset of the data in the archive) pairs.
+        """
+        self.file_dao.set_archived(archive_path, members)
+
+    def count_archive_members(self, archive_path: str) -> int:
+        """
+        Count the files of a day archive that still exist locally.
+
+        Args:
+            archive_path: The archive, with forward slashes.
+
+        Returns:
+            The number of existing members.
+        """
+        return self.file_dao.count_archive_members(archive_path)
+
     def batch_update_existence(self, file_paths: List[Tuple[bool, str]]) -> None:
         """
         Batch update the existence status of multiple files.
@@ -149,15 +333,20 @@ class FileService:
 
     def check_and_update_existence(self, files: List[File]) -> None:
         """
-        Check and update the existence status for multiple files.
+        Check and update the existence status for multiple files, listing
+        each directory once.
 
         Args:
             files: A list of File objects.
         """
-        updates: List[Tuple[bool, str]] = []
-        for file in files:
-            exists: bool = os.path.exists(file.local_path)
-            updates.append((exists, file.local_path))
+        exists: Dict[str, bool] = check_paths(
+            {file.archive_path or file.local_path
+             for file in files})
+        updates: List[Tuple[bool, str]] = [
+            (exists[file.archive_path or file.local_path], file.local_path)
+            for file in files
+            if (file.archive_path or file.local_path) in exists
+        ]
         self.batch_update_existence(updates)
 
     def update_files(self, file_paths: List[Tuple[bool, str]]) -> None:
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from src.core.model.dao.media_metadata_dao import MediaMetadataDAO
+from src.core.model.entity.media_metadata import MediaMetadata
+
+
+class MediaMetadataService:
+    """Service layer for the media metadata catalog"""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Initializes the MediaMetadataService with a database path.
+
+        Args:
+            db_path: The path to the SQLite database.
+        """
+        self.media_metadata_dao: MediaMetadataDAO = MediaMetadataDAO(db_path)
+
+    def get_metadata(self, local_path: str) -> Optional[MediaMetadata]:
+        """
+        Get the cached metadata of a file.
+
+        Args:
+            local_path: The local path of the file.
+
+        Returns:
+            The MediaMetadata if the file was probed, None otherwise.
+        """
+        return self.media_metadata_dao.fetch_by_path(local_path)
+
+    def save_metadata(self, entries: List[MediaMetadata]) -> None:
+        """
+        Store probe results, replacing earlier ones for the same paths.
+
+        Args:
+            entries: The probe results.
+        """
+        if entries:
+            self.media_metadata_dao.upsert_many(entries)
+
+    def get_stale_files(
+        self, last_id: int, limit: int
+    ) -> List[Tuple[int, str, Optional[int], Optional[float]]]:
+        """
+        Get the next files whose metadata is missing or out of date.
+
+        Args:
+            last_id: The id of the last file of the previous page, or 0.
+            limit: The number of files.
+
+        Returns:
+            (file id, local path, cached size, cached mtime) tuples, by
+            increasing id; the cached values are None for files without
+            metadata.
+        """
+        return self.media_metadata_dao.fetch_stale(last_id, limit)
+
+    def get_recorded_hours(self, since: float, until: float,
+                           video: bool = True) -> float:
+        """
+        Get the hours recorded in a time range.
+
+        Args:
+            since: Start of the range, epoch seconds.
+            until: End of the range, epoch seconds.
+            video: Count screen recordings if True, audio-only ones if False.
+
+        Returns:
+            The total duration of the valid recordings, in hours.
+        """
+        return self.media_metadata_dao.sum_duration(since, until,
+                                                    video) / 3600
+
+    def get_invalid_files(self) -> List[MediaMetadata]:
+        """
+        Get the recordings that could not be read.
+
+        Returns:
+            A list of MediaMetadata, oldest first.
+        """
+        return self.media_metadata_dao.fetch_invalid()
+
+    def remove_missing(self) -> int:
+        """
+        Drop the metadata of files that no longer exist locally.
+
+        Returns:
+            The number of entries removed.
+        """
+        return self.media_metadata_dao.delete_missing()
@@ -4,8 +4,10 @@ import os
 import time
 from typing import Any, Dict, List, Optional
 
-import imageio_ffmpeg
 from src.core.recorder.base_recoder import BaseRecorder
+from src.core.recorder.formats import AUDIO_CODECS, OPUS_SAMPLE_RATES
+from src.core.util.ffmpeg_capabilities import get_capabilities
+from src.core.util.logger import logger
 
 
 class AudioRecorder(BaseRecorder):
@@ -19,33 +21,105 @@ class AudioRecorder(BaseRecorder):
             config: Configuration dictionary.
         """
         super().__init__(config)
-        audio_config: Dict[str, Any] = config.get("audio", {})
-        self.sample_rate: int = audio_config.get("sample_rate", 44100)
-        self.channels: int = audio_config.get("channels", 1)
+        self.audio_config: Dict[str, Any] = config.get("audio", {})
+        self.sample_rate: int = self.audio_config.get("sample_rate", 44100)
+        self.channels: int = self.audio_config.get("channels", 1)
 
-    def _build_command(self, device: str, folder: str) -> List[str]:
+    def get_device_settings(self, device: str) -> Dict[str, Any]:
         """
-        Builds the FFmpeg command for audio recording.
+        Gets the audio settings of a device: the global audio section with
+        the entry for the device under "devices" applied on top.
 
         Args:
             device: The audio input device name.
-            folder:  (Unused)
 
         Returns:
-            The FFmpeg command as a list of strings.
+            The merged settings.
         """
-        segment_duration: Optional[int] = self.validate_segment_duration()
-        clean_name: str = self._device_name_to_path(device)
+        settings: Dict[str, Any] = {
+            key: value
+            for key, value in self.audio_config.items() if key != "devices"
+        }
+        settings.update(self.audio_config.get("devices", {}).get(device, {}))
+        return settings
 
-        device_name: str = self.config.get("device_name", "default")
-        date_str: str = time.strftime("%Y%m%d")
-        tmp_path: str = os.path.join(".tmp", device_name, date_str, "audio", clean_name)
-        os.makedirs(tmp_path, exist_ok=True)
+    def _select_codec(self, settings: Dict[str, Any]) -> str:
+        """
+        Picks the configured codec, falling back to mp3 when it is unknown
+        or the bundled ffmpeg lacks its encoder.
 
-        output_template: str = self._get_ouput_template(tmp_path)
+        Args:
+            settings: The device settings.
+
+        Returns:
+            A key of AUDIO_CODECS.
+        """
+        codec: str = settings.get("codec", "mp3")
+        if codec not in AUDIO_CODECS:
+            logger.warning(f"Unknown audio codec {codec}, using mp3")
+            return "mp3"
+        capabilities = get_capabilities()
+        encoder: str = AUDIO_CODECS[codec][1]
+        if capabilities.encoders and not capabilities.has_encoder(encoder):
+            logger.warning(f"Encoder {encoder} is not available, using mp3")
+            return "mp3"
+        return codec
 
-        cmd: List[str] = [
-            imageio_ffmpeg.get_ffmpeg_exe(),
+    def _build_codec_args(self, codec: str,
+                          settings: Dict[str, Any]) -> List[str]:
+        """
+        Builds the encoder arguments for a codec.
+
+        Args:
+            codec: A key of AUDIO_CODECS.
+            settings: The device settings; "bitrate" such as "24k", and "vbr"
+                      which is on/off/constrained for Opus and a -q:a quality
+                      for mp3 and aac.
+
+        Returns:
+            The FFmpeg arguments as a list of strings.
+        """
+        encoder: str = AUDIO_CODECS[codec][1]
+        bitrate: Optional[str] = settings.get("bitrate")
+        vbr: Any = settings.get("vbr")
+        args: List[str] = ["-c:a", encoder]
+        if encoder == "libopus":
+            if isinstance(vbr, bool):
+                vbr = "on" if vbr else "off"
+            args += ["-b:a", str(bitrate or "24k"), "-vbr", str(vbr or "on")]
+            if settings.get("application"):
+                args += ["-application", settings["application"]]
+        elif encoder == "flac":
+            args += [
+                "-compression_level",
+                str(settings.get("compression_level", 5))
+            ]
+        elif vbr is not None and not isinstance(vbr, bool):
+            args += ["-q:a", str(vbr)]
+        elif bitrate:
+            args += ["-b:a", str(bitrate)]
+        return args
+
+    def _build_input_args(self, device: str) -> List[str]:
+        """
+        Builds the capture and encoding arguments for audio recording,
+        using the codec configured for the device.
+
+        Args:
+            device: The audio input device name.
+
+        Returns:
+            The FFmpeg arguments as a list of strings.
+        """
+        settings: Dict[str, Any] = self.get_device_settings(device)
+        codec: str = self._select_codec(settings)
+        sample_rate: int = settings.get("sample_rate", self.sample_rate)
+        if AUDIO_CODECS[codec][1] == "libopus" and (sample_rate
+                                                    not in OPUS_SAMPLE_RATES):
+            sample_rate = next(
+                (rate for rate in OPUS_SAMPLE_RATES if rate >= sample_rate),
+                OPUS_SAMPLE_RATES[-1])
+        return [
             "-loglevel",
             "info",
             "-y",
@@ -54,26 +128,57 @@ class AudioRecorder(BaseRecorder):
             "-i",
             f"audio={device}",
             "-ac",
-            str(self.channels),
+            str(settings.get("channels", self.channels)),
             "-ar",
-            str(self.sample_rate),
+            str(sample_rate),
+            *self._build_codec_args(codec, settings),
         ]
 
+    def _build_output_args(self, device: str, folder: str) -> List[str]:
+        """
+        Builds the output arguments for audio recording.
+
+        Args:
+            device: The audio input device name.
+            folder:  (Unused)
+
+        Returns:
+            The FFmpeg arguments as a list of strings.
+        """
+        segment_duration: Optional[int] = self.validate_segment_duration()
+        clean_name: str = self._device_name_to_path(device)
+
+        device_name: str = self.config.get("device_name", "default")
+        # Dated by the mover from each segment's name, see ScreenRecorder
+        tmp_path: str = os.path.join(self.staging.current(), device_name,
+                                     "audio", clean_name)
+        os.makedirs(tmp_path, exist_ok=True)
+        self.output_dir = tmp_path
+
+        output_template: str = self._get_ouput_template(tmp_path)
+        self.segment_list_path = None
+        extension, _, muxer = AUDIO_CODECS[self._select_codec(
+            self.get_device_settings(device))]
+
         if segment_duration:
-            cmd += [
+            return [
                 "-f",
                 "segment",
                 "-segment_time",
                 str(segment_duration),
+                "-segment_format",
+                muxer,
+                *self._segment_list_args(tmp_path),
                 "-strftime",
                 "1",
-                f"{output_template}.mp3",
+                f"{output_template}{extension}",
             ]
-        else:
-            cmd.append(os.path.join(tmp_path, f"{int(time.time())}.mp3"))
+        return [
+            "-f", muxer,
+            os.path.join(tmp_path,
+                         time.strftime("%Y%m%d_%H%M%S") + extension)
+        ]
 
-        return cmd
-    
     def get_recorder_type(self) -> str:
         """
         Returns the recorder type.
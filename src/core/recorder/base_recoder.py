@@ -5,14 +5,21 @@ from src.core.util.logger import logger
 import os
 import re
 import subprocess
-import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from abc import ABC, abstractmethod
 import win32process
 import win32con
 
+from src.core.recorder.formats import is_recording_file
+from src.core.recorder.pipe_mux import RateLimitedLineLogger, get_pipe_multiplexer
+from src.core.recorder.progress import PROGRESS_ARGS, ProgressTracker
+from src.core.recorder.segment_list import SEGMENT_LIST_TYPE
+from src.core.util.ffmpeg import get_ffmpeg_exe
+from src.core.util.priority import apply_process_settings
+from src.core.util.staging import StagingArea, get_staging_area
+
 
 class BaseRecorder(ABC):
     """Base class for all recorders"""
@@ -35,22 +42,61 @@ class BaseRecorder(ABC):
         # Storage configuration
         storage_config: Dict[str, Any] = self.config.get("storage", {})
         self.local_path: str = storage_config.get("local_path", "./")
+        # Where active segments are written before they are moved
+        self.staging: StagingArea = get_staging_area(config)
+
+        # Scheduling priority, CPU affinity and I/O priority of the process
+        self.process_settings: Dict[str, Any] = self.config.get(
+            self.get_recorder_type(), {}).get("process", {})
+        self.applied_settings: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
 
         # Log configuration
         self.log: Dict[str, Any] = self.config.get("log", {})
         self.log_ffmpeg: bool = self.log.get("ffmpeg", False)
 
+        # Encoder progress reported through ffmpeg's -progress channel
+        progress_config: Dict[str, Any] = self.config.get("progress", {})
+        self._command_templates: Dict[str, List[str]] = {}
+        # Directory the current process writes into, set by _build_output_args
+        self.output_dir: Optional[str] = None
+        # CSV list ffmpeg appends each closed segment to, if segmenting
+        self.segment_list_path: Optional[str] = None
+        self._start_listeners: List[Callable[[BaseRecorder, subprocess.Popen],
+                                             None]] = []
+        self.progress: ProgressTracker = ProgressTracker(
+            name=self.get_recorder_type(),
+            history_size=progress_config.get("history_size", 120),
+            slow_speed=progress_config.get("slow_speed", 1.0),
+            slow_samples=progress_config.get("slow_samples", 10),
+        )
+
     @abstractmethod
-    def _build_command(self, device: str, output_path: str) -> List[str]:
+    def _build_input_args(self, device: str) -> List[str]:
+        """
+        Abstract method to build the input and encoding arguments, which do
+        not change between starts. Must be implemented by subclasses.
+
+        Args:
+            device: The device to record from.
+
+        Returns:
+            The arguments as a list of strings, without the executable.
+        """
+        pass
+
+    @abstractmethod
+    def _build_output_args(self, device: str, output_path: str) -> List[str]:
         """
-        Abstract method to build the recording command.  Must be implemented by subclasses.
+        Abstract method to build the output arguments for one start.
+        Must be implemented by subclasses.
 
         Args:
             device: The device to record from.
             output_path: The output path.
 
         Returns:
-            The command as a list of strings.
+            The arguments as a list of strings.
         """
         pass
 
@@ -64,16 +110,72 @@ class BaseRecorder(ABC):
         """
         pass
 
+    def add_start_listener(
+            self, listener: Callable[[BaseRecorder, subprocess.Popen],
+                                     None]) -> None:
+        """
+        Registers a callback invoked each time a recording process starts.
+
+        Args:
+            listener: Called with this recorder and the new process.
+        """
+        self._start_listeners.append(listener)
+
+    def is_streamable(self) -> bool:
+        """
+        Whether the output can be read while it is being written.
+
+        Returns:
+            False unless a subclass writes a streamable container.
+        """
+        return False
+
+    def prepare(self, device: str = "") -> List[str]:
+        """
+        Builds and caches the command template for a device, so that later
+        starts only append the output arguments.
+
+        Args:
+            device: The device to record from.
+
+        Returns:
+            The command template.
+        """
+        template: List[str] = [
+            get_ffmpeg_exe(),
+            *PROGRESS_ARGS,
+            *self._build_input_args(device),
+        ]
+        self._command_templates[device] = template
+        return template
+
+    def _build_command(self, device: str, output_path: str) -> List[str]:
+        """
+        Builds the recording command from the cached template.
+
+        Args:
+            device: The device to record from.
+            output_path: The output path.
+
+        Returns:
+            The command as a list of strings.
+        """
+        template: Optional[List[str]] = self._command_templates.get(device)
+        if template is None:
+            template = self.prepare(device)
+        return [*template, *self._build_output_args(device, output_path)]
+
     def _get_process_pipes(self) -> Tuple[Any, Any]:
         """
         Gets the appropriate pipes for the subprocess based on logging configuration.
+        stdout always carries the -progress channel.
 
         Returns:
             A tuple of (stdout, stderr) pipes.
         """
         if self.log_ffmpeg:
             return subprocess.PIPE, subprocess.PIPE
-        return subprocess.DEVNULL, subprocess.DEVNULL
+        return subprocess.PIPE, subprocess.DEVNULL
 
     def start_recording(self,
                         device: str = "",
@@ -101,25 +203,69 @@ class BaseRecorder(ABC):
             creation_flags: int = (win32process.CREATE_NO_WINDOW
                                    | win32con.DETACHED_PROCESS)
 
+            # stdin stays open so the process can be asked to quit cleanly
             self.process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE,
                 stdout=stdout,
                 stderr=stderr,
                 startupinfo=startupinfo,
                 creationflags=creation_flags,
             )
 
+            self.started_at = time.time()
+            self.applied_settings = apply_process_settings(
+                self.process.pid, self.process_settings)
+            self.progress.reset()
+            self.progress.name = f"{type}:{device}" if device else type
+            self._start_monitoring_progress(self.process)
             if self.log_ffmpeg:
                 self._start_monitoring_ffmpeg_log(
                     self.process,
                     type,
                     type.capitalize(),
                 )
+            for listener in self._start_listeners:
+                listener(self, self.process)
             return self.process
         except Exception as e:
             raise logger.exception(
                 f"{type} recording failed ({device}): {str(e)}")
 
+    def stop_recording(self, timeout: float = 5.0) -> None:
+        """
+        Stops the recording process gracefully. FFmpeg is sent a quit
+        command so it can finalize the current segment, and is only
+        terminated, then killed, if it does not exit within the timeout.
+
+        Args:
+            timeout: Seconds to wait for each shutdown step.
+        """
+        process: Optional[subprocess.Popen] = self.process
+        if not process or process.poll() is not None:
+            return
+
+        logger.debug("try to stop process: %s", process.pid)
+        try:
+            process.stdin.write(b"q")  # type: ignore
+            process.stdin.flush()  # type: ignore
+            process.stdin.close()  # type: ignore
+        except (OSError, ValueError) as e:
+            logger.debug(f"Failed to send quit to {process.pid}: {e}")
+
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(
+                f"FFmpeg {process.pid} did not quit in {timeout}s, terminating")
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        logger.debug("stopped process: %s", process.pid)
+
     def validate_segment_duration(self) -> Optional[int]:
         """
         Validates the segment duration and adjusts it if necessary.
@@ -144,44 +290,36 @@ class BaseRecorder(ABC):
         return None
 
     def _start_monitoring_ffmpeg_log(self, process: subprocess.Popen,
-                                     device_name: str,
-                                     type: str) -> Optional[threading.Thread]:
+                                     device_name: str, type: str) -> None:
         """
-        Starts a thread to monitor FFmpeg process output.
+        Forwards FFmpeg stderr to the logger through the shared pipe
+        multiplexer, rate-limited so a chatty encoder cannot flood the log.
 
         Args:
             process: The FFmpeg subprocess.
             device_name: The name of the device being recorded.
             type: The type of recorder (e.g., "audio", "video").
+        """
+        line_logger: RateLimitedLineLogger = RateLimitedLineLogger(
+            f"FFmpeg {type} output [{device_name}]",
+            self.log.get("ffmpeg_max_lines_per_second", 20),
+        )
+        get_pipe_multiplexer().register(process.stderr, line_logger.feed,
+                                        line_logger.flush)  # type: ignore
+
+    def _start_monitoring_progress(self, process: subprocess.Popen) -> None:
+        """
+        Feeds the -progress channel into the tracker through the shared
+        pipe multiplexer.
 
-        Returns:
-            The monitoring thread.
-        """
-
-        def _monitor_ffmpeg_output() -> None:
-            while process.poll() is None:
-                try:
-                    line: str = process.stderr.readline().decode(
-                        "utf-8")  # type: ignore
-                    if line:
-                        logger.debug(
-                            f"FFmpeg {type} output [{device_name}]: {line.strip()}"
-                        )
-                except Exception as e:
-                    logger.debug(f"Error reading {type} output: {e}")
-                time.sleep(0.1)
-
-            remaining_output: str = process.stderr.read().decode(
-                "utf-8")  # type: ignore
-            if remaining_output:
-                logger.debug(
-                    f"Remaining {type} output [{device_name}]: {remaining_output.strip()}"
-                )
-
-        thread: threading.Thread = threading.Thread(
-            target=_monitor_ffmpeg_output, daemon=True)
-        thread.start()
-        return thread
+        Args:
+            process: The FFmpeg subprocess.
+        """
+        get_pipe_multiplexer().register(
+            process.stdout,  # type: ignore
+            lambda data: self.progress.feed(
+                data.decode("utf-8", errors="replace")),
+        )
 
     def _device_name_to_path(self, name: str) -> str:
         """
@@ -195,6 +333,26 @@ class BaseRecorder(ABC):
         """
         return re.sub(r'[\\/*?:"<>|]', "", name).strip()
 
+    def _segment_list_args(self, tmp_path: str) -> List[str]:
+        """
+        Builds the arguments that make the segment muxer list each segment
+        as it closes, in a file unique to this start.
+
+        Args:
+            tmp_path: The directory the segments are written to.
+
+        Returns:
+            The FFmpeg arguments as a list of strings.
+        """
+        self.segment_list_path = os.path.join(
+            tmp_path, f".segments_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        return [
+            "-segment_list",
+            self.segment_list_path,
+            "-segment_list_type",
+            SEGMENT_LIST_TYPE,
+        ]
+
     def _get_ouput_template(self, prefix: str = "") -> str:
         """
         Generates the output filename template.
@@ -218,13 +376,13 @@ class BaseRecorder(ABC):
             The absolute output path.
         """
         for arg in reversed(cmd_args):
-            if arg.endswith((".mp4", ".mp3")):
+            if is_recording_file(arg):
                 return os.path.abspath(arg)
         return "Unknown path"
 
     def _get_process_runtime(self, process: subprocess.Popen) -> str:
         """
-        Calculates the process runtime.
+        Calculates the process runtime from the start time recorded at spawn.
 
         Args:
             process: The subprocess.
@@ -232,14 +390,10 @@ class BaseRecorder(ABC):
         Returns:
             The process runtime as a string (HH:MM:SS) or "Unknown time".
         """
-        try:
-            import psutil  # type: ignore
-
-            create_time: float = psutil.Process(process.pid).create_time()
-            return time.strftime("%H:%M:%S",
-                                 time.gmtime(time.time() - create_time))
-        except ImportError:
+        if process is not self.process or self.started_at is None:
             return "Unknown time"
+        return time.strftime("%H:%M:%S",
+                             time.gmtime(time.time() - self.started_at))
 
     def get_local_path(self) -> str:
         """
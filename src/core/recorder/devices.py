@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+from src.core.util.ffmpeg import run_ffmpeg
+from src.core.util.logger import logger
+
+
+def parse_dshow_audio_devices(stderr: str) -> List[str]:
+    """
+    Parses the output of ``ffmpeg -list_devices true -f dshow -i dummy``.
+
+    Handles both the legacy layout with a "DirectShow audio devices" section
+    header and the newer one that tags each device with "(audio)".
+
+    Args:
+        stderr: The ffmpeg stderr text.
+
+    Returns:
+        The audio device names, in the order ffmpeg listed them.
+    """
+    devices: List[str] = []
+    in_section: bool = False
+    for line in stderr.splitlines():
+        if "DirectShow audio devices" in line:
+            in_section = True
+            continue
+        if "DirectShow video devices" in line:
+            in_section = False
+            continue
+        if '"' not in line:
+            continue
+        tagged_audio: bool = line.rstrip().endswith("(audio)")
+        if not (in_section or tagged_audio):
+            continue
+        device: str = line[line.find('"') + 1:line.rfind('"')]
+        if device and not device.startswith(("@device_", "dummy:")):
+            if device not in devices:
+                devices.append(device)
+    return devices
+
+
+def enumerate_dshow_audio_devices() -> List[str]:
+    """
+    Lists DirectShow audio devices by running ffmpeg.
+
+    Returns:
+        The audio device names.
+    """
+    result = run_ffmpeg(
+        ["-hide_banner", "-list_devices", "true", "-f", "dshow", "-i", "dummy"],
+        timeout=30,
+    )
+    return parse_dshow_audio_devices(result.stderr)
+
+
+class AudioDeviceRegistry:
+    """
+    Caches the audio device list so recordings can start without waiting for
+    an ffmpeg enumeration. The cache is refreshed in the background when it
+    is older than the TTL or when the platform reports a device change.
+    """
+
+    def __init__(self,
+                 ttl: float = 300,
+                 enumerate_devices: Callable[[], List[str]] = (
+                     enumerate_dshow_audio_devices),
+                 debounce: float = 1.0) -> None:
+        """
+        Initializes the AudioDeviceRegistry.
+
+        Args:
+            ttl: Seconds after which the cached list is refreshed.
+            enumerate_devices: Function that lists the devices.
+            debounce: Delay used to coalesce bursts of change notifications.
+        """
+        self.ttl: float = ttl
+        self.debounce: float = debounce
+        self._enumerate: Callable[[], List[str]] = enumerate_devices
+        self._devices: Optional[List[str]] = None
+        self._updated_at: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+        self._refreshing: bool = False
+        self._ready: threading.Event = threading.Event()
+        self._monitor_thread: Optional[threading.Thread] = None
+
+    def get_devices(self) -> List[str]:
+        """
+        Gets the cached device list, triggering a background refresh when it
+        is stale. Only the very first call waits for an enumeration.
+
+        Returns:
+            The audio device names.
+        """
+        if self._devices is None:
+            self.refresh_async()
+            self._ready.wait()
+        elif time.monotonic() - self._updated_at > self.ttl:
+            self.refresh_async()
+        return list(self._devices or [])
+
+    def refresh(self) -> List[str]:
+        """
+        Enumerates the devices now and updates the cache.
+
+        Returns:
+            The audio device names.
+        """
+        try:
+            devices: List[str] = self._enumerate()
+        except Exception as e:
+            logger.error(f"Failed to get audio devices: {e}")
+            devices = list(self._devices or [])
+
+        with self._lock:
+            if devices != self._devices:
+                logger.info(f"Audio devices: {devices}")
+            self._devices = devices
+            self._updated_at = time.monotonic()
+        self._ready.set()
+        return devices
+
+    def refresh_async(self, delay: float = 0.0) -> None:
+        """
+        Refreshes the cache on a background thread unless one is running.
+
+        Args:
+            delay: Seconds to wait before enumerating.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _refresh() -> None:
+            try:
+                if delay:
+                    time.sleep(delay)
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def on_devices_changed(self) -> None:
+        """Handles a device change notification from the platform adapter."""
+        logger.debug("Audio device change detected, refreshing device cache")
+        self.refresh_async(delay=self.debounce)
+
+    def start_monitoring(self) -> None:
+        """
+        Warms the cache and subscribes to device change notifications where
+        the platform supports them; elsewhere only the TTL applies.
+        """
+        self.refresh_async()
+        if self._monitor_thread or sys.platform != "win32":
+            return
+        try:
+            from src.core.util.monitor_device_change import (
+                create_device_change_monitor_thread)
+
+            self._monitor_thread = create_device_change_monitor_thread(
+                self.on_devices_changed)
+        except Exception as e:
+            logger.warning(f"Audio device change monitoring unavailable: {e}")
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Fragment options that keep an MP4 playable up to the last written fragment
+FRAGMENTED_MP4_FLAGS: str = "+frag_keyframe+empty_moov+default_base_moof"
+FRAGMENT_DURATION_US: int = 1_000_000
+
+# Screen container modes: extension, muxer, muxer options
+SCREEN_CONTAINERS: Dict[str, Tuple[str, str, List[str]]] = {
+    # Classic MP4, moov atom written when the segment closes
+    "mp4": (".mp4", "mp4", []),
+    # Fragmented MP4, readable while being written and after a kill
+    "fmp4": (".mp4", "mp4", [
+        f"movflags={FRAGMENTED_MP4_FLAGS}",
+        f"frag_duration={FRAGMENT_DURATION_US}",
+    ]),
+    # MPEG transport stream, every packet is self-contained
+    "mpegts": (".ts", "mpegts", []),
+}
+
+# Containers that stay valid at any byte offset while being written
+STREAMABLE_CONTAINERS: Tuple[str, ...] = ("fmp4", "mpegts")
+
+# Recording names start with their local start time, %Y%m%d_%H%M%S
+_TIMESTAMP_NAME_RE: re.Pattern = re.compile(r"^(\d{8})_\d{6}")
+
+# Audio codecs: extension, encoder, muxer
+AUDIO_CODECS: Dict[str, Tuple[str, str, str]] = {
+    "mp3": (".mp3", "libmp3lame", "mp3"),
+    # Opus is the most efficient at speech bitrates (16-32 kb/s)
+    "opus": (".ogg", "libopus", "ogg"),
+    "opus_webm": (".webm", "libopus", "webm"),
+    # ADTS needs no trailer, so a killed segment is still playable
+    "aac": (".aac", "aac", "adts"),
+    "flac": (".flac", "flac", "flac"),
+}
+# Sample rates libopus accepts
+OPUS_SAMPLE_RATES: Tuple[int, ...] = (8000, 12000, 16000, 24000, 48000)
+
+# Extensions produced by the audio recorder
+AUDIO_EXTENSIONS: Tuple[str, ...] = tuple(
+    dict.fromkeys(ext for ext, _, _ in AUDIO_CODECS.values()))
+
+# Extensions produced by the screen recorder
+VIDEO_EXTENSIONS: Tuple[str, ...] = tuple(
+    dict.fromkeys(ext for ext, _, _ in SCREEN_CONTAINERS.values()))
+
+# Every extension a recorder may produce
+RECORDING_EXTENSIONS: Tuple[str, ...] = tuple(
+    dict.fromkeys(VIDEO_EXTENSIONS + AUDIO_EXTENSIONS))
+
+
+def is_recording_file(path: str) -> bool:
+    """
+    Checks whether a path is a recording output.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        True if the extension belongs to a recording.
+    """
+    return path.lower().endswith(RECORDING_EXTENSIONS)
+
+
+def is_audio_file(path: str) -> bool:
+    """
+    Checks whether a path is an audio recording.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        True if the extension belongs to an audio recording.
+    """
+    return path.lower().endswith(AUDIO_EXTENSIONS)
+
+
+def is_video_file(path: str) -> bool:
+    """
+    Checks whether a path is a screen recording.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        True if the extension belongs to a screen recording.
+    """
+    return path.lower().endswith(VIDEO_EXTENSIONS)
+
+
+def muxer_for_extension(extension: str) -> Optional[str]:
+    """
+    Finds the muxer that writes a recording extension.
+
+    Args:
+        extension: The extension, including the dot.
+
+    Returns:
+        The ffmpeg muxer name, or None for an unknown extension.
+    """
+    extension = extension.lower()
+    for ext, muxer, _ in SCREEN_CONTAINERS.values():
+        if ext == extension:
+            return muxer
+    for ext, _, muxer in AUDIO_CODECS.values():
+        if ext == extension:
+            return muxer
+    return None
+
+
+def recording_date(path: str) -> str:
+    """
+    Gets the day a recording started, from the timestamp in its name or,
+    for other names, from its modification time.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        The date as YYYYmmdd.
+    """
+    match: Optional[re.Match] = _TIMESTAMP_NAME_RE.match(os.path.basename(path))
+    if match:
+        return match.group(1)
+    try:
+        return time.strftime("%Y%m%d", time.localtime(os.path.getmtime(path)))
+    except OSError:
+        return time.strftime("%Y%m%d")
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import codecs
+import os
+import select
+import sys
+import threading
+import time
+from typing import IO, Callable, Dict, List, Optional, Tuple
+
+from src.core.util.logger import logger
+
+# Largest chunk read from a pipe in one go
+READ_SIZE: int = 65536
+
+
+class _SelectPoller:
+    """Waits for readable pipes with select(), available on POSIX only."""
+
+    def poll(self, fds: List[int],
+             timeout: float) -> List[Tuple[int, bytes]]:
+        """
+        Reads whatever is available on the given descriptors.
+
+        Args:
+            fds: File descriptors to watch.
+            timeout: Maximum time to wait for data in seconds.
+
+        Returns:
+            (fd, data) pairs; empty data means the pipe was closed.
+        """
+        ready, _, _ = select.select(fds, [], [], timeout)
+        return [(fd, os.read(fd, READ_SIZE)) for fd in ready]
+
+
+class _PeekNamedPipePoller:
+    """
+    Polls anonymous pipes with PeekNamedPipe, because select() on Windows
+    only supports sockets.
+    """
+
+    def __init__(self) -> None:
+        import msvcrt
+        import pywintypes
+        import win32pipe
+
+        self._get_handle: Callable[[int], int] = msvcrt.get_osfhandle
+        self._peek: Callable = win32pipe.PeekNamedPipe
+        self._error: type = pywintypes.error
+
+    def poll(self, fds: List[int],
+             timeout: float) -> List[Tuple[int, bytes]]:
+        """
+        Reads whatever is available on the given descriptors.
+
+        Args:
+            fds: File descriptors to watch.
+            timeout: Time to sleep when no pipe had data, in seconds.
+
+        Returns:
+            (fd, data) pairs; empty data means the pipe was closed.
+        """
+        results: List[Tuple[int, bytes]] = []
+        for fd in fds:
+            try:
+                _, available, _ = self._peek(self._get_handle(fd), 0)
+            except (self._error, OSError):
+                results.append((fd, b""))  # Writer side has gone away
+                continue
+            if available:
+                results.append((fd, os.read(fd, min(available, READ_SIZE))))
+        if not results:
+            time.sleep(timeout)
+        return results
+
+
+class _Stream:
+    """A registered pipe and the callbacks that consume it."""
+
+    def __init__(self, pipe: IO[bytes], on_data: Callable[[bytes], None],
+                 on_close: Optional[Callable[[], None]]) -> None:
+        self.pipe: IO[bytes] = pipe
+        self.on_data: Callable[[bytes], None] = on_data
+        self.on_close: Optional[Callable[[], None]] = on_close
+
+
+class PipeMultiplexer:
+    """
+    Drains the pipes of every recorder process from a single thread, so a
+    chatty encoder can never block on a full pipe.
+    """
+
+    def __init__(self, poll_interval: float = 0.05) -> None:
+        """
+        Initializes the PipeMultiplexer.
+
+        Args:
+            poll_interval: Maximum time to wait for data per loop, in seconds.
+        """
+        self.poll_interval: float = poll_interval
+        self._poller = (_PeekNamedPipePoller()
+                        if sys.platform == "win32" else _SelectPoller())
+        self._streams: Dict[int, _Stream] = {}
+        self._cond: threading.Condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self,
+                 pipe: IO[bytes],
+                 on_data: Callable[[bytes], None],
+                 on_close: Optional[Callable[[], None]] = None) -> None:
+        """
+        Starts draining a pipe.
+
+        Args:
+            pipe: The readable end of a subprocess pipe.
+            on_data: Called with every chunk read from the pipe.
+            on_close: Called once the pipe reaches EOF.
+        """
+        with self._cond:
+            self._streams[pipe.fileno()] = _Stream(pipe, on_data, on_close)
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                name="ffmpeg-pipe-mux",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        """Polls all registered pipes until the process exits."""
+        while True:
+            with self._cond:
+                while not self._streams:
+                    self._cond.wait()
+                streams: Dict[int, _Stream] = dict(self._streams)
+
+            try:
+                chunks: List[Tuple[int, bytes]] = self._poller.poll(
+                    list(streams), self.poll_interval)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Pipe poll failed, dropping closed pipes: {e}")
+                chunks = [(fd, b"") for fd, s in streams.items()
+                          if s.pipe.closed]
+
+            for fd, data in chunks:
+                stream: _Stream = streams[fd]
+                if data:
+                    self._dispatch(stream.on_data, data)
+                else:
+                    self._close(fd, stream)
+
+    def _close(self, fd: int, stream: _Stream) -> None:
+        """Unregisters a pipe that reached EOF."""
+        with self._cond:
+            self._streams.pop(fd, None)
+        if stream.on_close:
+            self._dispatch(stream.on_close)
+        try:
+            stream.pipe.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _dispatch(callback: Callable, *args) -> None:
+        """Runs a consumer callback without letting it kill the loop."""
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.debug(f"Pipe consumer error: {e}")
+
+
+class RateLimitedLineLogger:
+    """
+    Reassembles partial lines from a pipe and forwards them to the logger,
+    at most ``max_lines_per_second`` lines per second.
+    """
+
+    def __init__(self, prefix: str, max_lines_per_second: int = 20) -> None:
+        """
+        Initializes the RateLimitedLineLogger.
+
+        Args:
+            prefix: Text put in front of every forwarded line.
+            max_lines_per_second: Token bucket rate and burst size.
+        """
+        self.prefix: str = prefix
+        self.rate: int = max_lines_per_second
+        self._tokens: float = float(max_lines_per_second)
+        self._last_refill: float = time.monotonic()
+        self._suppressed: int = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer: str = ""
+
+    def feed(self, data: bytes) -> None:
+        """
+        Consumes a chunk of pipe output.
+
+        Args:
+            data: Raw bytes read from the pipe.
+        """
+        # ffmpeg terminates status lines with '\r', treat it as a line break
+        self._buffer += self._decoder.decode(data).replace("\r", "\n")
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                self._emit(line.strip())
+
+    def flush(self) -> None:
+        """Forwards any trailing partial line."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        if self._buffer.strip():
+            self._emit(self._buffer.strip())
+        self._buffer = ""
+        if self._suppressed:
+            logger.debug(f"{self.prefix}: suppressed {self._suppressed} lines")
+            self._suppressed = 0
+
+    def _emit(self, line: str) -> None:
+        """Logs a line if the rate limit allows it."""
+        now: float = time.monotonic()
+        self._tokens = min(float(self.rate), self._tokens +
+                           (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens < 1:
+            self._suppressed += 1
+            return
+        self._tokens -= 1
+        if self._suppressed:
+            logger.debug(f"{self.prefix}: suppressed {self._suppressed} lines")
+            self._suppressed = 0
+        logger.debug(f"{self.prefix}: {line}")
+
+
+_multiplexer: Optional[PipeMultiplexer] = None
+_multiplexer_lock: threading.Lock = threading.Lock()
+
+
+def get_pipe_multiplexer() -> PipeMultiplexer:
+    """
+    Gets the process-wide pipe multiplexer.
+
+    Returns:
+        The shared PipeMultiplexer instance.
+    """
+    global _multiplexer
+    with _multiplexer_lock:
+        if _multiplexer is None:
+            _multiplexer = PipeMultiplexer()
+        return _multiplexer
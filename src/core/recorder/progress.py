@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from src.core.util.logger import logger
+
+# Global options that make ffmpeg write key=value progress blocks to stdout
+PROGRESS_ARGS: List[str] = ["-progress", "pipe:1", "-nostats"]
+
+
+@dataclass
+class ProgressSample:
+    """A single progress block reported by ffmpeg"""
+    timestamp: float
+    frame: Optional[int] = None
+    fps: Optional[float] = None
+    bitrate_kbps: Optional[float] = None
+    total_size: Optional[int] = None
+    out_time_us: Optional[int] = None
+    speed: Optional[float] = None
+    dup_frames: int = 0
+    drop_frames: int = 0
+    ended: bool = False
+
+    @property
+    def out_time(self) -> str:
+        """Output timestamp formatted as HH:MM:SS."""
+        if self.out_time_us is None:
+            return "N/A"
+        return time.strftime("%H:%M:%S",
+                             time.gmtime(self.out_time_us / 1_000_000))
+
+    def to_dict(self) -> Dict[str, Optional[float | int | str | bool]]:
+        """
+        Convert the sample to a dictionary.
+
+        Returns:
+            A dictionary representation of the sample.
+        """
+        return {
+            "timestamp": self.timestamp,
+            "frame": self.frame,
+            "fps": self.fps,
+            "bitrate_kbps": self.bitrate_kbps,
+            "total_size": self.total_size,
+            "out_time": self.out_time,
+            "speed": self.speed,
+            "dup_frames": self.dup_frames,
+            "drop_frames": self.drop_frames,
+            "ended": self.ended,
+        }
+
+
+def _parse_float(value: str, suffix: str = "") -> Optional[float]:
+    """Parse an ffmpeg numeric value such as '1.02x' or 'N/A'."""
+    value = value.strip()
+    if suffix and value.endswith(suffix):
+        value = value[:-len(suffix)]
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_int(value: str) -> Optional[int]:
+    """Parse an ffmpeg integer value, returning None for 'N/A'."""
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
+
+
+class ProgressTracker:
+    """
+    Incrementally parses ffmpeg ``-progress`` output and keeps a ring buffer
+    of the most recent samples.
+    """
+
+    def __init__(self,
+                 name: str = "",
+                 history_size: int = 120,
+                 slow_speed: float = 1.0,
+                 slow_samples: int = 10) -> None:
+        """
+        Initializes the ProgressTracker.
+
+        Args:
+            name: Label used in log messages.
+            history_size: Number of samples kept in the ring buffer.
+            slow_speed: Speed below which the encoder is considered lagging.
+            slow_samples: Consecutive slow samples before a warning is logged.
+        """
+        self.name: str = name
+        self.slow_speed: float = slow_speed
+        self.slow_samples: int = slow_samples
+        self._history: Deque[ProgressSample] = deque(maxlen=history_size)
+        self._pending: Dict[str, str] = {}
+        self._buffer: str = ""
+        self._slow_count: int = 0
+        self._lagging: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Drop all samples and any partially received block."""
+        with self._lock:
+            self._history.clear()
+            self._pending = {}
+            self._buffer = ""
+            self._slow_count = 0
+            self._lagging = False
+
+    def feed(self, data: str) -> List[ProgressSample]:
+        """
+        Feed a chunk of progress output, which may end with a partial line.
+
+        Args:
+            data: Raw text read from the progress channel.
+
+        Returns:
+            The samples completed by this chunk.
+        """
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split("\n")
+        samples: List[ProgressSample] = []
+        for line in lines:
+            sample: Optional[ProgressSample] = self.feed_line(line)
+            if sample:
+                samples.append(sample)
+        return samples
+
+    def feed_line(self, line: str) -> Optional[ProgressSample]:
+        """
+        Feed one complete ``key=value`` line.
+
+        Args:
+            line: A line of progress output.
+
+        Returns:
+            The completed sample when the line closes a progress block.
+        """
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        if key != "progress":
+            self._pending[key] = value
+            return None
+
+        sample: ProgressSample = self._build_sample(self._pending,
+                                                    value == "end")
+        self._pending = {}
+        with self._lock:
+            self._history.append(sample)
+        self._check_speed(sample)
+        return sample
+
+    def _build_sample(self, values: Dict[str, str],
+                      ended: bool) -> ProgressSample:
+        """Convert a block of raw key/value pairs to a sample."""
+        out_time: Optional[int] = _parse_int(
+            values.get("out_time_us", values.get("out_time_ms", "N/A")))
+        return ProgressSample(
+            timestamp=time.time(),
+            frame=_parse_int(values.get("frame", "N/A")),
+            fps=_parse_float(values.get("fps", "N/A")),
+            bitrate_kbps=_parse_float(values.get("bitrate", "N/A"),
+                                      "kbits/s"),
+            total_size=_parse_int(values.get("total_size", "N/A")),
+            out_time_us=out_time,
+            speed=_parse_float(values.get("speed", "N/A"), "x"),
+            dup_frames=_parse_int(values.get("dup_frames", "0")) or 0,
+            drop_frames=_parse_int(values.get("drop_frames", "0")) or 0,
+            ended=ended,
+        )
+
+    def _check_speed(self, sample: ProgressSample) -> None:
+        """Warn once when the encoder stays below real time."""
+        if sample.speed is None:
+            return
+        if sample.speed < self.slow_speed:
+            self._slow_count += 1
+        else:
+            self._slow_count = 0
+            if self._lagging:
+                logger.info(f"FFmpeg [{self.name}] is back to real time "
+                            f"({sample.speed:.2f}x)")
+            self._lagging = False
+
+        if self._slow_count >= self.slow_samples and not self._lagging:
+            self._lagging = True
+            logger.warning(
+                f"FFmpeg [{self.name}] is falling behind real time: "
+                f"speed {sample.speed:.2f}x for {self._slow_count} samples")
+
+    @property
+    def is_lagging(self) -> bool:
+        """Whether speed has stayed below the threshold."""
+        return self._lagging
+
+    def latest(self) -> Optional[ProgressSample]:
+        """Return the most recent sample, if any."""
+        with self._lock:
+            return self._history[-1] if self._history else None
+
+    def samples(self) -> List[ProgressSample]:
+        """Return a snapshot of the sample history, oldest first."""
+        with self._lock:
+            return list(self._history)
@@ -4,8 +4,10 @@ import os
 import time
 from typing import Any, Dict, List, Optional
 
-import imageio_ffmpeg
 from src.core.recorder.base_recoder import BaseRecorder
+from src.core.recorder.formats import SCREEN_CONTAINERS, STREAMABLE_CONTAINERS
+from src.core.util.logger import logger
+from src.core.util.ffmpeg_capabilities import VIDEO_ENCODER_ARGS, get_capabilities
 
 
 class ScreenRecorder(BaseRecorder):
@@ -22,28 +24,26 @@ class ScreenRecorder(BaseRecorder):
         screen_config: Dict[str, Any] = config.get("screen", {})
         self.framerate: int = screen_config.get("framerate", 30)
         self.display_id: int = screen_config.get("display_id", 1)
+        self.encoder: str = screen_config.get("encoder", "auto")
+        self.container: str = screen_config.get("container", "mp4")
+        if self.container not in SCREEN_CONTAINERS:
+            logger.warning(
+                f"Unknown screen container {self.container}, using mp4")
+            self.container = "mp4"
 
-    def _build_command(self, device: str, folder: str) -> List[str]:
+    def _build_input_args(self, device: str) -> List[str]:
         """
-        Builds the FFmpeg command for screen recording.
+        Builds the capture and encoding arguments for screen recording,
+        using the fastest encoder the bundled ffmpeg supports.
 
         Args:
             device: The screen capture device name (ignored, uses display_id).
-            folder: The base folder for storing recordings.
 
         Returns:
-            The FFmpeg command as a list of strings.
+            The FFmpeg arguments as a list of strings.
         """
-        segment_duration: Optional[int] = self.validate_segment_duration()
-        device_name: str = self.config.get("device_name", "default")
-        date_str: str = time.strftime("%Y%m%d")
-        tmp_path: str = os.path.join(".tmp", device_name, date_str, "screen")
-        os.makedirs(tmp_path, exist_ok=True)
-
-        output_template: str = self._get_ouput_template(tmp_path)
-
+        encoder: str = get_capabilities().select_video_encoder(self.encoder)
         cmd: List[str] = [
-            imageio_ffmpeg.get_ffmpeg_exe(),
             "-loglevel",
             "info",
             "-y",
@@ -53,28 +53,80 @@ class ScreenRecorder(BaseRecorder):
             str(self.framerate),
             "-i",
             f"desktop",
+            "-c:v",
+            encoder,
+            *VIDEO_ENCODER_ARGS.get(encoder, []),
+            "-pix_fmt",
+            "yuv420p",
         ]
         #For multi-screen capture, use the following command
         # if self.display_id > 1:
         #     cmd.extend(["-offset_x", str((self.display_id-1)*1920),"-offset_y", "0"]) #Need to be modified according to the actual screen resolution
         # cmd.extend(["-video_size", "1920x1080"])
+        return cmd
+
+    def _build_output_args(self, device: str, folder: str) -> List[str]:
+        """
+        Builds the output arguments for screen recording.
+
+        Args:
+            device: The screen capture device name (ignored, uses display_id).
+            folder: The base folder for storing recordings.
+
+        Returns:
+            The FFmpeg arguments as a list of strings.
+        """
+        segment_duration: Optional[int] = self.validate_segment_duration()
+        device_name: str = self.config.get("device_name", "default")
+        # No date folder: the mover files each segment under the date in
+        # its name, so a recording that runs past midnight rolls over
+        tmp_path: str = os.path.join(self.staging.current(), device_name,
+                                     "screen")
+        os.makedirs(tmp_path, exist_ok=True)
+        self.output_dir = tmp_path
+
+        output_template: str = self._get_ouput_template(tmp_path)
+        self.segment_list_path = None
+        extension, muxer, muxer_options = SCREEN_CONTAINERS[self.container]
 
         if segment_duration:
-            cmd.extend([
+            cmd: List[str] = [
                 "-f",
                 "segment",
                 "-segment_time",
                 str(segment_duration),
+                "-segment_format",
+                muxer,
+            ]
+            if muxer_options:
+                cmd.extend(
+                    ["-segment_format_options", ":".join(muxer_options)])
+            return cmd + [
+                *self._segment_list_args(tmp_path),
                 "-reset_timestamps",
                 "1",
                 "-strftime",
                 "1",
-                f"{output_template}.mp4",
-            ])
-        else:
-            cmd.append(os.path.join(tmp_path, f"{int(time.time())}.mp4"))
+                f"{output_template}{extension}",
+            ]
 
-        return cmd
+        cmd = ["-f", muxer]
+        for option in muxer_options:
+            key, value = option.split("=", 1)
+            cmd.extend([f"-{key}", value])
+        return cmd + [
+            os.path.join(tmp_path,
+                         time.strftime("%Y%m%d_%H%M%S") + extension)
+        ]
+
+    def is_streamable(self) -> bool:
+        """
+        Whether the output can be read while it is being written.
+
+        Returns:
+            True for fragmented MP4 and MPEG-TS output.
+        """
+        return self.container in STREAMABLE_CONTAINERS
 
     def get_recorder_type(self) -> str:
         return "screen"
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import csv
+import os
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.core.util.logger import logger
+
+# The segment muxer appends "filename,start,end" as each segment closes
+SEGMENT_LIST_TYPE: str = "csv"
+
+
+@dataclass
+class CompletedSegment:
+    """A segment that ffmpeg has finished writing"""
+    path: str
+    start: float  # Stream time in seconds since the recording started
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def parse_segment_list_line(line: str, directory: str) -> Optional[CompletedSegment]:
+    """
+    Parses one entry of a CSV segment list.
+
+    Args:
+        line: The line, without its newline.
+        directory: The directory the segment names are relative to.
+
+    Returns:
+        The segment, or None for a malformed line.
+    """
+    try:
+        name, start, end = next(csv.reader([line]))
+        return CompletedSegment(path=os.path.join(directory, name),
+                                start=float(start),
+                                end=float(end))
+    except (StopIteration, ValueError):
+        return None
+
+
+class _FollowedList:
+    """A segment list being read and the process writing it"""
+
+    def __init__(self, list_path: str, process: subprocess.Popen,
+                 on_segment: Callable[[CompletedSegment], None]) -> None:
+        self.list_path: str = list_path
+        self.directory: str = os.path.dirname(list_path)
+        self.process: subprocess.Popen = process
+        self.on_segment: Callable[[CompletedSegment], None] = on_segment
+        self.offset: int = 0
+        self.partial: bytes = b""
+
+
+class SegmentListReader:
+    """
+    Follows the segment lists of running recorders on one thread and
+    reports every segment as soon as ffmpeg closes it, including the last
+    segment of a session, which is listed when ffmpeg shuts down.
+    """
+
+    def __init__(self, poll_interval: float = 0.5) -> None:
+        """
+        Initializes the SegmentListReader.
+
+        Args:
+            poll_interval: Seconds between checks for new entries.
+        """
+        self.poll_interval: float = poll_interval
+        self._lists: Dict[str, _FollowedList] = {}
+        self._cond: threading.Condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def follow(self, list_path: str, process: subprocess.Popen,
+               on_segment: Callable[[CompletedSegment], None]) -> None:
+        """
+        Starts reading a segment list.
+
+        Args:
+            list_path: The list file ffmpeg writes.
+            process: The ffmpeg process writing it.
+            on_segment: Called on the reader thread for each segment.
+        """
+        with self._cond:
+            self._lists[list_path] = _FollowedList(list_path, process,
+                                                   on_segment)
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                name="segment-list-reader",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def is_following(self, directory: str) -> bool:
+        """
+        Whether segments in a directory are reported by a segment list.
+
+        Args:
+            directory: A recorder output directory.
+
+        Returns:
+            True while a list for the directory is being followed.
+        """
+        directory = os.path.abspath(directory)
+        with self._cond:
+            return any(
+                os.path.abspath(followed.directory) == directory
+                for followed in self._lists.values())
+
+    def _run(self) -> None:
+        """Polls every followed list until none are left."""
+        while True:
+            with self._cond:
+                while not self._lists:
+                    self._cond.wait()
+                followed_lists: List[_FollowedList] = list(
+                    self._lists.values())
+            for followed in followed_lists:
+                # Check before reading, so entries written just before exit
+                # are still read once more
+                finished: bool = followed.process.poll() is not None
+                self._read(followed)
+                if finished:
+                    self._close(followed)
+            with self._cond:
+                self._cond.wait(self.poll_interval)
+
+    def _read(self, followed: _FollowedList) -> None:
+        """Reports the entries appended since the last read."""
+        try:
+            with open(followed.list_path, "rb") as f:
+                f.seek(followed.offset)
+                data: bytes = f.read()
+                followed.offset += len(data)
+        except FileNotFoundError:
+            return  # Not created until the first segment closes
+        except OSError as e:
+            logger.debug(f"Cannot read segment list {followed.list_path}: {e}")
+            return
+
+        lines: List[bytes] = (followed.partial + data).split(b"\n")
+        followed.partial = lines.pop()  # Incomplete until its newline
+        for line in lines:
+            segment: Optional[CompletedSegment] = parse_segment_list_line(
+                line.rstrip(b"\r").decode("utf-8", errors="replace"),
+                followed.directory)
+            if segment is None:
+                continue
+            try:
+                followed.on_segment(segment)
+            except Exception as e:
+                logger.error(f"Failed to handle segment {segment.path}: {e}")
+
+    def _close(self, followed: _FollowedList) -> None:
+        """Stops following a list whose process exited and removes it."""
+        with self._cond:
+            self._lists.pop(followed.list_path, None)
+        try:
+            os.remove(followed.list_path)
+        except OSError:
+            pass
+
+
+_reader: Optional[SegmentListReader] = None
+_reader_lock: threading.Lock = threading.Lock()
+
+
+def get_segment_list_reader() -> SegmentListReader:
+    """
+    Gets the process-wide SegmentListReader.
+
+    Returns:
+        The shared SegmentListReader.
+    """
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = SegmentListReader()
+        return _reader
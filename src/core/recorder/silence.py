@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.core.util.ffmpeg import run_ffmpeg
+from src.core.util.logger import logger
+from src.core.util.media_probe import parse_duration
+
+# What to do with a segment that is entirely silent
+SILENCE_POLICIES: Tuple[str, ...] = ("keep", "skip", "delete")
+
+_TIME_RE: re.Pattern = re.compile(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_START_RE: re.Pattern = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE: re.Pattern = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+@dataclass
+class SilenceAnalysis:
+    """Loudness summary of one audio segment"""
+    duration: float
+    silent_seconds: float
+
+    @property
+    def activity_ratio(self) -> float:
+        """Share of the segment that is above the noise floor, 0 to 1."""
+        if self.duration <= 0:
+            return 0.0
+        return max(0.0, min(1.0, 1 - self.silent_seconds / self.duration))
+
+
+def _seconds(match: re.Match) -> float:
+    """Converts an HH:MM:SS.ss match to seconds."""
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def parse_silencedetect(stderr: str) -> SilenceAnalysis:
+    """
+    Parses the stderr of an ffmpeg run with the silencedetect filter.
+
+    A silence that is still open when the input ends counts up to the end
+    of the segment.
+
+    Args:
+        stderr: The ffmpeg stderr text.
+
+    Returns:
+        The segment duration and its silent seconds.
+    """
+    duration: float = parse_duration(stderr) or 0.0
+    # The decoded length is more accurate than the header estimate
+    times: List[re.Match] = list(_TIME_RE.finditer(stderr))
+    if times:
+        duration = max(duration, _seconds(times[-1]))
+
+    silent: float = 0.0
+    start: Optional[float] = None
+    for line in stderr.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and start is not None:
+            silent += max(0.0, float(end_match.group(1)) - start)
+            start = None
+    if start is not None:
+        silent += max(0.0, duration - start)
+    return SilenceAnalysis(duration=duration, silent_seconds=silent)
+
+
+def analyze_silence(path: str,
+                    noise_db: float = -50,
+                    min_duration: float = 0.5) -> Optional[SilenceAnalysis]:
+    """
+    Decodes an audio segment through ffmpeg's silencedetect filter.
+
+    Args:
+        path: The audio file.
+        noise_db: Level below which audio counts as silence.
+        min_duration: Shortest stretch of silence that is reported.
+
+    Returns:
+        The analysis, or None if ffmpeg could not decode the file.
+    """
+    try:
+        result = run_ffmpeg(
+            [
+                "-hide_banner", "-nostdin", "-i", path, "-vn", "-af",
+                f"silencedetect=noise={noise_db}dB:d={min_duration}", "-f",
+                "null", "-"
+            ],
+            timeout=120,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Silence analysis failed for {path}: {e}")
+        return None
+    if result.returncode != 0:
+        logger.warning(f"Silence analysis failed for {path}: "
+                       f"{result.stderr.strip().splitlines()[-1:]}")
+        return None
+    return parse_silencedetect(result.stderr)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from src.core.recorder.base_recoder import BaseRecorder
+from src.core.recorder.formats import is_recording_file
+from src.core.uploader.webdav_client import WebDAVClient
+from src.core.util.colorizer import Colorizer
+from src.core.util.logger import logger
+
+if TYPE_CHECKING:
+    from src.core.manager.local_file import LocalFileManager
+
+
+class StreamTarget(ABC):
+    """Destination that accepts an upload whose length is not known yet"""
+
+    @abstractmethod
+    def upload(self, remote_path: str, local_path: str,
+               chunks: Iterator[bytes]) -> bool:
+        """
+        Uploads the chunks as one remote file.
+
+        Args:
+            remote_path: The destination path.
+            local_path: The local file being streamed.
+            chunks: The data, produced as the file grows.
+
+        Returns:
+            True if the upload was successful, False otherwise.
+        """
+        pass
+
+
+class WebDAVChunkedTarget(StreamTarget):
+    """Streams to WebDAV with a chunked-encoding PUT"""
+
+    def __init__(self, webdav: WebDAVClient) -> None:
+        """
+        Initializes the target.
+
+        Args:
+            webdav: The WebDAVClient to upload with.
+        """
+        self.webdav: WebDAVClient = webdav
+
+    def upload(self, remote_path: str, local_path: str,
+               chunks: Iterator[bytes]) -> bool:
+        return self.webdav.upload_stream(remote_path, local_path, chunks)
+
+
+class _LiveSegment:
+    """A growing segment and how much of it has been streamed"""
+
+    def __init__(self, tmp_path: str, target_path: str) -> None:
+        self.tmp_path: str = tmp_path
+        self.target_path: str = target_path
+        self.sent: int = 0
+        self.complete: threading.Event = threading.Event()
+
+    def current_path(self) -> str:
+        """The segment path, following it once the mover has moved it."""
+        if os.path.exists(self.tmp_path):
+            return self.tmp_path
+        return self.target_path
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+        Reads from the segment. The mover may move it between resolving its
+        path and opening it, so the path is resolved again once on failure.
+        """
+        try:
+            return self._read(self.current_path(), offset, size)
+        except OSError:
+            return self._read(self.current_path(), offset, size)
+
+    def size(self) -> int:
+        """The segment size, resolving its path again once on failure."""
+        try:
+            return os.path.getsize(self.current_path())
+        except OSError:
+            return os.path.getsize(self.current_path())
+
+    @staticmethod
+    def _read(path: str, offset: int, size: int) -> bytes:
+        """Reads up to size bytes of a file from an offset."""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+
+class LiveStreamer:
+    """
+    Tails the segment a recorder is currently writing and streams it to the
+    remote target as it is produced. If the stream breaks, the segment is
+    left to the regular upload of finished files.
+    """
+
+    def __init__(self,
+                 target: StreamTarget,
+                 local_file_manager: LocalFileManager,
+                 poll_interval: float = 0.5,
+                 chunk_size: int = 256 * 1024,
+                 stall_timeout: float = 30) -> None:
+        """
+        Initializes the LiveStreamer.
+
+        Args:
+            target: Where the segments are streamed to.
+            local_file_manager: Maps segment paths and records uploads.
+            poll_interval: Seconds between checks for new data.
+            chunk_size: Maximum bytes sent per chunk.
+            stall_timeout: Seconds without growth before a stream is abandoned.
+        """
+        self.target: StreamTarget = target
+        self.local_file_manager: LocalFileManager = local_file_manager
+        self.poll_interval: float = poll_interval
+        self.chunk_size: int = chunk_size
+        self.stall_timeout: float = stall_timeout
+
+    def follow(self, recorder: BaseRecorder,
+               process: subprocess.Popen) -> None:
+        """
+        Starts streaming the output of a recording process. Suitable as a
+        BaseRecorder start listener.
+
+        Args:
+            recorder: The recorder that started.
+            process: Its FFmpeg process.
+        """
+        if not recorder.output_dir:
+            return
+        threading.Thread(target=self._follow,
+                         args=(recorder.output_dir, process),
+                         daemon=True).start()
+
+    def _follow(self, output_dir: str, process: subprocess.Popen) -> None:
+        """Switches the stream to each new segment until the process exits."""
+        current: Optional[_LiveSegment] = None
+        while True:
+            running: bool = process.poll() is None
+            newest: Optional[str] = self._newest_segment(output_dir)
+            if newest and (current is None or newest != current.tmp_path):
+                if current:
+                    current.complete.set()
+                current = _LiveSegment(
+                    newest, self.local_file_manager.get_target_path(newest))
+                threading.Thread(target=self._stream,
+                                 args=(current, ),
+                                 daemon=True).start()
+            if not running:
+                if current:
+                    current.complete.set()
+                return
+            time.sleep(self.poll_interval)
+
+    @staticmethod
+    def _newest_segment(output_dir: str) -> Optional[str]:
+        """Finds the segment being written, by its timestamped name."""
+        try:
+            names: List[str] = [
+                n for n in os.listdir(output_dir) if is_recording_file(n)
+            ]
+        except OSError:
+            return None
+        return os.path.join(output_dir, max(names)) if names else None
+
+    def _stream(self, segment: _LiveSegment) -> None:
+        """Streams one segment and records it when it arrived complete."""
+        remote_path: str = self.local_file_manager.get_remote_path(
+            segment.target_path)
+        if not self.target.upload(remote_path, segment.tmp_path,
+                                  self._read_growing(segment)):
+            logger.warning(
+                Colorizer.yellow(
+                    f"Live upload of {segment.tmp_path} broke off, "
+                    "it will be uploaded after it is finished"))
+            return
+
+        try:
+            final_size: int = segment.size()
+        except OSError as e:
+            logger.warning(f"Cannot check live upload of {segment.tmp_path} "
+                           f"({e}), it will be uploaded after it is finished")
+            return
+        if segment.sent == final_size:
+            self.local_file_manager.register_streamed_file(
+                segment.tmp_path, final_size)
+        else:
+            logger.warning(
+                f"Live upload of {segment.tmp_path} sent {segment.sent} of "
+                f"{final_size} bytes, it will be uploaded again")
+
+    def _read_growing(self, segment: _LiveSegment) -> Iterator[bytes]:
+        """
+        Yields the bytes of a segment as they are written. The file is
+        reopened for each read, so the handle never blocks the mover.
+        """
+        idle: float = 0.0
+        while True:
+            complete: bool = segment.complete.is_set()
+            # An OSError here breaks the stream off; the upload of
+            # finished files takes the segment over
+            chunk: bytes = segment.read(segment.sent, self.chunk_size)
+            if chunk:
+                segment.sent += len(chunk)
+                idle = 0.0
+                yield chunk
+                continue
+            if complete:
+                return
+            if idle >= self.stall_timeout:
+                raise IOError(f"{segment.tmp_path} stopped growing")
+            time.sleep(self.poll_interval)
+            idle += self.poll_interval
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from src.core.util.logger import logger
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from webdav3.client import Client  # type: ignore
 from webdav3.exceptions import RemoteResourceNotFound
+from webdav3.urn import Urn
 from src.core.manager.config import ConfigManager
 from src.core.util.colorizer import Colorizer
 
@@ -133,6 +134,43 @@ class WebDAVClient:
             )
             return False
 
+    def upload_stream(self, remote_path: str, local_path: str,
+                      chunks: Iterable[bytes]) -> bool:
+        """
+        Uploads data that is still being produced, using a single PUT with
+        chunked transfer encoding.
+
+        Args:
+            remote_path: The destination path on the WebDAV server.
+            local_path: The local file being streamed, used for status only.
+            chunks: The data to send; the upload ends when it is exhausted.
+
+        Returns:
+            True if the upload was successful, False otherwise.
+        """
+        if not self.client:
+            logger.error(Colorizer.red("✗ WebDAV client is not initialized"))
+            return False
+
+        try:
+            self.current_uploads[local_path] = {
+                "progress": 0,
+                "status": "streaming"
+            }
+            logger.info(f"⏳ Starting live upload: {local_path} -> {remote_path}")
+            self.create_directory(os.path.dirname(remote_path))
+            self.client.execute_request(action="upload",
+                                        path=Urn(remote_path).quote(),
+                                        data=chunks)
+            logger.info(Colorizer.green(f"✓ Live upload successful: {local_path}"))
+            self.current_uploads[local_path]["status"] = "completed"
+            self.current_uploads[local_path]["progress"] = 100.0
+            return True
+        except Exception as e:
+            self.current_uploads[local_path]["status"] = "failed"
+            logger.error(Colorizer.red(f"✗ Live upload failed: {str(e)}"))
+            return False
+
     def create_directory(self, remote_path: str) -> bool:
         """
         Creates a remote directory and all necessary parent directories.
@@ -0,0 +1,184 @@
+# Standard library imports
+from __future__ import annotations
+import io
+import os
+import struct
+import zipfile
+from typing import BinaryIO, Dict, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+# Fixed part of a zip local file header, before the name and extra field
+_LOCAL_HEADER: struct.Struct = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE: bytes = b"PK\x03\x04"
+
+
+def pack_directory(directory: str, archive_path: str) -> Dict[str, int]:
+    """
+    Writes every file below a directory into an uncompressed zip archive
+    and verifies it. Recordings are already compressed, so storing them
+    keeps each member a contiguous byte range of the archive.
+
+    Args:
+        directory: The directory to pack.
+        archive_path: The archive to write; replaced only once verified.
+
+    Returns:
+        The offset of each member's data in the archive, by the member's
+        path relative to the directory, with forward slashes.
+
+    Raises:
+        OSError: If a file cannot be read or the archive cannot be written.
+        zipfile.BadZipFile: If the written archive does not verify.
+    """
+    partial: str = f"{archive_path}.part"
+    sizes: Dict[str, int] = {}
+    try:
+        with zipfile.ZipFile(partial,
+                             "w",
+                             compression=zipfile.ZIP_STORED,
+                             allowZip64=True) as archive:
+            for current, dirs, names in os.walk(directory):
+                dirs.sort()
+                for name in sorted(names):
+                    path: str = os.path.join(current, name)
+                    member: str = os.path.relpath(path, directory).replace(
+                        "\\", "/")
+                    sizes[member] = os.path.getsize(path)
+                    archive.write(path, member)
+        with open(partial, "rb") as f:
+            os.fsync(f.fileno())
+        offsets: Dict[str, int] = verify_archive(partial, sizes)
+        os.replace(partial, archive_path)
+        return offsets
+    except BaseException:
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+        raise
+
+
+def verify_archive(archive_path: str, sizes: Dict[str, int]) -> Dict[str, int]:
+    """
+    Checks that an archive holds exactly the expected members, stored and
+    with intact checksums, and locates their data.
+
+    Args:
+        archive_path: The archive to check.
+        sizes: The expected size of each member.
+
+    Returns:
+        The offset of each member's data in the archive.
+
+    Raises:
+        zipfile.BadZipFile: If the archive does not match.
+    """
+    offsets: Dict[str, int] = {}
+    with zipfile.ZipFile(archive_path) as archive, open(archive_path,
+                                                        "rb") as f:
+        infos: Dict[str, zipfile.ZipInfo] = {
+            info.filename: info
+            for info in archive.infolist()
+        }
+        if set(infos) != set(sizes):
+            raise zipfile.BadZipFile("Archive members do not match")
+        bad: Optional[str] = archive.testzip()
+        if bad is not None:
+            raise zipfile.BadZipFile(f"Checksum mismatch in {bad}")
+        for name, info in infos.items():
+            if (info.compress_type != zipfile.ZIP_STORED
+                    or info.file_size != sizes[name]):
+                raise zipfile.BadZipFile(f"Unexpected member {name}")
+            f.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile(f"Bad local header for {name}")
+            name_length, extra_length = header[-2], header[-1]
+            offsets[name] = (info.header_offset + _LOCAL_HEADER.size +
+                             name_length + extra_length)
+    return offsets
+
+
+class ArchiveMemberReader(io.RawIOBase):
+    """A read-only, seekable view of one stored member of an archive"""
+
+    def __init__(self, archive_path: str, offset: int, size: int) -> None:
+        """
+        Initializes the ArchiveMemberReader.
+
+        Args:
+            archive_path: The archive holding the member.
+            offset: Offset of the member's data in the archive.
+            size: Size of the member.
+        """
+        super().__init__()
+        self._file: BinaryIO = open(archive_path, "rb")
+        self._offset: int = offset
+        self._size: int = size
+        self._position: int = 0
+
+    def readable(self) -> bool:
+        """The member can be read."""
+        return True
+
+    def seekable(self) -> bool:
+        """The member supports random access."""
+        return True
+
+    def tell(self) -> int:
+        """Returns the position within the member."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Moves to a position within the member."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Reads member data into a buffer, stopping at the member's end."""
+        remaining: int = self._size - self._position
+        if remaining <= 0:
+            return 0
+        view: memoryview = memoryview(buffer)[:remaining]
+        self._file.seek(self._offset + self._position)
+        count: int = self._file.readinto(view)
+        self._position += count
+        return count
+
+    def close(self) -> None:
+        """Closes the archive."""
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_recording(local_path: str,
+                   archive_path: Optional[str] = None,
+                   archive_offset: Optional[int] = None,
+                   size: int = 0) -> BinaryIO:
+    """
+    Opens a recording for reading, whether it is a plain file or was packed
+    into a day archive.
+
+    Args:
+        local_path: The recording's path before packing.
+        archive_path: The day archive holding it, if packed.
+        archive_offset: Offset of its data in the archive.
+        size: Its size in bytes, needed when packed.
+
+    Returns:
+        A binary file object supporting random access.
+    """
+    if archive_path is None or archive_offset is None:
+        return open(local_path, "rb")
+    logger.debug(f"Reading {local_path} from {archive_path}")
+    return io.BufferedReader(  # type: ignore[return-value]
+        ArchiveMemberReader(archive_path, archive_offset, size))
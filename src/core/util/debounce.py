@@ -0,0 +1,67 @@
+# Standard library imports
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+
+class PathDebouncer:
+    """
+    Collects file system events per path and hands each path to a callback
+    once no event for it arrived during the delay, so a file copied in many
+    writes, or created and then renamed, is handled once.
+    """
+
+    def __init__(self, delay: float,
+                 callback: Callable[[List[str]], None]) -> None:
+        """
+        Initializes the PathDebouncer.
+
+        Args:
+            delay: Seconds a path must stay quiet before it is handled.
+            callback: Called on the debouncer thread with the settled paths.
+        """
+        self.delay: float = delay
+        self.callback: Callable[[List[str]], None] = callback
+        self._due: Dict[str, float] = {}
+        self._cond: threading.Condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def touch(self, path: str) -> None:
+        """
+        Records an event for a path, postponing its handling.
+
+        Args:
+            path: The path the event was for.
+        """
+        with self._cond:
+            self._due[path] = time.monotonic() + self.delay
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                name="path-debouncer",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        """Hands over paths as they settle."""
+        while True:
+            with self._cond:
+                while not self._due:
+                    self._cond.wait()
+                now: float = time.monotonic()
+                settled: List[str] = [
+                    path for path, due in self._due.items() if due <= now
+                ]
+                if not settled:
+                    self._cond.wait(min(self._due.values()) - now)
+                    continue
+                for path in settled:
+                    del self._due[path]
+            try:
+                self.callback(settled)
+            except Exception as e:
+                logger.error(f"Failed to handle file events: {e}")
@@ -0,0 +1,70 @@
+# Standard library imports
+from __future__ import annotations
+import os
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional, Set
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+
+def list_directory(directory: str) -> Optional[Set[str]]:
+    """
+    Lists the file names in a directory with one scandir call.
+
+    Args:
+        directory: The directory to list.
+
+    Returns:
+        The normalized names of the files in it, an empty set if the
+        directory does not exist, or None if it cannot be listed.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                os.path.normcase(entry.name)
+                for entry in entries if entry.is_file()
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+    except OSError as e:
+        logger.warning(f"Cannot list {directory}: {e}")
+        return None
+
+
+def check_paths(paths: Iterable[str],
+                listings: Optional[Dict[str, Optional[Set[str]]]] = None,
+                executor: Optional[Executor] = None) -> Dict[str, bool]:
+    """
+    Checks which files exist by listing each parent directory once instead
+    of stat'ing every path.
+
+    Args:
+        paths: The file paths to check.
+        listings: Directory listings already made, by directory; new ones
+            are added to it.
+        executor: Lists the directories in parallel if given.
+
+    Returns:
+        Whether each path exists, by path. Paths whose directory cannot be
+        listed are left out.
+    """
+    listings = {} if listings is None else listings
+    by_directory: Dict[str, List[str]] = {}
+    for path in paths:
+        by_directory.setdefault(os.path.dirname(path), []).append(path)
+
+    unlisted: List[str] = [d for d in by_directory if d not in listings]
+    if executor is not None:
+        listings.update(zip(unlisted, executor.map(list_directory, unlisted)))
+    else:
+        listings.update((d, list_directory(d)) for d in unlisted)
+
+    exists: Dict[str, bool] = {}
+    for directory, directory_paths in by_directory.items():
+        names: Optional[Set[str]] = listings[directory]
+        if names is None:
+            continue
+        for path in directory_paths:
+            exists[path] = os.path.normcase(os.path.basename(path)) in names
+    return exists
@@ -0,0 +1,85 @@
+# Standard library imports
+from __future__ import annotations
+import functools
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# Third-party library imports
+import imageio_ffmpeg
+
+
+@functools.lru_cache(maxsize=None)
+def get_ffmpeg_exe() -> str:
+    """
+    Gets the path of the bundled ffmpeg binary, resolved once per process.
+
+    Returns:
+        The ffmpeg executable path.
+    """
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def hidden_process_kwargs() -> Dict[str, Any]:
+    """
+    Gets the Popen keyword arguments that keep ffmpeg from opening a console
+    window on Windows.
+
+    Returns:
+        A dictionary of keyword arguments for subprocess calls.
+    """
+    if sys.platform != "win32":
+        return {}
+
+    import win32process
+
+    startupinfo: subprocess.STARTUPINFO = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {
+        "startupinfo": startupinfo,
+        "creationflags": win32process.CREATE_NO_WINDOW,
+    }
+
+
+def run_ffmpeg(args: List[str],
+               timeout: Optional[float] = None,
+               low_priority: bool = False) -> subprocess.CompletedProcess:
+    """
+    Runs ffmpeg to completion without a console window.
+
+    Args:
+        args: Arguments passed after the executable.
+        timeout: Maximum run time in seconds.
+        low_priority: Run ffmpeg below normal priority, for background jobs.
+
+    Returns:
+        The completed process, with stdout and stderr decoded as text.
+    """
+    kwargs: Dict[str, Any] = hidden_process_kwargs()
+    if low_priority:
+        if sys.platform == "win32":
+            kwargs["creationflags"] |= subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        else:
+            # The child inherits the nice value of the spawning thread
+            from src.core.util.priority import lowered_thread_priority
+
+            with lowered_thread_priority("below_normal"):
+                return _run(args, timeout, kwargs)
+    return _run(args, timeout, kwargs)
+
+
+def _run(args: List[str], timeout: Optional[float],
+         kwargs: Dict[str, Any]) -> subprocess.CompletedProcess:
+    """Runs ffmpeg with text output and the given Popen keyword arguments."""
+    return subprocess.run(
+        [get_ffmpeg_exe(), *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout,
+        **kwargs,
+    )
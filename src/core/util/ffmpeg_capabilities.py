@@ -0,0 +1,252 @@
+# Standard library imports
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Local application/library specific imports
+from src.core.util.ffmpeg import get_ffmpeg_exe, run_ffmpeg
+from src.core.util.logger import logger
+from src.core.util.priority import lowered_thread_priority
+
+CACHE_PATH: str = "db/ffmpeg_capabilities.json"
+
+# Fastest first. Hardware encoders are only chosen after a trial encode
+# succeeds, because builds list them even without a matching GPU.
+VIDEO_ENCODER_PREFERENCE: List[str] = [
+    "h264_nvenc", "h264_qsv", "h264_amf", "libx264", "h264_mf", "mpeg4"
+]
+HARDWARE_ENCODERS: Tuple[str, ...] = ("h264_nvenc", "h264_qsv", "h264_amf",
+                                      "h264_mf")
+# Low-latency settings per encoder
+VIDEO_ENCODER_ARGS: Dict[str, List[str]] = {
+    "h264_nvenc": ["-preset", "p1"],
+    "h264_qsv": ["-preset", "veryfast"],
+    "h264_amf": ["-quality", "speed"],
+    "libx264": ["-preset", "ultrafast", "-tune", "zerolatency"],
+    "h264_mf": ["-rate_control", "cbr"],
+    "mpeg4": ["-q:v", "5"],
+}
+
+_FLAGS_RE: re.Pattern = re.compile(r"^[A-Z.|]+$")
+
+
+@dataclass
+class FFmpegCapabilities:
+    """Features supported by an ffmpeg binary"""
+    binary_hash: str
+    version: str = ""
+    encoders: List[str] = field(default_factory=list)
+    filters: List[str] = field(default_factory=list)
+    muxers: List[str] = field(default_factory=list)
+    usable_hardware_encoders: List[str] = field(default_factory=list)
+    # Stat of the binary when it was last hashed; a match skips hashing
+    binary_path: str = ""
+    binary_size: int = 0
+    binary_mtime_ns: int = 0
+
+    def has_encoder(self, name: str) -> bool:
+        """Whether the encoder is compiled in and, if hardware, usable."""
+        if name in HARDWARE_ENCODERS:
+            return name in self.usable_hardware_encoders
+        return name in self.encoders
+
+    def has_filter(self, name: str) -> bool:
+        """Whether the filter is compiled in."""
+        return name in self.filters
+
+    def has_muxer(self, name: str) -> bool:
+        """Whether the muxer is compiled in."""
+        return name in self.muxers
+
+    def select_video_encoder(self, preferred: str = "auto") -> str:
+        """
+        Picks the video encoder to use.
+
+        Args:
+            preferred: An encoder name, or "auto" for the fastest available.
+
+        Returns:
+            The encoder name.
+        """
+        if preferred != "auto":
+            if not self.has_encoder(preferred):
+                logger.warning(
+                    f"Encoder {preferred} is not available, using auto")
+            else:
+                return preferred
+        if not self.encoders:
+            return "libx264"  # Probe failed, keep ffmpeg's usual mp4 default
+        for name in VIDEO_ENCODER_PREFERENCE:
+            if self.has_encoder(name):
+                return name
+        return "mpeg4"
+
+
+def parse_version(output: str) -> str:
+    """
+    Parses the first line of ``ffmpeg -version``.
+
+    Args:
+        output: The command output.
+
+    Returns:
+        The version string, or an empty string.
+    """
+    match = re.search(r"ffmpeg version (\S+)", output)
+    return match.group(1) if match else ""
+
+
+def parse_component_list(output: str) -> List[str]:
+    """
+    Parses the listing printed by ``-encoders``, ``-filters`` or ``-muxers``.
+    Each entry is a flags column followed by the component name; legend
+    lines have "=" in place of the name.
+
+    Args:
+        output: The command output.
+
+    Returns:
+        The component names.
+    """
+    names: List[str] = []
+    for line in output.splitlines():
+        parts: List[str] = line.split()
+        if len(parts) < 2 or parts[1] == "=" or not _FLAGS_RE.match(parts[0]):
+            continue
+        names.extend(n for n in parts[1].split(",") if n)
+    return names
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 of a file.
+
+    Args:
+        path: The file to hash.
+        chunk_size: Read size in bytes.
+
+    Returns:
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with lowered_thread_priority(), open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _trial_encode(encoder: str) -> bool:
+    """Encodes one synthetic frame to check a hardware encoder works."""
+    try:
+        result = run_ffmpeg(
+            [
+                "-hide_banner", "-v", "error", "-f", "lavfi", "-i",
+                "color=c=black:s=256x256:d=0.1", "-frames:v", "1", "-c:v",
+                encoder, "-f", "null", "-"
+            ],
+            timeout=15,
+        )
+        return result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def probe_capabilities(binary_hash: str) -> FFmpegCapabilities:
+    """
+    Queries the ffmpeg binary for its version, encoders, filters and muxers.
+
+    Args:
+        binary_hash: Hash of the binary being probed.
+
+    Returns:
+        The probed capabilities.
+    """
+    logger.info("Probing ffmpeg capabilities...")
+    encoders: List[str] = parse_component_list(
+        run_ffmpeg(["-hide_banner", "-encoders"], timeout=30).stdout)
+    capabilities: FFmpegCapabilities = FFmpegCapabilities(
+        binary_hash=binary_hash,
+        version=parse_version(run_ffmpeg(["-version"], timeout=30).stdout),
+        encoders=encoders,
+        filters=parse_component_list(
+            run_ffmpeg(["-hide_banner", "-filters"], timeout=30).stdout),
+        muxers=parse_component_list(
+            run_ffmpeg(["-hide_banner", "-muxers"], timeout=30).stdout),
+        usable_hardware_encoders=[
+            name for name in HARDWARE_ENCODERS
+            if name in encoders and _trial_encode(name)
+        ],
+    )
+    logger.info(
+        f"ffmpeg {capabilities.version}: {len(capabilities.encoders)} encoders, "
+        f"hardware: {capabilities.usable_hardware_encoders or 'none'}")
+    return capabilities
+
+
+def load_capabilities(cache_path: str = CACHE_PATH) -> FFmpegCapabilities:
+    """
+    Loads capabilities from the cache file. The binary is only hashed when
+    its path, size or mtime differ from the cached ones, and only probed
+    when its hash differs too.
+
+    Args:
+        cache_path: The JSON cache file.
+
+    Returns:
+        The capabilities of the bundled ffmpeg.
+    """
+    binary_path: str = get_ffmpeg_exe()
+    stat: os.stat_result = os.stat(binary_path)
+    cached: Optional[FFmpegCapabilities] = None
+    try:
+        with open(cache_path, "r") as f:
+            cached = FFmpegCapabilities(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        pass
+    if (cached is not None and cached.binary_path == binary_path
+            and cached.binary_size == stat.st_size
+            and cached.binary_mtime_ns == stat.st_mtime_ns):
+        return cached
+
+    binary_hash: str = hash_file(binary_path)
+    capabilities: FFmpegCapabilities = (
+        cached if cached is not None and cached.binary_hash == binary_hash
+        else probe_capabilities(binary_hash))
+    capabilities.binary_path = binary_path
+    capabilities.binary_size = stat.st_size
+    capabilities.binary_mtime_ns = stat.st_mtime_ns
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(asdict(capabilities), f, indent=4)
+    except OSError as e:
+        logger.warning(f"Failed to write ffmpeg capability cache: {e}")
+    return capabilities
+
+
+_capabilities: Optional[FFmpegCapabilities] = None
+_capabilities_lock: threading.Lock = threading.Lock()
+
+
+def get_capabilities() -> FFmpegCapabilities:
+    """
+    Gets the capabilities of the bundled ffmpeg, loaded once per process.
+
+    Returns:
+        The cached FFmpegCapabilities.
+    """
+    global _capabilities
+    with _capabilities_lock:
+        if _capabilities is None:
+            try:
+                _capabilities = load_capabilities()
+            except Exception as e:
+                logger.error(f"ffmpeg capability probe failed: {e}")
+                _capabilities = FFmpegCapabilities(binary_hash="")
+        return _capabilities
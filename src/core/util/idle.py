@@ -0,0 +1,23 @@
+# Standard library imports
+from __future__ import annotations
+import sys
+
+
+def get_idle_seconds() -> float:
+    """
+    Gets how long the user has not touched the keyboard or mouse.
+
+    Returns:
+        Seconds since the last input, or 0.0 where this cannot be measured.
+    """
+    if sys.platform != "win32":
+        return 0.0
+    try:
+        import win32api
+
+        # Both are millisecond tick counts that wrap after 49.7 days
+        idle_ms: int = (win32api.GetTickCount() -
+                        win32api.GetLastInputInfo()) & 0xFFFFFFFF
+        return idle_ms / 1000
+    except Exception:
+        return 0.0
@@ -0,0 +1,127 @@
+# Standard library imports
+from __future__ import annotations
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Local application/library specific imports
+from src.core.util.ffmpeg import run_ffmpeg
+
+_DURATION_RE: re.Pattern = re.compile(
+    r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_STREAM_RE: re.Pattern = re.compile(r"^\s*Stream #\d+:\d+", re.MULTILINE)
+_START_RE: re.Pattern = re.compile(r"Duration:.*?start:\s*(-?\d+(?:\.\d+)?)")
+_BITRATE_RE: re.Pattern = re.compile(r"Duration:.*?bitrate:\s*(\d+)\s*kb/s")
+_CODEC_RE: re.Pattern = re.compile(
+    r"^\s*Stream #\d+:\d+.*?: (Video|Audio): (\w+)(.*)$", re.MULTILINE)
+_RESOLUTION_RE: re.Pattern = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+# Demuxer errors after which nothing in the file can be read
+_UNREADABLE_MARKERS: Tuple[str, ...] = ("moov atom not found",
+                              "Invalid data found when processing input")
+
+
+@dataclass
+class MediaInfo:
+    """What ffmpeg could read from a media file"""
+    duration: Optional[float]  # None when the container does not record it
+    streams: int
+    start_time: Optional[float] = None  # Container start, in seconds
+    bitrate: Optional[int] = None  # Overall bitrate, in kb/s
+    video_codec: Optional[str] = None  # Of the first video stream
+    audio_codec: Optional[str] = None  # Of the first audio stream
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def parse_duration(stderr: str) -> Optional[float]:
+    """
+    Parses the container duration from ffmpeg's input summary.
+
+    Args:
+        stderr: The ffmpeg stderr text.
+
+    Returns:
+        The duration in seconds, or None if it is not reported.
+    """
+    match: Optional[re.Match] = _DURATION_RE.search(stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_duration(path: str, timeout: float = 30) -> Optional[float]:
+    """
+    Reads the duration of a media file. The bundled ffmpeg has no ffprobe,
+    so this runs ``ffmpeg -i`` without an output and parses its summary.
+
+    Args:
+        path: The media file.
+        timeout: Maximum run time in seconds.
+
+    Returns:
+        The duration in seconds, or None if the file cannot be read.
+    """
+    try:
+        result = run_ffmpeg(["-hide_banner", "-nostdin", "-i", path],
+                            timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return parse_duration(result.stderr)
+
+
+def probe_media(path: str,
+                timeout: float = 30,
+                low_priority: bool = False) -> Optional[MediaInfo]:
+    """
+    Checks whether a media file can be demuxed.
+
+    Args:
+        path: The media file.
+        timeout: Maximum run time in seconds.
+        low_priority: Run ffmpeg below normal priority, for background jobs.
+
+    Returns:
+        The duration and stream count, or None if the file is unreadable.
+    """
+    try:
+        result = run_ffmpeg(["-hide_banner", "-nostdin", "-i", path],
+                            timeout=timeout,
+                            low_priority=low_priority)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if any(marker in result.stderr for marker in _UNREADABLE_MARKERS):
+        return None
+    streams: int = len(_STREAM_RE.findall(result.stderr))
+    if not streams:
+        return None
+    info: MediaInfo = MediaInfo(duration=parse_duration(result.stderr),
+                                streams=streams)
+    parse_stream_details(result.stderr, info)
+    return info
+
+
+def parse_stream_details(stderr: str, info: MediaInfo) -> None:
+    """
+    Fills in the start time, bitrate, codecs and resolution from ffmpeg's
+    input summary, leaving what it does not report unset.
+
+    Args:
+        stderr: The ffmpeg stderr text.
+        info: The MediaInfo to fill in.
+    """
+    match: Optional[re.Match] = _START_RE.search(stderr)
+    if match:
+        info.start_time = float(match.group(1))
+    match = _BITRATE_RE.search(stderr)
+    if match:
+        info.bitrate = int(match.group(1))
+    for kind, codec, details in _CODEC_RE.findall(stderr):
+        if kind == "Video" and info.video_codec is None:
+            info.video_codec = codec
+            resolution: Optional[re.Match] = _RESOLUTION_RE.search(details)
+            if resolution:
+                info.width, info.height = map(int, resolution.groups())
+        elif kind == "Audio" and info.audio_codec is None:
+            info.audio_codec = codec
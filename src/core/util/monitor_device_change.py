@@ -0,0 +1,93 @@
+# Standard library imports
+from __future__ import annotations
+import threading
+from typing import Callable
+
+# Third-party library imports
+import pywintypes
+import win32api
+import win32con
+import win32gui
+import win32gui_struct
+
+# Constants for Windows device notifications
+WM_DEVICECHANGE: int = 0x0219
+DBT_DEVICEARRIVAL: int = 0x8000
+DBT_DEVICEREMOVECOMPLETE: int = 0x8004
+DBT_DEVNODES_CHANGED: int = 0x0007
+# Kernel streaming audio interface class (KSCATEGORY_AUDIO)
+KSCATEGORY_AUDIO: str = "{6994AD04-93EF-11D0-A3CC-00A0C9223196}"
+
+
+def monitor_device_change(callback: Callable[[], None]) -> None:
+    """
+    Monitors audio device arrival and removal using Windows API.
+
+    A message-only window does not receive broadcast WM_DEVICECHANGE
+    messages, so this registers for audio interface notifications explicitly.
+
+    Args:
+        callback: A function called whenever an audio device is added or removed.
+    """
+
+    def WndProc(hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """
+        Window procedure to handle Windows messages.
+
+        Args:
+            hwnd: The handle to the window receiving the message.
+            msg: The message code.
+            wparam: The device event type.
+            lparam: Event-specific data.
+
+        Returns:
+            The result of the message processing.
+        """
+        if msg == WM_DEVICECHANGE and wparam in (
+                DBT_DEVICEARRIVAL,
+                DBT_DEVICEREMOVECOMPLETE,
+                DBT_DEVNODES_CHANGED,
+        ):
+            callback()
+        return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+
+    hinst: int = win32api.GetModuleHandle(None)
+    wndclass: win32gui.WNDCLASS = win32gui.WNDCLASS()
+    wndclass.hInstance = hinst
+    wndclass.lpszClassName = "AudioDeviceMonitor"
+    wndclass.lpfnWndProc = WndProc
+    atom: int = win32gui.RegisterClass(wndclass)
+
+    # Create a message-only window
+    hwnd: int = win32gui.CreateWindowEx(0, atom, "AudioDeviceMonitorWnd", 0,
+                                        0, 0, 0, 0, win32con.HWND_MESSAGE, 0,
+                                        0, None)
+    notification_filter = win32gui_struct.PackDEV_BROADCAST_DEVICEINTERFACE(
+        pywintypes.IID(KSCATEGORY_AUDIO))
+    notification = win32gui.RegisterDeviceNotification(
+        hwnd, notification_filter, win32con.DEVICE_NOTIFY_WINDOW_HANDLE)
+
+    try:
+        win32gui.PumpMessages()
+    finally:
+        win32gui.UnregisterDeviceNotification(notification)
+        win32gui.DestroyWindow(hwnd)
+        win32gui.UnregisterClass(atom, hinst)
+
+
+def create_device_change_monitor_thread(
+        callback: Callable[[], None]) -> threading.Thread:
+    """
+    Creates and starts a daemon thread to monitor audio device changes.
+
+    Args:
+        callback: A function called whenever an audio device is added or removed.
+
+    Returns:
+        The created thread object.
+    """
+    thread = threading.Thread(target=monitor_device_change,
+                              args=(callback, ),
+                              daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,109 @@
+# Standard library imports
+from __future__ import annotations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+from src.core.util.staging import MoveResult, move_file
+
+
+class MoveEngine:
+    """
+    Moves finished recordings on a small worker pool, so a slow copy to
+    another volume does not hold up the file watcher or the segment list
+    reader. A file already queued is not queued again.
+    """
+
+    def __init__(self, workers: int = 2) -> None:
+        """
+        Initializes the MoveEngine.
+
+        Args:
+            workers: Number of moves that may run at once.
+        """
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="move")
+        self._queued: Dict[str, Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self.moved_files: int = 0
+        self.moved_bytes: int = 0
+        self.move_seconds: float = 0.0
+
+    def submit(
+        self,
+        src: str,
+        dst: str,
+        on_done: Optional[Callable[[MoveResult], None]] = None
+    ) -> Future:
+        """
+        Queues a move.
+
+        Args:
+            src: The file to move.
+            dst: The destination path.
+            on_done: Called on the worker thread after a successful move.
+
+        Returns:
+            A future resolving to the MoveResult, or None if the move failed.
+        """
+        with self._lock:
+            queued: Optional[Future] = self._queued.get(src)
+            if queued is None:
+                future: Future = self._executor.submit(
+                    self._move, src, dst, on_done)
+                self._queued[src] = future
+                return future
+        if on_done:
+            # Queued by another caller; still report the move to this one
+            queued.add_done_callback(
+                lambda done: self._notify(on_done, done.result(), dst))
+        return queued
+
+    def _move(self, src: str, dst: str,
+              on_done: Optional[Callable[[MoveResult], None]]
+              ) -> Optional[MoveResult]:
+        """Runs one move and logs its throughput."""
+        try:
+            result: MoveResult = move_file(src, dst)
+        except FileNotFoundError:
+            logger.debug(f"File already moved: {src}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to move {src} -> {dst}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._queued.pop(src, None)
+
+        with self._lock:
+            self.moved_files += 1
+            self.moved_bytes += result.size
+            self.move_seconds += result.seconds
+        logger.info(f"Moved completed file: {src} -> {dst} "
+                    f"({result.method}, {result.size} bytes, "
+                    f"{result.seconds * 1000:.1f} ms, "
+                    f"{result.throughput / (1024 * 1024):.1f} MB/s)")
+        self._notify(on_done, result, dst)
+        return result
+
+    @staticmethod
+    def _notify(on_done: Optional[Callable[[MoveResult], None]],
+                result: Optional[MoveResult], dst: str) -> None:
+        """Calls the completion callback of a successful move."""
+        if on_done is None or result is None:
+            return
+        try:
+            on_done(result)
+        except Exception as e:
+            logger.error(f"Failed to handle moved file {dst}: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops accepting moves.
+
+        Args:
+            wait: Whether to wait for queued moves to finish.
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,189 @@
+# Standard library imports
+from __future__ import annotations
+import contextlib
+import os
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+IS_WINDOWS: bool = sys.platform == "win32"
+# SetThreadPriority modes that also lower the thread's I/O priority
+THREAD_MODE_BACKGROUND_BEGIN: int = 0x00010000
+THREAD_MODE_BACKGROUND_END: int = 0x00020000
+
+# Scheduling priority names and their POSIX nice equivalents
+NICE_VALUES: Dict[str, int] = {
+    "idle": 19,
+    "below_normal": 10,
+    "normal": 0,
+    "above_normal": -5,
+    "high": -10,
+}
+
+
+def _priority_value(name: str) -> Any:
+    """Maps a priority name to the value psutil.Process.nice() expects."""
+    if not IS_WINDOWS:
+        return NICE_VALUES[name]
+    return {
+        "idle": psutil.IDLE_PRIORITY_CLASS,
+        "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        "normal": psutil.NORMAL_PRIORITY_CLASS,
+        "above_normal": psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+        "high": psutil.HIGH_PRIORITY_CLASS,
+    }[name]
+
+
+def _io_priority_args(name: str) -> tuple:
+    """Maps an I/O priority name to psutil.Process.ionice() arguments."""
+    if IS_WINDOWS:
+        return ({
+            "very_low": psutil.IOPRIO_VERYLOW,
+            "low": psutil.IOPRIO_LOW,
+            "normal": psutil.IOPRIO_NORMAL,
+            "high": psutil.IOPRIO_HIGH,
+        }[name], )
+    return {
+        "very_low": (psutil.IOPRIO_CLASS_IDLE, ),
+        "low": (psutil.IOPRIO_CLASS_BE, 7),
+        "normal": (psutil.IOPRIO_CLASS_BE, 4),
+        "high": (psutil.IOPRIO_CLASS_BE, 0),
+    }[name]
+
+
+def _affinity_cpus(affinity: Any) -> List[int]:
+    """Accepts either a list of CPU indices or an integer bit mask."""
+    if isinstance(affinity, int):
+        return [cpu for cpu in range(affinity.bit_length()) if affinity >> cpu & 1]
+    if isinstance(affinity, str):
+        return _affinity_cpus(int(affinity, 0))
+    return [int(cpu) for cpu in affinity]
+
+
+def apply_process_settings(pid: int, settings: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Applies scheduling priority, CPU affinity and I/O priority to a process.
+
+    Args:
+        pid: The process ID.
+        settings: Optional "priority", "affinity" and "io_priority" entries.
+                  Priorities are names such as "below_normal"; affinity is a
+                  list of CPU indices or a bit mask such as "0xC".
+
+    Returns:
+        The values in effect afterwards, formatted for display.
+    """
+    if psutil is None:
+        return {}
+    try:
+        process = psutil.Process(pid)
+    except psutil.Error:
+        return {}
+
+    if settings.get("priority"):
+        try:
+            process.nice(_priority_value(settings["priority"]))
+        except (KeyError, psutil.Error, OSError) as e:
+            logger.warning(f"Failed to set priority of {pid}: {e}")
+    if settings.get("affinity") is not None:
+        try:
+            process.cpu_affinity(_affinity_cpus(settings["affinity"]))
+        except (ValueError, AttributeError, psutil.Error, OSError) as e:
+            logger.warning(f"Failed to set CPU affinity of {pid}: {e}")
+    if settings.get("io_priority"):
+        try:
+            process.ionice(*_io_priority_args(settings["io_priority"]))
+        except (KeyError, AttributeError, psutil.Error, OSError) as e:
+            logger.warning(f"Failed to set I/O priority of {pid}: {e}")
+    return describe_process_settings(process)
+
+
+def describe_process_settings(process: Any) -> Dict[str, str]:
+    """
+    Reads back the scheduling settings of a psutil.Process.
+
+    Args:
+        process: The psutil.Process.
+
+    Returns:
+        The priority, affinity and I/O priority formatted for display.
+    """
+    applied: Dict[str, str] = {}
+    try:
+        applied["priority"] = str(process.nice()).replace("Priority.", "")
+        if hasattr(process, "cpu_affinity"):
+            applied["affinity"] = ",".join(
+                str(cpu) for cpu in process.cpu_affinity())
+        if hasattr(process, "ionice"):
+            io = process.ionice()
+            if hasattr(io, "ioclass"):  # POSIX returns (ioclass, value)
+                applied["io_priority"] = f"{io.ioclass.name}:{io.value}"
+            else:
+                applied["io_priority"] = str(io).replace("IOPriority.", "")
+    except (psutil.Error, OSError):
+        pass
+    return applied
+
+
+@contextlib.contextmanager
+def lowered_thread_priority(name: Optional[str] = "below_normal") -> Iterator[None]:
+    """
+    Runs the enclosed block with a lower scheduling priority for the current
+    thread, so background workers do not compete with recording.
+
+    Args:
+        name: "background" (Windows background mode, also lowers I/O
+              priority), "idle", "below_normal", or None to leave it alone.
+    """
+    if not name or name == "normal":
+        yield
+        return
+
+    restore = _lower_current_thread(name)
+    try:
+        yield
+    finally:
+        if restore:
+            try:
+                restore()
+            except OSError:
+                pass
+
+
+def _lower_current_thread(name: str):
+    """Lowers the current thread's priority, returning an undo function."""
+    try:
+        if IS_WINDOWS:
+            import win32api
+            import win32process
+
+            handle = win32api.GetCurrentThread()
+            if name == "background":
+                win32process.SetThreadPriority(
+                    handle, THREAD_MODE_BACKGROUND_BEGIN)
+                return lambda: win32process.SetThreadPriority(
+                    handle, THREAD_MODE_BACKGROUND_END)
+            previous: int = win32process.GetThreadPriority(handle)
+            win32process.SetThreadPriority(
+                handle, {
+                    "idle": win32process.THREAD_PRIORITY_IDLE,
+                }.get(name, win32process.THREAD_PRIORITY_BELOW_NORMAL))
+            return lambda: win32process.SetThreadPriority(handle, previous)
+
+        # On Linux a thread id is accepted where a process id is expected
+        tid: int = threading.get_native_id()
+        previous_nice: int = os.getpriority(os.PRIO_PROCESS, tid)
+        os.setpriority(os.PRIO_PROCESS, tid,
+                       NICE_VALUES.get(name, NICE_VALUES["below_normal"]))
+        return lambda: os.setpriority(os.PRIO_PROCESS, tid, previous_nice)
+    except Exception as e:
+        logger.debug(f"Failed to lower thread priority: {e}")
+        return None
@@ -0,0 +1,250 @@
+# Standard library imports
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+
+@dataclass
+class ResourceSample:
+    """Resource usage of a process at one point in time"""
+    timestamp: float
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    read_rate: float = 0.0  # bytes per second since the previous sample
+    write_rate: float = 0.0
+    handles: int = 0  # Handles on Windows, file descriptors elsewhere
+    threads: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the sample to a dictionary."""
+        return asdict(self)
+
+
+class _WatchedProcess:
+    """A persistent psutil handle and the samples taken from it"""
+
+    def __init__(self, label: str, process: Any, history_size: int) -> None:
+        self.label: str = label
+        self.process: Any = process
+        self.create_time: float = process.create_time()
+        self.history: Deque[ResourceSample] = deque(maxlen=history_size)
+        # The first cpu_percent() call only primes the counters
+        process.cpu_percent(None)
+
+
+class ResourceSampler:
+    """
+    Samples CPU, memory, I/O and handle counts of watched processes on one
+    background thread. Each process keeps the same psutil.Process for its
+    whole life, so CPU percentages are measured between consecutive samples
+    instead of being lost with a throwaway handle.
+    """
+
+    def __init__(self,
+                 interval: float = 1.0,
+                 history_size: int = 120,
+                 export_path: Optional[str] = None) -> None:
+        """
+        Initializes the ResourceSampler.
+
+        Args:
+            interval: Seconds between samples.
+            history_size: Number of samples kept per process.
+            export_path: Optional JSON file rewritten with the latest samples.
+        """
+        self.interval: float = interval
+        self.history_size: int = history_size
+        self.export_path: Optional[str] = export_path
+        self._watched: Dict[str, _WatchedProcess] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, key: str, pid: int, label: str) -> None:
+        """
+        Starts sampling a process.
+
+        Args:
+            key: Identifies the process in lookups.
+            pid: The process ID.
+            label: Display name, such as the recorder type.
+        """
+        if psutil is None:
+            return
+        try:
+            watched: _WatchedProcess = _WatchedProcess(
+                label, psutil.Process(pid), self.history_size)
+        except psutil.Error as e:
+            logger.debug(f"Cannot sample process {pid}: {e}")
+            return
+        with self._lock:
+            self._watched[key] = watched
+
+    def unwatch(self, key: str) -> None:
+        """
+        Stops sampling a process.
+
+        Args:
+            key: The key the process was watched under.
+        """
+        with self._lock:
+            self._watched.pop(key, None)
+
+    def latest(self, key: str) -> Optional[ResourceSample]:
+        """
+        Gets the newest sample of a process.
+
+        Args:
+            key: The key the process was watched under.
+
+        Returns:
+            The sample, or None if none was taken yet.
+        """
+        with self._lock:
+            watched: Optional[_WatchedProcess] = self._watched.get(key)
+            if not watched or not watched.history:
+                return None
+            return watched.history[-1]
+
+    def history(self, key: str) -> List[ResourceSample]:
+        """
+        Gets the retained samples of a process, oldest first.
+
+        Args:
+            key: The key the process was watched under.
+
+        Returns:
+            The samples.
+        """
+        with self._lock:
+            watched: Optional[_WatchedProcess] = self._watched.get(key)
+            return list(watched.history) if watched else []
+
+    def create_time(self, key: str) -> Optional[float]:
+        """
+        Gets the start time of a process from its cached handle.
+
+        Args:
+            key: The key the process was watched under.
+
+        Returns:
+            The epoch start time, or None if the process is not watched.
+        """
+        with self._lock:
+            watched: Optional[_WatchedProcess] = self._watched.get(key)
+            return watched.create_time if watched else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets the latest sample of every watched process.
+
+        Returns:
+            The label, pid and latest sample keyed by watch key.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "label": watched.label,
+                    "pid": watched.process.pid,
+                    "sample": (watched.history[-1].to_dict()
+                               if watched.history else None),
+                }
+                for key, watched in self._watched.items()
+            }
+
+    def start(self) -> None:
+        """Starts the sampling thread."""
+        if psutil is None:
+            logger.warning("psutil is not installed, resource sampling is off")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="resource-sampler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the sampling thread."""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        """Takes a sample of every watched process each interval."""
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                watched: List[tuple] = list(self._watched.items())
+            for key, process in watched:
+                sample: Optional[ResourceSample] = self._sample(process)
+                with self._lock:
+                    if sample is None:
+                        # Process exited; forget it unless it was replaced
+                        if self._watched.get(key) is process:
+                            del self._watched[key]
+                    else:
+                        process.history.append(sample)
+            if self.export_path:
+                self._export()
+
+    @staticmethod
+    def _sample(watched: _WatchedProcess) -> Optional[ResourceSample]:
+        """Reads one sample, or None once the process is gone."""
+        process = watched.process
+        try:
+            with process.oneshot():
+                sample: ResourceSample = ResourceSample(
+                    timestamp=time.time(),
+                    cpu_percent=process.cpu_percent(None),
+                    rss_bytes=process.memory_info().rss,
+                    threads=process.num_threads(),
+                )
+                if hasattr(process, "num_handles"):
+                    sample.handles = process.num_handles()
+                elif hasattr(process, "num_fds"):
+                    sample.handles = process.num_fds()
+                if hasattr(process, "io_counters"):
+                    io = process.io_counters()
+                    sample.read_bytes = io.read_bytes
+                    sample.write_bytes = io.write_bytes
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+        except (psutil.AccessDenied, OSError) as e:
+            logger.debug(f"Partial resource sample of {process.pid}: {e}")
+            return ResourceSample(timestamp=time.time())
+
+        if watched.history:
+            previous: ResourceSample = watched.history[-1]
+            elapsed: float = sample.timestamp - previous.timestamp
+            if elapsed > 0:
+                sample.read_rate = max(
+                    0.0, (sample.read_bytes - previous.read_bytes) / elapsed)
+                sample.write_rate = max(
+                    0.0, (sample.write_bytes - previous.write_bytes) / elapsed)
+        return sample
+
+    def _export(self) -> None:
+        """Rewrites the export file with the latest samples."""
+        try:
+            os.makedirs(os.path.dirname(self.export_path) or ".",
+                        exist_ok=True)
+            tmp_path: str = f"{self.export_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, self.export_path)
+        except OSError as e:
+            logger.warning(f"Failed to export resource metrics: {e}")
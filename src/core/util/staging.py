@@ -0,0 +1,214 @@
+# Standard library imports
+from __future__ import annotations
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Local application/library specific imports
+from src.core.util.logger import logger
+
+DEFAULT_STAGING_DIR: str = ".tmp"
+# Folder in each staging directory that crash recovery claims segments into
+RECOVERY_DIR: str = ".recovery"
+
+
+@dataclass
+class MoveResult:
+    """How a file reached its final location"""
+    method: str  # "rename" or "copy"
+    size: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second"""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+class StagingArea:
+    """
+    The directory recorders write active segments into. It may be a RAM
+    disk or tmpfs; when that location is unusable or has less free space
+    than the guard, recordings are staged in the fallback directory on disk.
+    """
+
+    def __init__(self, config: Any) -> None:
+        """
+        Initializes the StagingArea from the storage configuration.
+
+        Args:
+            config: The ConfigManager instance.
+        """
+        storage_config: Dict[str, Any] = config.get("storage", {})
+        self.primary: str = storage_config.get("tmp_path", DEFAULT_STAGING_DIR)
+        self.fallback: str = storage_config.get("tmp_fallback_path",
+                                                DEFAULT_STAGING_DIR)
+        self.min_free_bytes: int = int(
+            storage_config.get("tmp_min_free_mb", 512) * 1024 * 1024)
+        self._using_fallback: bool = False
+
+    def roots(self) -> List[str]:
+        """
+        Gets every directory segments may be staged in.
+
+        Returns:
+            The primary directory, then the fallback if it differs.
+        """
+        roots: List[str] = [self.primary]
+        if os.path.abspath(self.fallback) != os.path.abspath(self.primary):
+            roots.append(self.fallback)
+        return roots
+
+    def current(self) -> str:
+        """
+        Picks the directory for a new recording, checking that the primary
+        location exists, is writable and has enough free space.
+
+        Returns:
+            The staging directory.
+        """
+        reason: Optional[str] = self._check(self.primary)
+        if reason is None:
+            if self._using_fallback:
+                logger.info(f"Staging segments in {self.primary} again")
+            self._using_fallback = False
+            return self.primary
+        if not self._using_fallback:
+            logger.warning(f"Staging directory {self.primary} {reason}, "
+                           f"using {self.fallback}")
+        self._using_fallback = True
+        os.makedirs(self.fallback, exist_ok=True)
+        return self.fallback
+
+    def has_room(self, path: str) -> bool:
+        """
+        Checks the size guard for the volume holding a staged file.
+
+        Args:
+            path: A path inside a staging directory.
+
+        Returns:
+            True if the volume still has the guarded amount of free space.
+        """
+        try:
+            return shutil.disk_usage(path).free >= self.min_free_bytes
+        except OSError:
+            return True
+
+    def _check(self, path: str) -> Optional[str]:
+        """Returns why a directory cannot be used, or None if it can."""
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            return f"cannot be created ({e})"
+        if not os.access(path, os.W_OK):
+            return "is not writable"
+        free: int = shutil.disk_usage(path).free
+        if free < self.min_free_bytes:
+            return f"has only {free // (1024 * 1024)} MB free"
+        return None
+
+    def root_of(self, path: str) -> Optional[str]:
+        """
+        Finds the staging directory a path lies in.
+
+        Args:
+            path: A file path.
+
+        Returns:
+            The staging directory, or None if the path is outside all of them.
+        """
+        absolute: str = os.path.abspath(path)
+        for root in self.roots():
+            root_abs: str = os.path.abspath(root)
+            if absolute == root_abs or absolute.startswith(root_abs + os.sep):
+                return root
+        return None
+
+    def is_recovering(self, path: str) -> bool:
+        """
+        Checks whether a path lies in the recovery folder of a staging
+        directory, whose files belong to crash recovery, not to a recorder.
+
+        Args:
+            path: A file path.
+
+        Returns:
+            True if the path is inside a recovery folder.
+        """
+        root: Optional[str] = self.root_of(path)
+        return root is not None and os.path.relpath(
+            path, root).split(os.sep)[0] == RECOVERY_DIR
+
+
+_staging_area: Optional[StagingArea] = None
+_staging_lock: threading.Lock = threading.Lock()
+
+
+def get_staging_area(config: Any) -> StagingArea:
+    """
+    Gets the process-wide StagingArea, created from the first config passed.
+
+    Args:
+        config: The ConfigManager instance.
+
+    Returns:
+        The shared StagingArea.
+    """
+    global _staging_area
+    with _staging_lock:
+        if _staging_area is None:
+            _staging_area = StagingArea(config)
+        return _staging_area
+
+
+def move_file(src: str, dst: str) -> MoveResult:
+    """
+    Moves a file, renaming it when source and destination share a volume.
+    Otherwise the file is copied to a partial file, using the copy offload
+    of the OS where Python has one, flushed to disk, renamed into place,
+    and only then is the source removed.
+
+    Args:
+        src: The file to move.
+        dst: The destination path.
+
+    Returns:
+        The method used, the bytes moved and how long it took.
+    """
+    started: float = time.perf_counter()
+    size: int = os.path.getsize(src)
+    try:
+        os.rename(src, dst)
+        method: str = "rename"
+    except OSError as e:
+        if os.path.exists(dst) or not os.path.exists(src):
+            raise
+        logger.debug(f"Rename of {src} failed ({e}), copying instead")
+        partial: str = f"{dst}.part"
+        try:
+            _copy_file(src, partial)
+            os.replace(partial, dst)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        os.remove(src)
+        method = "copy"
+    return MoveResult(method=method,
+                      size=size,
+                      seconds=time.perf_counter() - started)
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """
+    Copies a file with its metadata and fsyncs the copy. shutil.copy2 uses
+    sendfile on Linux, fcopyfile on macOS and CopyFile2 on Windows from
+    Python 3.12, and a large-buffer loop elsewhere.
+    """
+    shutil.copy2(src, dst)
+    with open(dst, "rb+") as f:
+        os.fsync(f.fileno())
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+
+from src.core.recorder.devices import parse_dshow_audio_devices
+
+FIXTURES: str = os.path.join(os.path.dirname(__file__), "fixtures", "dshow")
+
+
+def read_fixture(name: str) -> str:
+    """Reads a recorded ffmpeg -list_devices stderr sample."""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_legacy_layout_lists_audio_section_only() -> None:
+    assert parse_dshow_audio_devices(read_fixture("legacy.txt")) == [
+        "Microphone Array (Realtek(R) Audio)",
+        "Stereo Mix (Realtek(R) Audio)",
+    ]
+
+
+def test_tagged_layout_lists_audio_devices_only() -> None:
+    assert parse_dshow_audio_devices(read_fixture("tagged.txt")) == [
+        "Microphone (USB Audio Device)",
+        "Headset Microphone (Jabra Evolve 40)",
+    ]
+
+
+def test_alternative_names_are_skipped() -> None:
+    for name in ("legacy.txt", "tagged.txt", "duplicates.txt"):
+        devices = parse_dshow_audio_devices(read_fixture(name))
+        assert not any(device.startswith("@device_") for device in devices)
+
+
+def test_duplicate_names_are_listed_once_in_order() -> None:
+    assert parse_dshow_audio_devices(read_fixture("duplicates.txt")) == [
+        "Microphone (USB Audio Device)",
+        "Line In (Realtek(R) Audio)",
+    ]
+
+
+def test_empty_output_lists_no_devices() -> None:
+    assert parse_dshow_audio_devices("") == []